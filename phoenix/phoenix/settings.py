@@ -69,6 +69,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'corsheaders',
     'rest_framework',
     'rest_framework.authtoken',
@@ -78,7 +79,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'vault.middleware.StaticFilesMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -87,6 +88,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'vault.middleware.SecurityHeadersMiddleware',
+    'vault.middleware.PrimaryPinMiddleware',
 ]
 
 ROOT_URLCONF = 'phoenix.urls'
@@ -113,6 +115,20 @@ WSGI_APPLICATION = 'phoenix.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+WEB_PROFILE = os.getenv("WEB_PROFILE", "sync").strip().lower()
+# Connection pool (psycopg_pool) per worker process, see vault/db_pool. On by
+# default in the async profile, where a request's ORM calls run in executor
+# threads and would otherwise connect and disconnect every time.
+POSTGRES_POOL = env_bool("POSTGRES_POOL", WEB_PROFILE == "async")
+# Behind pgbouncer in transaction mode consecutive transactions may land on
+# different server connections: no server-side cursors, no prepared statements.
+POSTGRES_PGBOUNCER = env_bool("POSTGRES_PGBOUNCER", False)
+# Under ASGI each request runs its ORM work in a fresh thread context, so
+# persistent per-thread connections would pile up; the async profile closes
+# connections after every request unless told otherwise. A pool needs 0 too:
+# Django hands the connection back to it instead of closing it.
+CONN_MAX_AGE_DEFAULT = 0 if WEB_PROFILE == "async" or POSTGRES_POOL else 60
+
 db_options = {}
 postgres_sslmode = os.getenv("POSTGRES_SSLMODE")
 if postgres_sslmode:
@@ -122,23 +138,106 @@ if database_url:
     DATABASES = {
         "default": dj_database_url.parse(
             database_url,
-            conn_max_age=env_int("POSTGRES_CONN_MAX_AGE", 60),
+            conn_max_age=env_int("POSTGRES_CONN_MAX_AGE", CONN_MAX_AGE_DEFAULT),
             ssl_require=postgres_sslmode == "require",
         )
     }
 else:
     DATABASES = {
         "default": {
-            "ENGINE": "django.db.backends.postgresql",
             "NAME": os.getenv("POSTGRES_DB", "phoenix"),
             "USER": os.getenv("POSTGRES_USER", "phoenix"),
             "PASSWORD": os.getenv("POSTGRES_PASSWORD", "phoenix"),
             "HOST": os.getenv("POSTGRES_HOST", "db"),
             "PORT": os.getenv("POSTGRES_PORT", "5432"),
-            "CONN_MAX_AGE": env_int("POSTGRES_CONN_MAX_AGE", 60),
+            "CONN_MAX_AGE": env_int("POSTGRES_CONN_MAX_AGE", CONN_MAX_AGE_DEFAULT),
             "OPTIONS": db_options,
         }
     }
+# Optional streaming replica for audit, export and catalog reads
+# (vault.replica); the primary stays the source for everything else.
+database_replica_url = os.getenv("DATABASE_REPLICA_URL", "").strip()
+if database_replica_url:
+    DATABASES["replica"] = dj_database_url.parse(
+        database_replica_url,
+        conn_max_age=env_int("POSTGRES_CONN_MAX_AGE", CONN_MAX_AGE_DEFAULT),
+        ssl_require=postgres_sslmode == "require",
+    )
+    # Tests run against the primary's test database through the replica alias.
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+# Optional dedicated database for AuditLog (vault.audit). Run
+# `migrate --database=audit` after `migrate`; entries written while it is
+# unreachable wait in the primary's audit outbox.
+database_audit_url = os.getenv("AUDIT_DATABASE_URL", "").strip()
+AUDIT_DATABASE_TIMEOUT = env_int("AUDIT_DATABASE_TIMEOUT", 3)
+if database_audit_url:
+    DATABASES["audit"] = dj_database_url.parse(
+        database_audit_url,
+        conn_max_age=env_int("POSTGRES_CONN_MAX_AGE", CONN_MAX_AGE_DEFAULT),
+        ssl_require=postgres_sslmode == "require",
+    )
+    # Fail fast into the outbox instead of stalling requests on a dead host.
+    DATABASES["audit"].setdefault("OPTIONS", {})["connect_timeout"] = AUDIT_DATABASE_TIMEOUT
+for database_alias, database in DATABASES.items():
+    database.update(
+        {
+            "ENGINE": "vault.db_pool",
+            "CONN_HEALTH_CHECKS": env_bool("POSTGRES_CONN_HEALTH_CHECKS", True),
+            "DISABLE_SERVER_SIDE_CURSORS": POSTGRES_PGBOUNCER,
+        }
+    )
+    database_options = database.setdefault("OPTIONS", {})
+    if POSTGRES_POOL:
+        database_options["pool"] = {
+            "name": f"phoenix-{database_alias}",
+            "min_size": env_int("POSTGRES_POOL_MIN_SIZE", 2),
+            "max_size": env_int("POSTGRES_POOL_MAX_SIZE", 10),
+            "timeout": env_int("POSTGRES_POOL_TIMEOUT", 10),
+            "max_idle": env_int("POSTGRES_POOL_MAX_IDLE", 300),
+            "max_lifetime": env_int("POSTGRES_POOL_MAX_LIFETIME", 1800),
+        }
+        if database_alias == "audit":
+            database_options["pool"]["timeout"] = AUDIT_DATABASE_TIMEOUT
+    if POSTGRES_PGBOUNCER:
+        database_options["prepare_threshold"] = None
+DATABASE_ROUTERS = ["vault.audit.AuditRouter", "vault.replica.ReplicaRouter"]
+# How long a user's reads stay on the primary after they write; keep it above
+# the replica's usual replay lag.
+REPLICA_PIN_SECONDS = env_int("REPLICA_PIN_SECONDS", 10)
+# LISTEN needs a session of its own; behind a transaction-mode pgbouncer point
+# the event listener at Postgres directly (or at a session-mode pool).
+POSTGRES_LISTEN_HOST = os.getenv("POSTGRES_LISTEN_HOST", "").strip()
+POSTGRES_LISTEN_PORT = os.getenv("POSTGRES_LISTEN_PORT", "").strip()
+
+# Cache
+# Throttles and application caches must be shared by every gunicorn worker, so
+# the default tier is an UNLOGGED PostgreSQL table; Redis is used when
+# REDIS_URL is set (requires the optional `redis` package).
+
+REDIS_URL = os.getenv("REDIS_URL", "").strip()
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "redis" if REDIS_URL else "postgres").strip().lower()
+if CACHE_BACKEND == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "vault.cache.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": os.getenv("CACHE_KEY_PREFIX", "phoenix"),
+        }
+    }
+elif CACHE_BACKEND == "locmem":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "vault.cache.PostgresCache",
+            "LOCATION": "vault_cache_entry",
+            "KEY_PREFIX": os.getenv("CACHE_KEY_PREFIX", "phoenix"),
+        }
+    }
 
 AUTH_USER_MODEL = "vault.User"
 
@@ -177,12 +276,49 @@ EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
 EMAIL_USE_TLS = env_bool("EMAIL_USE_TLS", False)
 EMAIL_USE_SSL = env_bool("EMAIL_USE_SSL", False)
 DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "phoenix-vault@example.com")
+EMAIL_OUTBOX_MAX_ATTEMPTS = env_int("EMAIL_OUTBOX_MAX_ATTEMPTS", 8)
+EMAIL_OUTBOX_BACKOFF_SECONDS = env_int("EMAIL_OUTBOX_BACKOFF_SECONDS", 30)
+EMAIL_OUTBOX_BACKOFF_MAX_SECONDS = env_int("EMAIL_OUTBOX_BACKOFF_MAX_SECONDS", 3600)
+ACCESS_REQUEST_DIGEST_MINUTES = env_int("ACCESS_REQUEST_DIGEST_MINUTES", 0)
+CREDENTIAL_BULK_MAX_ITEMS = env_int("CREDENTIAL_BULK_MAX_ITEMS", 5000)
+CREDENTIAL_VERSIONS_PAGE_SIZE = env_int("CREDENTIAL_VERSIONS_PAGE_SIZE", 50)
+CREDENTIAL_VERSION_RETENTION_KEEP = env_int("CREDENTIAL_VERSION_RETENTION_KEEP", 0)
+CREDENTIAL_VERSION_RETENTION_DAYS = env_int("CREDENTIAL_VERSION_RETENTION_DAYS", 0)
+SYNC_CURSOR_LAG_SECONDS = env_int("SYNC_CURSOR_LAG_SECONDS", 30)
+SSE_HEARTBEAT_SECONDS = env_int("SSE_HEARTBEAT_SECONDS", 15)
+SSE_MAX_STREAM_SECONDS = env_int("SSE_MAX_STREAM_SECONDS", 300)
+# archive_audit_logs moves entries older than AUDIT_ARCHIVE_DAYS into
+# compressed segments under AUDIT_ARCHIVE_DIR (gzip, or zstd with zstandard).
+AUDIT_ARCHIVE_DIR = os.getenv("AUDIT_ARCHIVE_DIR", "").strip() or str(BASE_DIR / "audit_archive")
+AUDIT_ARCHIVE_COMPRESSION = os.getenv("AUDIT_ARCHIVE_COMPRESSION", "gzip").strip().lower()
+AUDIT_ARCHIVE_DAYS = env_int("AUDIT_ARCHIVE_DAYS", 90)
+AUDIT_ARCHIVE_SEGMENT_SIZE = env_int("AUDIT_ARCHIVE_SEGMENT_SIZE", 50000)
+# Identical routine views (lists, history pages) by one actor and IP inside
+# this window bump one audit row. 0 = one row per request.
+AUDIT_VIEW_COALESCE_SECONDS = env_int("AUDIT_VIEW_COALESCE_SECONDS", 300)
+# Audit entries younger than this (or than the coalescing window) are left
+# for the next rollup pass.
+AUDIT_ROLLUP_LAG_SECONDS = env_int("AUDIT_ROLLUP_LAG_SECONDS", 60)
+AUDIT_STATS_MAX_DAYS = env_int("AUDIT_STATS_MAX_DAYS", 366)
+# Settled audit entries are hash-chained by the outbox dispatcher, with an
+# HMAC-signed checkpoint every AUDIT_CHAIN_CHECKPOINT_ROWS entries or
+# AUDIT_CHAIN_CHECKPOINT_SECONDS. The key defaults to one derived from SECRET_KEY.
+AUDIT_CHAIN_KEY = os.getenv("AUDIT_CHAIN_KEY")
+AUDIT_CHAIN_CHECKPOINT_ROWS = env_int("AUDIT_CHAIN_CHECKPOINT_ROWS", 10000)
+AUDIT_CHAIN_CHECKPOINT_SECONDS = env_int("AUDIT_CHAIN_CHECKPOINT_SECONDS", 3600)
+# /api/audit-logs/feed/: entries per response by default and at most, and
+# how long a caught-up collector may wait for new entries.
+AUDIT_FEED_BATCH_SIZE = env_int("AUDIT_FEED_BATCH_SIZE", 1000)
+AUDIT_FEED_MAX_BATCH_SIZE = env_int("AUDIT_FEED_MAX_BATCH_SIZE", 10000)
+AUDIT_FEED_MAX_WAIT_SECONDS = env_int("AUDIT_FEED_MAX_WAIT_SECONDS", 25)
+AUDIT_FEED_POLL_SECONDS = env_int("AUDIT_FEED_POLL_SECONDS", 2)
 
 FERNET_KEY = os.getenv("FERNET_KEY")
 ASYMMETRIC_PUBLIC_KEY = os.getenv("ASYMMETRIC_PUBLIC_KEY")
 ASYMMETRIC_PRIVATE_KEY = os.getenv("ASYMMETRIC_PRIVATE_KEY")
 ASYMMETRIC_PUBLIC_KEY_PATH = os.getenv("ASYMMETRIC_PUBLIC_KEY_PATH")
 ASYMMETRIC_PRIVATE_KEY_PATH = os.getenv("ASYMMETRIC_PRIVATE_KEY_PATH")
+SECRET_BLOB_HASH_KEY = os.getenv("SECRET_BLOB_HASH_KEY")
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
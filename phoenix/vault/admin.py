@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 
-from .forms import UserChangeForm, UserCreationForm
+from .audit import audit_is_separate
+from .forms import CredentialAdminForm, CredentialVersionAdminForm, UserChangeForm, UserCreationForm
 from .models import (
     AccessRequest,
     AuditLog,
@@ -9,6 +10,7 @@ from .models import (
     CredentialVersion,
     Department,
     DepartmentShare,
+    EmailOutbox,
     LoginChallenge,
     Service,
     ServiceAccess,
@@ -82,6 +84,7 @@ class ServiceAdmin(admin.ModelAdmin):
 
 @admin.register(Credential)
 class CredentialAdmin(admin.ModelAdmin):
+    form = CredentialAdminForm
     list_display = ("service", "user", "login", "is_active", "updated_at")
     list_filter = ("is_active", "service", "user")
     search_fields = ("login", "service__name", "user__portal_login")
@@ -110,7 +113,13 @@ class AuditLogAdmin(admin.ModelAdmin):
         "ip_address",
         "user_agent",
         "metadata",
+        "chain_hash",
     )
+    exclude = ("agent",)
+
+    def get_search_fields(self, request):
+        # Actor lookups join the user table, which the audit database does not have.
+        return ("object_id",) if audit_is_separate() else self.search_fields
 
 
 @admin.register(DepartmentShare)
@@ -122,13 +131,14 @@ class DepartmentShareAdmin(admin.ModelAdmin):
 
 @admin.register(AccessRequest)
 class AccessRequestAdmin(admin.ModelAdmin):
-    list_display = ("requester", "service", "status", "reviewer", "requested_at", "reviewed_at")
-    list_filter = ("status", "service")
+    list_display = ("requester", "service", "status", "is_urgent", "reviewer", "requested_at", "reviewed_at")
+    list_filter = ("status", "is_urgent", "service")
     search_fields = ("requester__portal_login", "service__name", "reviewer__portal_login")
 
 
 @admin.register(CredentialVersion)
 class CredentialVersionAdmin(admin.ModelAdmin):
+    form = CredentialVersionAdminForm
     list_display = ("credential", "version", "change_type", "changed_by", "created_at")
     list_filter = ("change_type",)
     search_fields = ("credential__user__portal_login", "credential__service__name", "changed_by__portal_login")
@@ -160,3 +170,22 @@ class LoginChallengeAdmin(admin.ModelAdmin):
 
     def has_add_permission(self, request):
         return False
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ("subject", "status", "attempts", "next_attempt_at", "created_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("subject",)
+    readonly_fields = (
+        "subject",
+        "recipients",
+        "attempts",
+        "last_error",
+        "created_at",
+        "sent_at",
+    )
+    exclude = ("body",)
+
+    def has_add_permission(self, request):
+        return False
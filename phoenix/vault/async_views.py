@@ -0,0 +1,57 @@
+import asyncio
+
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.utils.decorators import classonlymethod
+from rest_framework.views import APIView
+
+
+class AsyncDispatchMixin:
+    """Dispatch DRF requests on the event loop.
+
+    DRF 3.15 only dispatches synchronously. Here authentication, permission and
+    throttle checks (token and throttle lookups hit the database) and any
+    handler that is still a plain function run in a worker thread; ``async``
+    handlers run on the event loop. Under WSGI Django wraps the view with
+    ``async_to_sync`` and it behaves like any other view.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            if self.authentication_classes or self.throttle_classes:
+                await sync_to_async(self.initial)(request, *args, **kwargs)
+            else:
+                self.initial(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            if asyncio.iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncAPIView(AsyncDispatchMixin, APIView):
+    """``APIView`` whose handlers are coroutines."""
+
+
+class AsyncViewSetMixin(AsyncDispatchMixin):
+    """Let a viewset mix ``async def`` actions (e.g. ``list``) with sync ones.
+
+    Put it before the DRF viewset class in the bases.
+    """
+
+    @classonlymethod
+    def as_view(cls, actions=None, **initkwargs):
+        return markcoroutinefunction(super().as_view(actions, **initkwargs))
@@ -0,0 +1,268 @@
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections, transaction
+from django.utils.dateparse import parse_datetime
+
+from .models import AuditChainHead, AuditCheckpoint, AuditLog, AuditOutbox, UserAgent
+from .security import get_client_ip, get_user_agent
+
+logger = logging.getLogger(__name__)
+
+AUDIT_ALIAS = "audit"
+AUDIT_TABLE = AuditLog._meta.db_table
+
+_PAYLOAD_FIELDS = ("actor_id", "action", "object_type", "object_id", "ip_address", "user_agent", "metadata")
+
+# One round trip: bump the newest identical view inside the window, or
+# insert a new row when there is none. Matches vault_audit_view_repeat_idx.
+# Sealed rows (vault.audit_chain) are never bumped.
+_COALESCE_VIEW_SQL = f"""
+WITH bumped AS (
+    UPDATE {AUDIT_TABLE} SET repeat_count = repeat_count + 1, last_seen_at = %(created_at)s
+    WHERE id = (
+        SELECT id FROM {AUDIT_TABLE}
+        WHERE action = 'view'
+            AND actor_id = %(actor_id)s
+            AND object_type = %(object_type)s
+            AND object_id = %(object_id)s
+            AND created_at >= %(window_start)s
+            AND ip_address IS NOT DISTINCT FROM %(ip_address)s::inet
+            AND chain_hash = ''
+        ORDER BY created_at DESC
+        LIMIT 1
+    )
+    RETURNING id
+)
+INSERT INTO {AUDIT_TABLE}
+    (actor_id, action, object_type, object_id, ip_address, agent_id, metadata, created_at, repeat_count, chain_hash)
+SELECT %(actor_id)s, 'view', %(object_type)s, %(object_id)s, %(ip_address)s::inet, %(agent_id)s::bigint,
+    %(metadata)s::jsonb, %(created_at)s, 1, ''
+WHERE NOT EXISTS (SELECT 1 FROM bumped)
+RETURNING id
+"""
+
+
+def audit_database():
+    """Alias that holds ``AuditLog``: the audit database when one is configured."""
+    return AUDIT_ALIAS if AUDIT_ALIAS in connections.settings else DEFAULT_DB_ALIAS
+
+
+def audit_is_separate():
+    return audit_database() != DEFAULT_DB_ALIAS
+
+
+class AuditRouter:
+    """Keep the audit log tables on the audit database when ``AUDIT_DATABASE_URL`` is set.
+
+    These are ``AuditLog``, its ``UserAgent`` lookup and the hash chain state
+    (``AuditChainHead``, ``AuditCheckpoint``), which is sealed in the same
+    transactions as the entries.
+
+    Placed before ``ReplicaRouter``; without an audit database it defers to it.
+    The audit database only holds the audit tables: historical audit
+    operations are skipped there until migration 0019 creates the table from
+    the current model, after which audit migrations apply to it as usual.
+    """
+
+    audit_labels = {
+        AuditLog._meta.label,
+        UserAgent._meta.label,
+        AuditChainHead._meta.label,
+        AuditCheckpoint._meta.label,
+    }
+    # Created after migration 0019, so their migrations always apply to the audit database.
+    audit_only_models = {UserAgent._meta.model_name, AuditChainHead._meta.model_name, AuditCheckpoint._meta.model_name}
+
+    def _is_audit(self, model):
+        return model._meta.label in self.audit_labels
+
+    def db_for_read(self, model, **hints):
+        return AUDIT_ALIAS if self._is_audit(model) and audit_is_separate() else None
+
+    def db_for_write(self, model, **hints):
+        return AUDIT_ALIAS if self._is_audit(model) and audit_is_separate() else None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if self._is_audit(obj1) or self._is_audit(obj2):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if "audit_table" in hints:
+            return db == AUDIT_ALIAS
+        if db != AUDIT_ALIAS:
+            return None
+        if app_label != AuditLog._meta.app_label:
+            return False
+        if model_name in self.audit_only_models:
+            return True
+        return model_name == AuditLog._meta.model_name and AUDIT_TABLE in connections[db].introspection.table_names()
+
+
+def with_audit_actors(queryset):
+    """Load each entry's actor, department and user agent: joins on the primary, a prefetch across databases."""
+    queryset = queryset.select_related("agent")
+    if audit_is_separate():
+        return queryset.prefetch_related("actor", "actor__department")
+    return queryset.select_related("actor", "actor__department")
+
+
+def audit_actor_ids(user_queryset):
+    """User ids for ``actor_id__in`` filters: a subquery, or a list when audit lives elsewhere."""
+    ids = user_queryset.values_list("id", flat=True)
+    return list(ids) if audit_is_separate() else ids
+
+
+def build_audit_entry(
+    actor,
+    action,
+    obj=None,
+    metadata=None,
+    request=None,
+    object_type=None,
+    object_id=None,
+):
+    """Return an unsaved ``AuditLog`` row; pass batches to ``write_audit_entries``."""
+    if obj is not None:
+        object_type = obj.__class__.__name__
+        object_id = str(obj.pk)
+    if not object_type or object_id is None:
+        raise ValueError("object_type/object_id required when obj is None")
+
+    return AuditLog(
+        actor=actor,
+        action=action,
+        object_type=object_type,
+        object_id=str(object_id),
+        ip_address=get_client_ip(request) if request else None,
+        user_agent=get_user_agent(request) if request else "",
+        metadata=metadata or {},
+    )
+
+
+def write_audit_entries(entries, batch_size=1000):
+    """Persist audit entries.
+
+    On the primary they are inserted in the caller's transaction, as before.
+    With a dedicated audit database they are written after the business
+    transaction commits, on the audit connection, so they neither extend
+    nor break it; if the audit database is unreachable they are parked in
+    ``AuditOutbox`` on the primary.
+    """
+    entries = list(entries)
+    if not entries:
+        return entries
+    if not audit_is_separate():
+        UserAgent.objects.attach(entries)
+        AuditLog.objects.bulk_create(entries, batch_size=batch_size)
+        return entries
+    transaction.on_commit(lambda: _store_in_audit_database(entries, batch_size), using=DEFAULT_DB_ALIAS)
+    return entries
+
+
+def log_action(
+    actor,
+    action,
+    obj=None,
+    metadata=None,
+    request=None,
+    object_type=None,
+    object_id=None,
+    coalesce=False,
+):
+    """Record one audit entry.
+
+    ``coalesce=True`` marks routine reads (lists, history pages): while
+    ``AUDIT_VIEW_COALESCE_SECONDS`` is set, an identical view by the same
+    actor from the same IP inside the window bumps ``repeat_count`` and
+    ``last_seen_at`` of the existing row instead of adding one. Secret
+    reveals and downloads never pass it.
+    """
+    entry = build_audit_entry(
+        actor,
+        action,
+        obj=obj,
+        metadata=metadata,
+        request=request,
+        object_type=object_type,
+        object_id=object_id,
+    )
+    if coalesce and _is_coalescible(entry):
+        if audit_is_separate():
+            transaction.on_commit(lambda: _store_in_audit_database([entry], 1, coalesce=True), using=DEFAULT_DB_ALIAS)
+        else:
+            _coalesce_view(entry, DEFAULT_DB_ALIAS)
+        return entry
+    write_audit_entries([entry])
+    return entry
+
+
+def _is_coalescible(entry):
+    return (
+        settings.AUDIT_VIEW_COALESCE_SECONDS > 0
+        and entry.action == AuditLog.Action.VIEW
+        and entry.actor_id is not None
+    )
+
+
+def _coalesce_view(entry, using):
+    """Count ``entry`` on the newest identical view inside the window, or insert it.
+
+    Sets ``entry.pk`` only when a new row was inserted.
+    """
+    params = {field: getattr(entry, field) for field in _PAYLOAD_FIELDS}
+    params["metadata"] = json.dumps(entry.metadata)
+    params["created_at"] = entry.created_at
+    params["window_start"] = entry.created_at - timedelta(seconds=settings.AUDIT_VIEW_COALESCE_SECONDS)
+    UserAgent.objects.db_manager(using).attach([entry])
+    params["agent_id"] = entry.agent_id
+    with connections[using].cursor() as cursor:
+        cursor.execute(_COALESCE_VIEW_SQL, params)
+        inserted = cursor.fetchone()
+    entry.pk = inserted[0] if inserted else None
+
+
+def _store_in_audit_database(entries, batch_size, coalesce=False):
+    try:
+        if coalesce:
+            _coalesce_view(entries[0], AUDIT_ALIAS)
+        else:
+            UserAgent.objects.db_manager(AUDIT_ALIAS).attach(entries)
+            AuditLog.objects.using(AUDIT_ALIAS).bulk_create(entries, batch_size=batch_size)
+    except DatabaseError:
+        logger.warning("Audit database unavailable; queued %s entries in the audit outbox", len(entries), exc_info=True)
+        connections[AUDIT_ALIAS].close()
+        AuditOutbox.objects.bulk_create(
+            [AuditOutbox(payload=_entry_payload(entry)) for entry in entries], batch_size=batch_size
+        )
+
+
+def _entry_payload(entry):
+    payload = {field: getattr(entry, field) for field in _PAYLOAD_FIELDS}
+    payload["created_at"] = entry.created_at.isoformat()
+    return payload
+
+
+def _entry_from_payload(payload):
+    values = {field: payload.get(field) for field in _PAYLOAD_FIELDS}
+    return AuditLog(created_at=parse_datetime(payload["created_at"]), **values)
+
+
+def flush_audit_outbox(batch_size=500):
+    """Move one batch of parked entries to the audit database; return the count.
+
+    Rows are claimed with ``SKIP LOCKED`` so several dispatchers can run side
+    by side. Raises ``DatabaseError`` while the audit database is still down.
+    """
+    with transaction.atomic():
+        batch = list(AuditOutbox.objects.select_for_update(skip_locked=True).order_by("id")[:batch_size])
+        if not batch:
+            return 0
+        entries = [_entry_from_payload(item.payload) for item in batch]
+        UserAgent.objects.db_manager(audit_database()).attach(entries)
+        AuditLog.objects.using(audit_database()).bulk_create(entries)
+        AuditOutbox.objects.filter(id__in=[item.id for item in batch]).delete()
+    return len(batch)
@@ -0,0 +1,267 @@
+import gzip
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import Max
+from django.utils.dateparse import parse_datetime
+
+from .audit import audit_database
+from .audit_rollups import rolled_up_through
+from .models import AuditCheckpoint, AuditLog
+
+SEGMENT_SUFFIXES = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+INDEX_SUFFIX = ".index.json"
+
+_ROW_FIELDS = (
+    "id",
+    "actor_id",
+    "action",
+    "object_type",
+    "object_id",
+    "ip_address",
+    "user_agent",
+    "metadata",
+    "repeat_count",
+    "chain_hash",
+)
+
+
+def archive_directory():
+    return Path(settings.AUDIT_ARCHIVE_DIR)
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise ImproperlyConfigured("AUDIT_ARCHIVE_COMPRESSION=zstd requires the zstandard package.") from exc
+    return zstandard
+
+
+def _compress(data, compression):
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if compression == "zstd":
+        return _zstandard().ZstdCompressor(level=10).compress(data)
+    raise ImproperlyConfigured(f"Unknown AUDIT_ARCHIVE_COMPRESSION: {compression!r}")
+
+
+def _open_segment(path, compression):
+    raw = path.open("rb")
+    if compression == "zstd":
+        return io.TextIOWrapper(_zstandard().ZstdDecompressor().stream_reader(raw, closefd=True), encoding="utf-8")
+    return io.TextIOWrapper(gzip.GzipFile(fileobj=raw), encoding="utf-8")
+
+
+def _index_path(directory, index):
+    return directory / index["segment"].replace(SEGMENT_SUFFIXES[index["compression"]], INDEX_SUFFIX)
+
+
+def _write_read_only(path, data):
+    """Write ``data`` through a temporary file so readers never see a partial file."""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    with tmp_path.open("wb") as handle:
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.chmod(tmp_path, 0o444)
+    os.replace(tmp_path, path)
+
+
+def _row(entry):
+    row = {field: getattr(entry, field) for field in _ROW_FIELDS}
+    row["created_at"] = entry.created_at.isoformat()
+    row["last_seen_at"] = entry.last_seen_at.isoformat() if entry.last_seen_at else None
+    return row
+
+
+def write_segment(entries, directory=None, compression=None):
+    """Write entries (oldest first) as a compressed JSONL segment plus its index sidecar.
+
+    The sidecar holds the time range, id range and actor ids of the segment
+    and is written last: a segment without one is incomplete, ignored by
+    readers and replaced by the next attempt. Complete segments are never
+    rewritten. Returns the sidecar contents.
+    """
+    directory = Path(directory or archive_directory())
+    compression = compression or settings.AUDIT_ARCHIVE_COMPRESSION
+    directory.mkdir(parents=True, exist_ok=True)
+
+    first, last = entries[0], entries[-1]
+    name = f"audit-{first.created_at:%Y%m%dT%H%M%S}-{first.id}-{last.id}"
+    body = "".join(json.dumps(_row(entry), ensure_ascii=False, separators=(",", ":")) + "\n" for entry in entries)
+    data = _compress(body.encode("utf-8"), compression)
+    segment_path = directory / f"{name}{SEGMENT_SUFFIXES[compression]}"
+    index = {
+        "segment": segment_path.name,
+        "compression": compression,
+        "count": len(entries),
+        "min_created_at": min(entry.created_at for entry in entries).isoformat(),
+        "max_created_at": max(entry.created_at for entry in entries).isoformat(),
+        "min_id": min(entry.id for entry in entries),
+        "max_id": max(entry.id for entry in entries),
+        "actor_ids": sorted({entry.actor_id for entry in entries if entry.actor_id is not None}),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+    index_path = _index_path(directory, index)
+    if index_path.exists():
+        raise FileExistsError(f"Audit archive segment {name} already exists.")
+    _write_read_only(segment_path, data)
+    _write_read_only(index_path, json.dumps(index, indent=1).encode("utf-8"))
+    return index
+
+
+def discard_segment(index, directory=None):
+    directory = Path(directory or archive_directory())
+    _index_path(directory, index).unlink(missing_ok=True)
+    (directory / index["segment"]).unlink(missing_ok=True)
+
+
+def archivable_through(db=None):
+    """Highest ``AuditLog`` id that may be archived: counted in the rollups and in a verified checkpoint.
+
+    A checkpoint is only verified after its entries are sealed, so the bound
+    never passes the hash chain head.
+    """
+    db = db or audit_database()
+    verified_through = (
+        AuditCheckpoint.objects.using(db).exclude(verified_at=None).aggregate(last=Max("last_audit_id"))["last"] or 0
+    )
+    return min(rolled_up_through(), verified_through)
+
+
+def archive_audit_logs(cutoff, segment_size=50000, directory=None, compression=None):
+    """Move audit entries older than ``cutoff`` into segments; return the sidecars written.
+
+    Each segment is written while its rows are locked and deleted in the
+    same audit database transaction; if that transaction fails the segment
+    is removed again, so an entry is never both archived and live, nor lost.
+    Only entries up to ``archivable_through()`` move, so nothing uncounted,
+    unsealed or in an unchecked checkpoint range leaves the table.
+    """
+    db = audit_database()
+    counted_through = archivable_through(db)
+    written = []
+    while True:
+        index = None
+        try:
+            with transaction.atomic(using=db):
+                batch = list(
+                    AuditLog.objects.using(db)
+                    .filter(created_at__lt=cutoff, id__lte=counted_through)
+                    .select_related("agent")
+                    .order_by("created_at", "id")
+                    .select_for_update(of=("self",))[:segment_size]
+                )
+                if not batch:
+                    return written
+                index = write_segment(batch, directory=directory, compression=compression)
+                AuditLog.objects.using(db).filter(id__in=[entry.id for entry in batch]).delete()
+        except Exception:
+            if index is not None:
+                discard_segment(index, directory=directory)
+            raise
+        written.append(index)
+
+
+def segment_indexes(directory=None):
+    """Sidecars of complete segments, oldest first."""
+    directory = Path(directory or archive_directory())
+    if not directory.is_dir():
+        return []
+    indexes = []
+    for path in directory.glob(f"audit-*{INDEX_SUFFIX}"):
+        index = json.loads(path.read_text(encoding="utf-8"))
+        index["min_created_at"] = parse_datetime(index["min_created_at"])
+        index["max_created_at"] = parse_datetime(index["max_created_at"])
+        indexes.append(index)
+    return sorted(indexes, key=lambda item: (item["min_created_at"], item["min_id"]))
+
+
+def _entry(row, created_at):
+    values = {field: row.get(field) for field in _ROW_FIELDS}
+    values["repeat_count"] = values["repeat_count"] or 1
+    values["chain_hash"] = values["chain_hash"] or ""
+    last_seen_at = row.get("last_seen_at")
+    return AuditLog(
+        created_at=created_at,
+        last_seen_at=parse_datetime(last_seen_at) if last_seen_at else None,
+        **values,
+    )
+
+
+def archived_entries(after_id, last_id=None, directory=None):
+    """Archived entries with ids in ``(after_id, last_id]``, in id order, as unsaved ``AuditLog`` rows.
+
+    ``last_id=None`` means no upper bound. Only segments whose id range
+    overlaps the request are opened.
+    """
+    directory = Path(directory or archive_directory())
+    last_id = float("inf") if last_id is None else last_id
+    entries = []
+    for index in segment_indexes(directory):
+        if index["max_id"] <= after_id or index["min_id"] > last_id:
+            continue
+        with _open_segment(directory / index["segment"], index["compression"]) as lines:
+            for line in lines:
+                row = json.loads(line)
+                if after_id < row["id"] <= last_id:
+                    entries.append(_entry(row, parse_datetime(row["created_at"])))
+    entries.sort(key=lambda entry: entry.id)
+    return entries
+
+
+def _metadata_matches(metadata, filters):
+    """Python counterpart of the ``metadata @> ...`` filters: ``(path, values)`` pairs, all must match."""
+    for path, values in filters:
+        value = metadata
+        for key in path:
+            if not isinstance(value, dict) or key not in value:
+                return False
+            value = value[key]
+        # JSON true is not the number 1.
+        if not any(value == item and isinstance(value, bool) == isinstance(item, bool) for item in values):
+            return False
+    return True
+
+
+def search_archive(date_from, date_to=None, actor_ids=None, action=None, object_type=None, metadata=(), directory=None):
+    """Archived entries in ``[date_from, date_to]``, newest first, as unsaved ``AuditLog`` rows.
+
+    Only segments whose time range overlaps the request are opened, and,
+    when ``actor_ids`` restricts the actors, only those whose actor index
+    contains one of them. ``actor_ids=None`` means any actor. ``metadata``
+    holds ``(path, values)`` pairs as the audit list parses them.
+    """
+    directory = Path(directory or archive_directory())
+    object_type = object_type.casefold() if object_type else None
+    entries = []
+    for index in segment_indexes(directory):
+        if index["max_created_at"] < date_from or (date_to is not None and index["min_created_at"] > date_to):
+            continue
+        if actor_ids is not None and not actor_ids.intersection(index["actor_ids"]):
+            continue
+        with _open_segment(directory / index["segment"], index["compression"]) as lines:
+            for line in lines:
+                row = json.loads(line)
+                created_at = parse_datetime(row["created_at"])
+                if created_at < date_from or (date_to is not None and created_at > date_to):
+                    continue
+                if actor_ids is not None and row["actor_id"] not in actor_ids:
+                    continue
+                if action and row["action"] != action:
+                    continue
+                if object_type and row["object_type"].casefold() != object_type:
+                    continue
+                if metadata and not _metadata_matches(row["metadata"], metadata):
+                    continue
+                entries.append(_entry(row, created_at))
+    entries.sort(key=lambda entry: (entry.created_at, entry.id), reverse=True)
+    return entries
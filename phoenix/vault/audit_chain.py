@@ -0,0 +1,226 @@
+import hashlib
+import heapq
+import hmac
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import chain
+from operator import attrgetter
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .audit import AUDIT_TABLE, audit_database
+from .audit_archive import archived_entries
+from .audit_rollups import settled_upper_bound
+from .models import AuditChainHead, AuditCheckpoint, AuditLog
+
+# Chain hash the first sealed entry is chained to.
+GENESIS_HASH = "0" * 64
+
+_SEAL_SQL = f"UPDATE {AUDIT_TABLE} SET chain_hash = %s WHERE id = %s AND chain_hash = ''"
+
+
+def _signing_key():
+    key = getattr(settings, "AUDIT_CHAIN_KEY", None)
+    if key:
+        return key.encode("utf-8") if isinstance(key, str) else key
+    secret = getattr(settings, "SECRET_KEY", "")
+    return hashlib.sha256(b"phoenix-audit-chain:" + secret.encode("utf-8")).digest()
+
+
+def entry_hash(entry, previous_hash):
+    """SHA-256 over the previous chain hash and a canonical JSON form of the entry."""
+    record = {
+        "id": entry.id,
+        "actor_id": entry.actor_id,
+        "action": entry.action,
+        "object_type": entry.object_type,
+        "object_id": entry.object_id,
+        "ip_address": entry.ip_address,
+        "user_agent": entry.user_agent,
+        "metadata": entry.metadata,
+        "created_at": entry.created_at.isoformat(),
+        "repeat_count": entry.repeat_count,
+        "last_seen_at": entry.last_seen_at.isoformat() if entry.last_seen_at else None,
+    }
+    payload = json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(f"{previous_hash}:{payload}".encode("utf-8")).hexdigest()
+
+
+def checkpoint_signature(checkpoint):
+    message = ":".join(
+        str(value)
+        for value in (
+            checkpoint.after_audit_id,
+            checkpoint.last_audit_id,
+            checkpoint.start_hash,
+            checkpoint.chain_hash,
+            checkpoint.row_count,
+        )
+    )
+    return hmac.new(_signing_key(), message.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def _checkpoint_start(db):
+    """Id and chain hash the next checkpoint starts from: the end of the previous one."""
+    previous = AuditCheckpoint.objects.using(db).order_by("-last_audit_id").first()
+    if previous is None:
+        return 0, GENESIS_HASH
+    return previous.last_audit_id, previous.chain_hash
+
+
+def _checkpoint(head, start, now):
+    checkpoint = AuditCheckpoint(
+        after_audit_id=start[0],
+        last_audit_id=head.last_audit_id,
+        start_hash=start[1],
+        chain_hash=head.chain_hash,
+        row_count=head.pending_rows,
+        created_at=now,
+    )
+    checkpoint.signature = checkpoint_signature(checkpoint)
+    head.pending_rows = 0
+    head.checkpointed_at = now
+    return checkpoint
+
+
+def seal_audit_entries(batch_size=10000, now=None, checkpoint=False):
+    """Chain audit entries added since the chain head and take due checkpoints; return how many were sealed.
+
+    Entries are sealed in id order once they are settled (see
+    ``vault.audit_rollups.settled_upper_bound``), so a coalesced view is
+    hashed with its final ``repeat_count`` and is never bumped afterwards.
+    A signed checkpoint is taken every ``AUDIT_CHAIN_CHECKPOINT_ROWS``
+    entries, and for the entries sealed since the previous one once
+    ``AUDIT_CHAIN_CHECKPOINT_SECONDS`` have passed, or right away with
+    ``checkpoint=True``. Hashes, checkpoints and the head move in one audit
+    database transaction; the head row lock keeps concurrent runs from
+    forking the chain.
+    """
+    now = now or timezone.now()
+    db = audit_database()
+
+    with transaction.atomic(using=db):
+        head, _ = AuditChainHead.objects.using(db).select_for_update().get_or_create(
+            pk=1, defaults={"chain_hash": GENESIS_HASH, "checkpointed_at": now}
+        )
+        pending = AuditLog.objects.using(db).filter(id__gt=head.last_audit_id)
+        upper = settled_upper_bound(pending, batch_size, now)
+        start = _checkpoint_start(db)
+        sealed, checkpoints = [], []
+        if upper is not None and upper > head.last_audit_id:
+            for entry in pending.filter(id__lte=upper).select_related("agent").order_by("id"):
+                head.chain_hash = entry_hash(entry, head.chain_hash)
+                head.last_audit_id = entry.id
+                head.pending_rows += 1
+                sealed.append((head.chain_hash, entry.id))
+                if head.pending_rows >= settings.AUDIT_CHAIN_CHECKPOINT_ROWS:
+                    checkpoints.append(_checkpoint(head, start, now))
+                    start = (head.last_audit_id, head.chain_hash)
+        due = head.checkpointed_at <= now - timedelta(seconds=settings.AUDIT_CHAIN_CHECKPOINT_SECONDS)
+        if head.pending_rows and (checkpoint or due):
+            checkpoints.append(_checkpoint(head, start, now))
+        if not sealed and not checkpoints:
+            return 0
+
+        if sealed:
+            with connections[db].cursor() as cursor:
+                cursor.executemany(_SEAL_SQL, sealed)
+        AuditCheckpoint.objects.using(db).bulk_create(checkpoints)
+        head.save(using=db)
+    return len(sealed)
+
+
+def _range_entries(checkpoint, db):
+    """Entries of a checkpoint range in id order, from the table and the archive segments."""
+    live = (
+        AuditLog.objects.using(db)
+        .filter(id__gt=checkpoint.after_audit_id, id__lte=checkpoint.last_audit_id)
+        .select_related("agent")
+        .order_by("id")
+        .iterator(chunk_size=2000)
+    )
+    # Start the query before reading the archive: an entry archived meanwhile
+    # then shows up twice rather than not at all, and the live copy is kept.
+    first = next(live, None)
+    live = chain([first], live) if first is not None else live
+    # Entries archived before the chain reached them were never sealed.
+    archived = [
+        entry
+        for entry in archived_entries(checkpoint.after_audit_id, checkpoint.last_audit_id)
+        if entry.chain_hash
+    ]
+    previous_id = None
+    for entry in heapq.merge(live, archived, key=attrgetter("id")):
+        if entry.id != previous_id:
+            yield entry
+        previous_id = entry.id
+
+
+def verify_checkpoint(checkpoint, db=None):
+    """Recompute the chain over one checkpoint range; return a list of problems (empty when intact).
+
+    Entries already moved to the archive are read back from their segments.
+    """
+    db = db or audit_database()
+    label = str(checkpoint)
+    if not hmac.compare_digest(checkpoint.signature, checkpoint_signature(checkpoint)):
+        return [f"{label}: signature mismatch"]
+
+    problems = []
+    chain_hash, count = checkpoint.start_hash, 0
+    for entry in _range_entries(checkpoint, db):
+        chain_hash = entry_hash(entry, chain_hash)
+        count += 1
+        if entry.chain_hash != chain_hash and not problems:
+            problems.append(f"{label}: entry #{entry.id} does not match its chain hash")
+    if count != checkpoint.row_count:
+        problems.append(f"{label}: {count} entries, {checkpoint.row_count} sealed")
+    elif not problems and chain_hash != checkpoint.chain_hash:
+        problems.append(f"{label}: chain hash mismatch")
+    return problems
+
+
+def _verify_in_thread(checkpoint, db):
+    try:
+        return verify_checkpoint(checkpoint, db)
+    finally:
+        connections[db].close()
+
+
+def verify_audit_chain(workers=1, recheck=False):
+    """Verify checkpoints not verified yet (all of them with ``recheck``); return ``(checked, problems)``.
+
+    Ranges are checked independently, by up to ``workers`` threads, and
+    every checkpoint must start where the previous one ended. Intact ranges
+    up to the first broken one get ``verified_at``, so the next run starts
+    after them and checks the broken range again.
+    """
+    db = audit_database()
+    checkpoints = AuditCheckpoint.objects.using(db).order_by("last_audit_id")
+    previous = (0, GENESIS_HASH)
+    if not recheck:
+        last_verified = checkpoints.exclude(verified_at=None).order_by("-last_audit_id").first()
+        if last_verified is not None:
+            checkpoints = checkpoints.filter(last_audit_id__gt=last_verified.last_audit_id)
+            previous = (last_verified.last_audit_id, last_verified.chain_hash)
+    checkpoints = list(checkpoints)
+
+    if workers > 1 and len(checkpoints) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(lambda checkpoint: _verify_in_thread(checkpoint, db), checkpoints))
+    else:
+        results = [verify_checkpoint(checkpoint, db) for checkpoint in checkpoints]
+
+    problems, intact = [], []
+    for checkpoint, result in zip(checkpoints, results):
+        if (checkpoint.after_audit_id, checkpoint.start_hash) != previous:
+            result = [f"{checkpoint}: does not continue the previous checkpoint", *result]
+        previous = (checkpoint.last_audit_id, checkpoint.chain_hash)
+        if not result and not problems:
+            intact.append(checkpoint.pk)
+        problems.extend(result)
+    AuditCheckpoint.objects.using(db).filter(pk__in=intact, verified_at=None).update(verified_at=timezone.now())
+    return len(checkpoints), problems
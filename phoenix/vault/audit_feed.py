@@ -0,0 +1,63 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import prefetch_related_objects
+from django.utils import timezone
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from .audit import audit_database, with_audit_actors
+from .audit_archive import archivable_through, archived_entries
+from .audit_rollups import settled_upper_bound
+from .models import AuditFeedToken, AuditLog
+
+# last_used_at is refreshed at most this often, not on every poll.
+_LAST_USED_RESOLUTION = timedelta(minutes=1)
+
+
+class AuditFeedTokenAuthentication(TokenAuthentication):
+    """``Authorization: Feed <key>`` with an ``AuditFeedToken``.
+
+    The request stays anonymous; ``request.auth`` is the token, which only
+    ``IsAuditFeedReader`` accepts.
+    """
+
+    keyword = "Feed"
+
+    def authenticate_credentials(self, key):
+        token = AuditFeedToken.objects.filter(key_digest=AuditFeedToken.digest(key), is_active=True).first()
+        if token is None:
+            raise AuthenticationFailed("Invalid feed token.")
+        now = timezone.now()
+        if token.last_used_at is None or token.last_used_at < now - _LAST_USED_RESOLUTION:
+            AuditFeedToken.objects.filter(pk=token.pk).update(last_used_at=now)
+        return AnonymousUser(), token
+
+
+def feed_batch(after, limit):
+    """Up to ``limit`` settled audit entries with ids after ``after``, in id order.
+
+    Only settled entries are returned (see ``settled_upper_bound``): an entry
+    whose transaction commits late cannot appear behind a cursor that has
+    already passed it, and a coalesced view is not bumped after it was read.
+    Reads go to the audit database, never a replica. A cursor behind
+    ``archivable_through()`` may have entries in the archive, so those are
+    read back from its segments and merged in: archiving never opens a gap.
+    """
+    db = audit_database()
+    pending = AuditLog.objects.using(db).filter(id__gt=after)
+    upper = settled_upper_bound(pending, limit)
+    entries = []
+    if upper is not None and upper > after:
+        entries = list(with_audit_actors(pending.filter(id__lte=upper)).order_by("id"))
+    if after >= archivable_through(db):
+        return entries
+
+    # Archived entries are all settled, but must not pass an unsettled live one.
+    live_ids = {entry.id for entry in entries}
+    archived = [entry for entry in archived_entries(after, upper) if entry.id not in live_ids]
+    if not archived:
+        return entries
+    entries = sorted(entries + archived, key=lambda entry: entry.id)[:limit]
+    prefetch_related_objects([entry for entry in entries if entry.id not in live_ids], "actor")
+    return entries
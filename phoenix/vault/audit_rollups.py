@@ -0,0 +1,88 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Min, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from .audit import audit_database
+from .models import AuditLog, AuditRollup, AuditRollupWatermark
+
+ROLLUP_TABLE = AuditRollup._meta.db_table
+
+_UPSERT_SQL = f"""
+INSERT INTO {ROLLUP_TABLE} AS r (period, bucket, action, object_type, actor_id, department_id, count)
+VALUES (%s, %s, %s, %s, %s, %s, %s)
+ON CONFLICT (period, bucket, action, object_type, actor_id, department_id)
+DO UPDATE SET count = r.count + EXCLUDED.count
+"""
+
+
+def rolled_up_through():
+    """Highest ``AuditLog`` id already counted; entries up to it may be archived."""
+    watermark = AuditRollupWatermark.objects.filter(pk=1).values_list("last_audit_id", flat=True).first()
+    return watermark or 0
+
+
+def settled_upper_bound(pending, batch_size, now=None):
+    """Highest id among the first ``batch_size`` of ``pending`` entries that are settled, or ``None``.
+
+    An entry is settled once it is older than ``AUDIT_ROLLUP_LAG_SECONDS``,
+    so rows whose transaction has not committed yet are not skipped over,
+    and than ``AUDIT_VIEW_COALESCE_SECONDS``, so a coalesced view has its
+    final ``repeat_count``. The bound stops before the first unsettled entry.
+    """
+    now = now or timezone.now()
+    horizon = now - timedelta(seconds=max(settings.AUDIT_ROLLUP_LAG_SECONDS, settings.AUDIT_VIEW_COALESCE_SECONDS))
+    upper = pending.order_by("id").values_list("id", flat=True)[batch_size - 1 : batch_size].first()
+    if upper is None:
+        upper = pending.order_by("-id").values_list("id", flat=True).first()
+    if upper is None:
+        return None
+    too_recent = pending.filter(id__lte=upper, created_at__gte=horizon).aggregate(first=Min("id"))["first"]
+    return upper if too_recent is None else too_recent - 1
+
+
+def update_audit_rollups(batch_size=50000, now=None):
+    """Count audit entries added since the watermark into ``AuditRollup``; return how many.
+
+    Entries are taken in id order, at most ``batch_size`` at a time, and only
+    up to the first one that is not settled yet (see ``settled_upper_bound``).
+    Counts and the watermark move in one transaction; the watermark row lock
+    keeps concurrent runs from counting an entry twice.
+    """
+    audit_entries = AuditLog.objects.using(audit_database())
+
+    with transaction.atomic():
+        watermark, _ = AuditRollupWatermark.objects.select_for_update().get_or_create(pk=1)
+        pending = audit_entries.filter(id__gt=watermark.last_audit_id)
+        upper = settled_upper_bound(pending, batch_size, now)
+        if upper is None or upper <= watermark.last_audit_id:
+            return 0
+
+        hourly = list(
+            pending.filter(id__lte=upper)
+            .annotate(hour=TruncHour("created_at"))
+            .values_list("hour", "action", "object_type", "actor_id")
+            .annotate(count=Sum("repeat_count"))
+            .order_by()
+        )
+        actor_ids = {actor_id for _, _, _, actor_id, _ in hourly if actor_id is not None}
+        departments = dict(get_user_model().objects.filter(id__in=actor_ids).values_list("id", "department_id"))
+
+        counts = Counter()
+        for hour, action, object_type, actor_id, count in hourly:
+            department_id = departments.get(actor_id) or 0
+            actor_id = actor_id or 0
+            day = hour.replace(hour=0)
+            counts[(AuditRollup.Period.HOUR.value, hour, action, object_type, actor_id, department_id)] += count
+            counts[(AuditRollup.Period.DAY.value, day, action, object_type, actor_id, department_id)] += count
+        with connection.cursor() as cursor:
+            cursor.executemany(_UPSERT_SQL, [(*key, count) for key, count in counts.items()])
+
+        watermark.last_audit_id = upper
+        watermark.save(update_fields=["last_audit_id", "updated_at"])
+    return sum(row[-1] for row in hourly)
@@ -0,0 +1,210 @@
+import pickle
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.redis import RedisCache as DjangoRedisCache
+from django.db import connections, transaction
+
+CACHE_TABLE = "vault_cache_entry"
+BUCKET_TABLE = "vault_rate_bucket"
+
+_LIVE_ROW = "(expires_at IS NULL OR expires_at > clock_timestamp())"
+_EXPIRED_CONFLICT = "WHERE c.expires_at IS NOT NULL AND c.expires_at <= clock_timestamp()"
+_EXPIRY_SQL = "CASE WHEN %s::double precision IS NULL THEN NULL ELSE clock_timestamp() + make_interval(secs => %s) END"
+
+_TOKEN_BUCKET_SQL = f"""
+INSERT INTO {BUCKET_TABLE} AS b (key, tokens, allowed, updated_at, expires_at)
+VALUES (
+    %(key)s,
+    %(capacity)s - 1,
+    TRUE,
+    statement_timestamp(),
+    statement_timestamp() + make_interval(secs => %(capacity)s / %(rate)s)
+)
+ON CONFLICT (key) DO UPDATE SET
+    tokens = LEAST(%(capacity)s, b.tokens + EXTRACT(EPOCH FROM statement_timestamp() - b.updated_at) * %(rate)s)
+        - CASE
+            WHEN LEAST(%(capacity)s, b.tokens + EXTRACT(EPOCH FROM statement_timestamp() - b.updated_at) * %(rate)s) >= 1
+            THEN 1 ELSE 0
+        END,
+    allowed = LEAST(%(capacity)s, b.tokens + EXTRACT(EPOCH FROM statement_timestamp() - b.updated_at) * %(rate)s) >= 1,
+    updated_at = statement_timestamp(),
+    expires_at = statement_timestamp() + make_interval(secs => %(capacity)s / %(rate)s)
+RETURNING allowed, tokens
+"""
+
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate))
+return {allowed, tostring(tokens)}
+"""
+
+
+def _wait_seconds(tokens, refill_rate):
+    return max(0.0, (1 - float(tokens)) / refill_rate)
+
+
+class PostgresCache(BaseCache):
+    """Cache shared by every worker, stored in PostgreSQL UNLOGGED tables.
+
+    UNLOGGED tables skip WAL, so writes are cheap and the data is dropped on a
+    crash, which is acceptable for a cache. Every operation is one statement.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._table = location or CACHE_TABLE
+        self._alias = params.get("OPTIONS", {}).get("DATABASE", "default")
+
+    def _cursor(self):
+        return connections[self._alias].cursor()
+
+    def _ttl(self, timeout):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        return None if timeout is None else float(timeout)
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._cursor() as cursor:
+            cursor.execute(f"SELECT value FROM {self._table} WHERE key = %s AND {_LIVE_ROW}", [key])
+            row = cursor.fetchone()
+        if row is None:
+            return default
+        return pickle.loads(bytes(row[0]))
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        if not key_map:
+            return {}
+        with self._cursor() as cursor:
+            cursor.execute(
+                f"SELECT key, value FROM {self._table} WHERE key = ANY(%s) AND {_LIVE_ROW}",
+                [list(key_map)],
+            )
+            rows = cursor.fetchall()
+        return {key_map[key]: pickle.loads(bytes(value)) for key, value in rows}
+
+    def _delete(self, key):
+        """Delete by a key already built with ``make_and_validate_key``."""
+        with self._cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self._table} WHERE key = %s", [key])
+            return cursor.rowcount > 0
+
+    def _upsert(self, key, value, timeout, only_if_expired=False):
+        ttl = self._ttl(timeout)
+        if ttl is not None and ttl <= 0:
+            # set() drops the entry; add() never touches an existing one.
+            if not only_if_expired:
+                self._delete(key)
+            return False
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        condition = _EXPIRED_CONFLICT if only_if_expired else ""
+        with self._cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {self._table} AS c (key, value, expires_at)
+                VALUES (%s, %s, {_EXPIRY_SQL})
+                ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, expires_at = EXCLUDED.expires_at
+                {condition}
+                RETURNING key
+                """,
+                [key, payload, ttl, ttl],
+            )
+            return cursor.fetchone() is not None
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._upsert(key, value, timeout, only_if_expired=True)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._upsert(key, value, timeout)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        ttl = self._ttl(timeout)
+        with self._cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {self._table} SET expires_at = {_EXPIRY_SQL} WHERE key = %s AND {_LIVE_ROW}",
+                [ttl, ttl, key],
+            )
+            return cursor.rowcount > 0
+
+    def delete(self, key, version=None):
+        return self._delete(self.make_and_validate_key(key, version=version))
+
+    def delete_many(self, keys, version=None):
+        keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        if not keys:
+            return
+        with self._cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self._table} WHERE key = ANY(%s)", [keys])
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._cursor() as cursor:
+            cursor.execute(f"SELECT 1 FROM {self._table} WHERE key = %s AND {_LIVE_ROW}", [key])
+            return cursor.fetchone() is not None
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with transaction.atomic(using=self._alias), self._cursor() as cursor:
+            cursor.execute(
+                f"SELECT value FROM {self._table} WHERE key = %s AND {_LIVE_ROW} FOR UPDATE",
+                [key],
+            )
+            row = cursor.fetchone()
+            if row is None:
+                raise ValueError("Key '%s' not found." % key)
+            new_value = pickle.loads(bytes(row[0])) + delta
+            cursor.execute(
+                f"UPDATE {self._table} SET value = %s WHERE key = %s",
+                [pickle.dumps(new_value, pickle.HIGHEST_PROTOCOL), key],
+            )
+        return new_value
+
+    def clear(self):
+        with self._cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self._table}")
+            cursor.execute(f"DELETE FROM {BUCKET_TABLE}")
+
+    def cull_expired(self):
+        with self._cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self._table} WHERE NOT {_LIVE_ROW}")
+            deleted = cursor.rowcount
+            cursor.execute(f"DELETE FROM {BUCKET_TABLE} WHERE expires_at <= clock_timestamp()")
+            return deleted + cursor.rowcount
+
+    def consume_token(self, key, capacity, refill_rate):
+        """Take one token from the bucket ``key``; return ``(allowed, wait_seconds)``."""
+        key = self.make_and_validate_key(key)
+        with self._cursor() as cursor:
+            cursor.execute(
+                _TOKEN_BUCKET_SQL,
+                {"key": key, "capacity": float(capacity), "rate": float(refill_rate)},
+            )
+            allowed, tokens = cursor.fetchone()
+        return bool(allowed), (0.0 if allowed else _wait_seconds(tokens, refill_rate))
+
+
+class RedisCache(DjangoRedisCache):
+    """Django's Redis cache with the token-bucket primitive used by throttles."""
+
+    def consume_token(self, key, capacity, refill_rate):
+        key = self.make_and_validate_key(key)
+        client = self._cache.get_client(key, write=True)
+        allowed, tokens = client.eval(_TOKEN_BUCKET_LUA, 1, key, capacity, refill_rate)
+        return bool(allowed), (0.0 if allowed else _wait_seconds(tokens, refill_rate))
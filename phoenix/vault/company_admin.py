@@ -2,7 +2,8 @@ from django.contrib import admin
 from django.contrib.admin import AdminSite
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 
-from .forms import UserChangeForm, UserCreationForm
+from .audit import audit_is_separate
+from .forms import CredentialAdminForm, CredentialVersionAdminForm, UserChangeForm, UserCreationForm
 from .models import (
     AccessRequest,
     AuditLog,
@@ -77,6 +78,10 @@ class CompanyAuditLogAdmin(admin.ModelAdmin):
         "user_agent",
         "metadata",
     )
+    exclude = ("agent",)
+
+    def get_search_fields(self, request):
+        return ("object_id",) if audit_is_separate() else self.search_fields
 
     def has_add_permission(self, request):
         return False
@@ -90,8 +95,8 @@ company_admin_site.register(User, CompanyUserAdmin)
 company_admin_site.register(Department)
 company_admin_site.register(Service)
 company_admin_site.register(ServiceAccess)
-company_admin_site.register(Credential)
-company_admin_site.register(CredentialVersion)
+company_admin_site.register(Credential, form=CredentialAdminForm)
+company_admin_site.register(CredentialVersion, form=CredentialVersionAdminForm)
 company_admin_site.register(AccessRequest)
 company_admin_site.register(DepartmentShare)
 company_admin_site.register(LoginChallenge)
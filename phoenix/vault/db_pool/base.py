@@ -0,0 +1,127 @@
+"""PostgreSQL backend that can check connections out of a psycopg 3 pool.
+
+Django 4.2 opens a new server connection per thread (and closes it after the
+request unless ``CONN_MAX_AGE`` keeps it). With ``OPTIONS["pool"]`` set to a
+dict of ``psycopg_pool.ConnectionPool`` arguments, connections are borrowed
+from one bounded pool per process instead and returned when Django would
+close them. Without ``pool`` the backend is the stock one. The option has
+the same shape as Django 5.1's native pool, so upgrading is an ``ENGINE``
+change.
+"""
+
+import threading
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base, creation
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    # Pooled connections keep sessions on the database open, which blocks
+    # CREATE/DROP DATABASE of the test database. Test mirrors (the replica
+    # alias) have pools of their own on the same database.
+    def _create_test_db(self, *args, **kwargs):
+        self.connection.close_pool()
+        return super()._create_test_db(*args, **kwargs)
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        self.connection.close_pool(database_name=test_database_name)
+        return super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._checked_out_from = None
+
+    def _pool_key(self):
+        settings_dict = self.settings_dict
+        return (
+            self.alias,
+            settings_dict["NAME"],
+            settings_dict["USER"],
+            settings_dict["HOST"],
+            settings_dict["PORT"],
+        )
+
+    @property
+    def pool(self):
+        """The process-wide pool for this alias, or ``None`` when pooling is off."""
+        pool_options = self.settings_dict["OPTIONS"].get("pool")
+        if not pool_options or self.alias == NO_DB_ALIAS:
+            return None
+        key = self._pool_key()
+        pool = self._pools.get(key)
+        if pool is not None:
+            return pool
+        if self.settings_dict["CONN_MAX_AGE"]:
+            raise ImproperlyConfigured("OPTIONS['pool'] requires CONN_MAX_AGE = 0; the pool keeps connections open.")
+        try:
+            from psycopg_pool import ConnectionPool
+        except ImportError as exc:
+            raise ImproperlyConfigured("OPTIONS['pool'] requires the psycopg_pool package.") from exc
+
+        connect_kwargs = self.get_connection_params()
+        # Django switches autocommit itself after checkout; keep idle pooled
+        # connections outside a transaction.
+        connect_kwargs["autocommit"] = True
+        with self._pools_lock:
+            if key not in self._pools:
+                self._pools[key] = ConnectionPool(
+                    kwargs=connect_kwargs,
+                    # Opened on first use, after gunicorn has forked the worker.
+                    open=False,
+                    check=ConnectionPool.check_connection if self.settings_dict["CONN_HEALTH_CHECKS"] else None,
+                    **({} if pool_options is True else pool_options),
+                )
+            return self._pools[key]
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop("pool", None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        pool.open()
+        connection = pool.getconn()
+        self._checked_out_from = pool
+        options = self.settings_dict["OPTIONS"]
+        self.isolation_level = base.IsolationLevel(options.get("isolation_level", base.IsolationLevel.READ_COMMITTED))
+        if "isolation_level" in options:
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        pool, self._checked_out_from = self._checked_out_from, None
+        if self.connection is None or pool is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            # putconn() rolls back an unfinished transaction and discards
+            # broken connections.
+            pool.putconn(self.connection)
+
+    def pool_stats(self):
+        """``ConnectionPool.get_stats()`` for this process, or ``None`` without a pool."""
+        pool = self.pool
+        return None if pool is None else pool.get_stats()
+
+    def close_pool(self, database_name=None):
+        """Close every pool of this alias, or of any alias on ``database_name``.
+
+        The next checkout opens a new pool.
+        """
+        with self._pools_lock:
+            if database_name is None:
+                keys = [key for key in self._pools if key[0] == self.alias]
+            else:
+                keys = [key for key in self._pools if key[1] == database_name]
+            pools = [self._pools.pop(key) for key in keys]
+        for pool in pools:
+            pool.close()
@@ -0,0 +1,284 @@
+import csv
+import hashlib
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from .audit import build_audit_entry, write_audit_entries
+from .models import AuditLog, Department
+from .offboarding import offboard_department, offboard_users
+from .user_import import FALSE_VALUES, RowError, UserRowParser
+
+User = get_user_model()
+
+USER_SYNC_FIELDS = ("full_name", "email", "role", "department", "is_active", "directory_fingerprint")
+DEPARTMENT_SYNC_FIELDS = ("sort_order", "is_active", "directory_fingerprint", "updated_at")
+
+
+@dataclass
+class SyncStats:
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deactivated: int = 0
+    rejected: int = 0
+    deactivation_skipped: bool = False
+
+
+@dataclass
+class DirectorySyncResult:
+    departments: SyncStats = field(default_factory=SyncStats)
+    users: SyncStats = field(default_factory=SyncStats)
+    errors: list = field(default_factory=list)
+
+
+def _as_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def read_snapshot(path):
+    """Yield ``(line_number, row)`` from a ``.csv`` or ``.jsonl`` snapshot."""
+    path = Path(path)
+    with path.open(encoding="utf-8-sig", newline="") as stream:
+        if path.suffix.lower() in (".jsonl", ".ndjson"):
+            for line_number, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    yield line_number, {"__error__": f"Invalid JSON: {exc.msg}"}
+                    continue
+                yield line_number, {key.strip(): _as_text(value) for key, value in row.items()}
+        else:
+            reader = csv.DictReader(stream)
+            reader.fieldnames = [name.strip() for name in reader.fieldnames or []]
+            for row in reader:
+                yield reader.line_num, row
+
+
+def fingerprint(*values):
+    return hashlib.sha256(json.dumps(values, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _user_fingerprint(user):
+    return fingerprint(
+        user.portal_login,
+        user.full_name,
+        user.email,
+        user.role,
+        user.department.name if user.department else None,
+        user.is_active,
+    )
+
+
+def _reject(result, stats, line_number, errors, max_errors=1000):
+    stats.rejected += 1
+    if len(result.errors) < max_errors:
+        result.errors.append({"row": line_number, "errors": errors})
+
+
+def _sync_audit(action, obj):
+    return build_audit_entry(None, action, obj, metadata={"directory_sync": True})
+
+
+def _deactivation_unsafe(stats, seen, force):
+    """True when missing rows cannot be trusted to mean "removed from the directory".
+
+    A rejected row may be an existing entry, and an empty snapshot usually
+    means a failed export; either skips the deactivation pass unless forced.
+    """
+    stats.deactivation_skipped = not force and bool(stats.rejected or not seen)
+    return stats.deactivation_skipped
+
+
+def _sync_departments(rows, result, dry_run, force):
+    stats = result.departments
+    existing = {department.name: department for department in Department.objects.all()}
+    to_create, to_update, to_offboard, seen = [], [], [], set()
+    for line_number, row in rows:
+        name = (row.get("name") or "").strip()
+        if row.get("__error__") or not name:
+            _reject(result, stats, line_number, {"name": [row.get("__error__") or "This field is required."]})
+            continue
+        seen.add(name)
+        try:
+            sort_order = int((row.get("sort_order") or "0").strip())
+        except ValueError:
+            _reject(result, stats, line_number, {"sort_order": ["A valid integer is required."]})
+            continue
+        is_active = (row.get("is_active") or "").strip().lower() not in FALSE_VALUES
+        department_fingerprint = fingerprint(name, sort_order, is_active)
+
+        department = existing.get(name)
+        if department is None:
+            to_create.append(
+                Department(
+                    name=name,
+                    sort_order=sort_order,
+                    is_active=is_active,
+                    directory_fingerprint=department_fingerprint,
+                )
+            )
+        elif department.directory_fingerprint != department_fingerprint:
+            if department.is_active and not is_active:
+                to_offboard.append(department)
+            department.sort_order = sort_order
+            department.is_active = is_active
+            department.directory_fingerprint = department_fingerprint
+            to_update.append(department)
+        else:
+            stats.unchanged += 1
+
+    to_deactivate = []
+    if not _deactivation_unsafe(stats, seen, force):
+        to_deactivate = [
+            department
+            for name, department in existing.items()
+            if name not in seen and department.directory_fingerprint and department.is_active
+        ]
+    stats.created, stats.updated, stats.deactivated = len(to_create), len(to_update), len(to_deactivate)
+    if dry_run or not (to_create or to_update or to_deactivate):
+        return
+
+    with transaction.atomic():
+        Department.objects.bulk_create(to_create)
+        # Deactivated departments take their users, services and shares with them.
+        for department in to_offboard + to_deactivate:
+            offboard_department(department, metadata={"directory_sync": True})
+        now = timezone.now()
+        for department in to_deactivate:
+            department.is_active = False
+            department.directory_fingerprint = ""
+        for department in to_update + to_deactivate:
+            department.updated_at = now
+        Department.objects.bulk_update(to_update + to_deactivate, DEPARTMENT_SYNC_FIELDS)
+        write_audit_entries(
+            [_sync_audit(AuditLog.Action.CREATE, department) for department in to_create]
+            + [_sync_audit(AuditLog.Action.UPDATE, department) for department in to_update]
+        )
+
+
+def _sync_user_batch(batch, existing, superuser_logins, result, dry_run):
+    stats = result.users
+    to_create, changed = [], {}
+    for line_number, user in batch:
+        user.directory_fingerprint = _user_fingerprint(user)
+        stored = existing.get(user.portal_login)
+        if user.portal_login in superuser_logins:
+            _reject(result, stats, line_number, {"non_field_errors": ["Cannot modify superuser."]})
+        elif stored is None:
+            to_create.append(user)
+            existing[user.portal_login] = user.directory_fingerprint
+        elif stored != user.directory_fingerprint:
+            changed[user.portal_login] = user
+        else:
+            stats.unchanged += 1
+
+    stats.created += len(to_create)
+    stats.updated += len(changed)
+    if dry_run or not (to_create or changed):
+        return
+
+    with transaction.atomic():
+        to_update = list(User.objects.filter(portal_login__in=changed))
+        # Users switched off by the snapshot go through the offboarding cascade.
+        switched_off = [user.id for user in to_update if user.is_active and not changed[user.portal_login].is_active]
+        if switched_off:
+            offboard_users(switched_off, metadata={"directory_sync": True})
+        for user in to_update:
+            incoming = changed[user.portal_login]
+            for field_name in USER_SYNC_FIELDS:
+                setattr(user, field_name, getattr(incoming, field_name))
+        User.objects.bulk_create(to_create)
+        User.objects.bulk_update(to_update, USER_SYNC_FIELDS)
+        Token.objects.bulk_create([Token(user=user, key=Token.generate_key()) for user in to_create])
+        write_audit_entries(
+            [_sync_audit(AuditLog.Action.CREATE, user) for user in to_create]
+            + [_sync_audit(AuditLog.Action.UPDATE, user) for user in to_update]
+        )
+
+
+def _deactivate_missing_users(seen, result, batch_size, dry_run):
+    synced = (
+        User.objects.filter(is_active=True, is_superuser=False)
+        .exclude(directory_fingerprint="")
+        .values_list("id", "portal_login")
+    )
+    missing_ids = [user_id for user_id, portal_login in synced.iterator() if portal_login not in seen]
+    result.users.deactivated = len(missing_ids)
+    if dry_run:
+        return
+    for start in range(0, len(missing_ids), batch_size):
+        chunk = missing_ids[start : start + batch_size]
+        with transaction.atomic():
+            offboard_users(chunk, metadata={"directory_sync": True})
+            User.objects.filter(id__in=chunk).update(directory_fingerprint="")
+
+
+def sync_directory(department_rows=None, user_rows=None, batch_size=1000, dry_run=False, force=False):
+    """Apply a full HR snapshot, touching only rows whose content changed.
+
+    Each snapshot row is hashed and compared with the stored
+    ``directory_fingerprint``, so unchanged users and departments cost no
+    writes. Rows synced before but missing from this snapshot are
+    deactivated and their fingerprint cleared. Users and departments the
+    sync deactivates, missing or marked inactive, go through the
+    offboarding cascade. Rows never synced (created in the portal) are left
+    alone. That deactivation pass is skipped when the snapshot has rejected
+    rows or no valid rows at all, unless ``force`` is set. Writes go in
+    batched transactions with tokens and audit rows created in bulk.
+    """
+    result = DirectorySyncResult()
+    if department_rows is not None:
+        _sync_departments(department_rows, result, dry_run, force)
+    if user_rows is None:
+        return result
+
+    parser = UserRowParser(actor=None)
+    existing, superuser_logins = {}, set()
+    for portal_login, stored_fingerprint, is_superuser in User.objects.values_list(
+        "portal_login", "directory_fingerprint", "is_superuser"
+    ).iterator():
+        existing[portal_login] = stored_fingerprint
+        if is_superuser:
+            superuser_logins.add(portal_login)
+    seen = set()
+    user_rows = iter(user_rows)
+    while True:
+        chunk = list(islice(user_rows, batch_size))
+        if not chunk:
+            break
+        batch = []
+        for line_number, row in chunk:
+            if row.get("__error__"):
+                _reject(result, result.users, line_number, {"non_field_errors": [row["__error__"]]})
+                continue
+            # Seen before validation: a rejected row still keeps its user from being offboarded.
+            portal_login = User.normalize_username((row.get("portal_login") or "").strip())
+            if portal_login in seen:
+                _reject(result, result.users, line_number, {"portal_login": ["Duplicate row in snapshot."]})
+                continue
+            if portal_login:
+                seen.add(portal_login)
+            try:
+                user = parser.parse(row)
+            except RowError as exc:
+                _reject(result, result.users, line_number, exc.errors)
+                continue
+            batch.append((line_number, user))
+        _sync_user_batch(batch, existing, superuser_logins, result, dry_run)
+
+    if not _deactivation_unsafe(result.users, seen, force):
+        _deactivate_missing_users(seen, result, batch_size, dry_run)
+    return result
@@ -1,5 +1,6 @@
 import base64
 import hashlib
+import hmac
 import json
 import os
 from functools import lru_cache
@@ -63,14 +64,25 @@ def get_fernet() -> Fernet:
     return Fernet(_derive_fernet_key(secret))
 
 
-def _encrypt_asymmetric(value: str):
-    public_key = get_public_key()
-    if public_key is None:
-        return None
+@lru_cache(maxsize=1)
+def _secret_digest_key() -> bytes:
+    key = getattr(settings, "SECRET_BLOB_HASH_KEY", None)
+    if key:
+        return key.encode("utf-8") if isinstance(key, str) else key
+    secret = getattr(settings, "SECRET_KEY", "")
+    return hashlib.sha256(b"phoenix-secret-blob:" + secret.encode("utf-8")).digest()
 
-    data_key = os.urandom(32)
-    nonce = os.urandom(12)
-    ciphertext = AESGCM(data_key).encrypt(nonce, value.encode("utf-8"), None)
+
+def secret_digest(value: str) -> str:
+    """Keyed SHA-256 of a plaintext secret, used to find an existing ``SecretBlob``.
+
+    The key never leaves the server, so the digest cannot be used to guess
+    secrets offline.
+    """
+    return hmac.new(_secret_digest_key(), value.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def _wrap_data_key(public_key, data_key: bytes) -> str:
     encrypted_data_key = public_key.encrypt(
         data_key,
         padding.OAEP(
@@ -79,10 +91,15 @@ def _encrypt_asymmetric(value: str):
             label=None,
         ),
     )
+    return base64.urlsafe_b64encode(encrypted_data_key).decode("utf-8")
+
 
+def _seal(aesgcm: AESGCM, wrapped_data_key: str, value: str) -> str:
+    nonce = os.urandom(12)
+    ciphertext = aesgcm.encrypt(nonce, value.encode("utf-8"), None)
     payload = {
         "alg": "RSA-OAEP-SHA256+AES-256-GCM",
-        "ek": base64.urlsafe_b64encode(encrypted_data_key).decode("utf-8"),
+        "ek": wrapped_data_key,
         "n": base64.urlsafe_b64encode(nonce).decode("utf-8"),
         "ct": base64.urlsafe_b64encode(ciphertext).decode("utf-8"),
     }
@@ -90,6 +107,35 @@ def _encrypt_asymmetric(value: str):
     return ASYM_V1_PREFIX + base64.urlsafe_b64encode(serialized).decode("utf-8")
 
 
+def _encrypt_asymmetric(value: str):
+    public_key = get_public_key()
+    if public_key is None:
+        return None
+
+    data_key = os.urandom(32)
+    return _seal(AESGCM(data_key), _wrap_data_key(public_key, data_key), value)
+
+
+def batch_encrypt_asymmetric(values):
+    """Seal many values under one freshly wrapped data key.
+
+    Output uses the regular ``asym:v1:`` envelope, so ``EncryptedTextField``
+    stores it as-is and ``decrypt_value`` reads it back. Returns ``None``
+    when no public key is configured; the field then encrypts on save.
+    """
+    public_key = get_public_key()
+    if public_key is None:
+        return None
+
+    data_key = os.urandom(32)
+    aesgcm = AESGCM(data_key)
+    wrapped_data_key = _wrap_data_key(public_key, data_key)
+    return [
+        value if value is None or value.startswith(ASYM_V1_PREFIX) else _seal(aesgcm, wrapped_data_key, value)
+        for value in values
+    ]
+
+
 def _decrypt_asymmetric(value: str):
     if not value.startswith(ASYM_V1_PREFIX):
         return None
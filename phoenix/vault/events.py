@@ -0,0 +1,146 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+EVENT_CHANNEL = "phoenix_events"
+SUBSCRIBER_QUEUE_SIZE = 100
+
+ACCESS_REQUEST_CREATED = "access_request.created"
+ACCESS_REQUEST_APPROVED = "access_request.approved"
+ACCESS_REQUEST_REJECTED = "access_request.rejected"
+CREDENTIAL_ISSUED = "credential.issued"
+CREDENTIAL_UPDATED = "credential.updated"
+
+
+def publish_events(events):
+    """Send ``(user_ids, event, data)`` tuples to every API worker via ``NOTIFY``.
+
+    ``NOTIFY`` is transactional, so events published inside ``atomic()`` are
+    delivered only if the transaction commits. Payloads carry ids and statuses,
+    never secrets, and stay far below the 8000 byte ``NOTIFY`` limit.
+    """
+    payloads = [
+        json.dumps({"u": sorted(set(user_ids)), "e": event, "d": data}, separators=(",", ":"))
+        for user_ids, event, data in events
+        if user_ids
+    ]
+    if not payloads:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload", [EVENT_CHANNEL, payloads])
+
+
+def publish_event(user_ids, event, data):
+    publish_events([(user_ids, event, data)])
+
+
+def reviewer_ids_for_department(department_id):
+    """Ids of active users who review requests from ``department_id``."""
+    condition = Q(is_superuser=True)
+    if department_id is not None:
+        condition |= Q(role=User.Role.HEAD, department_id=department_id)
+    return list(User.objects.filter(condition, is_active=True).values_list("id", flat=True))
+
+
+class EventHub:
+    """Fan ``NOTIFY`` payloads out to the event streams open in this process.
+
+    One dedicated ``LISTEN`` connection is opened for the first subscriber and
+    closed after the last one leaves. Each stream gets its own bounded queue;
+    a ``None`` item tells the stream to end (listener failure), after which the
+    client reconnects and refetches.
+    """
+
+    def __init__(self, channel=EVENT_CHANNEL):
+        self.channel = channel
+        self._queues = defaultdict(set)
+        self._connection = None
+        self._loop = None
+        self._lock = None
+
+    async def subscribe(self, user_id):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._close()
+            self._loop, self._lock = loop, asyncio.Lock()
+        async with self._lock:
+            if self._connection is None:
+                self._connection = await loop.run_in_executor(None, self._connect)
+                loop.add_reader(self._connection.fileno(), self._drain)
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._queues[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id, queue):
+        queues = self._queues.get(user_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._queues[user_id]
+        if not self._queues:
+            self._close()
+
+    def _connect(self):
+        database = connections["default"]
+        params = database.get_connection_params()
+        if settings.POSTGRES_LISTEN_HOST:
+            params["host"] = settings.POSTGRES_LISTEN_HOST
+        if settings.POSTGRES_LISTEN_PORT:
+            params["port"] = settings.POSTGRES_LISTEN_PORT
+        # Never from the pool: the connection stays LISTENing for its lifetime.
+        listener = database.Database.connect(**params)
+        listener.autocommit = True
+        with listener.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        return listener
+
+    def _drain(self):
+        try:
+            notifies = list(self._connection.notifies(timeout=0))
+        except Exception:
+            logger.warning("Event listener connection failed; closing open streams", exc_info=True)
+            for queues in self._queues.values():
+                for queue in queues:
+                    if queue.full():
+                        queue.get_nowait()
+                    queue.put_nowait(None)
+            self._queues.clear()
+            self._close()
+            return
+        for notify in notifies:
+            try:
+                message = json.loads(notify.payload)
+                user_ids, item = message["u"], (message["e"], message["d"])
+            except (ValueError, KeyError, TypeError):
+                logger.warning("Ignoring malformed event payload: %r", notify.payload)
+                continue
+            for user_id in user_ids:
+                for queue in self._queues.get(user_id, ()):
+                    if queue.full():
+                        logger.warning("Event stream of user %s is not keeping up; dropping %s", user_id, item[0])
+                        continue
+                    queue.put_nowait(item)
+
+    def _close(self):
+        if self._connection is None:
+            return
+        try:
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.remove_reader(self._connection.fileno())
+            self._connection.close()
+        except Exception:
+            logger.warning("Failed to close event listener connection cleanly", exc_info=True)
+        self._connection = None
+
+
+event_hub = EventHub()
@@ -1,7 +1,7 @@
 from django import forms
 from django.contrib.auth.forms import ReadOnlyPasswordHashField
 
-from .models import User
+from .models import Credential, CredentialVersion, User
 
 
 class UserCreationForm(forms.ModelForm):
@@ -72,3 +72,35 @@ class UserChangeForm(forms.ModelForm):
             "user_permissions",
             "password",
         )
+
+
+class SecretBlobForm(forms.ModelForm):
+    """Edits ``password`` as plaintext instead of exposing the ``SecretBlob`` key."""
+
+    password = forms.CharField(label="Secret", widget=forms.Textarea, strip=False)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.initial.setdefault("password", self.instance.password)
+
+    def save(self, commit=True):
+        instance = super().save(commit=False)
+        if "password" in self.changed_data or instance.secret_id is None:
+            instance.password = self.cleaned_data["password"]
+        if commit:
+            instance.save()
+            self._save_m2m()
+        return instance
+
+
+class CredentialAdminForm(SecretBlobForm):
+    class Meta:
+        model = Credential
+        exclude = ("secret",)
+
+
+class CredentialVersionAdminForm(SecretBlobForm):
+    class Meta:
+        model = CredentialVersion
+        exclude = ("secret",)
@@ -1,20 +1,27 @@
 from datetime import timedelta
 
+from django.core.cache import cache
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 
-from vault.models import AuditLog, LoginChallenge
+from vault.models import AuditLog, EmailOutbox, LoginChallenge
 
 
 class Command(BaseCommand):
-    help = "Cleanup expired login challenges and old audit logs."
+    help = "Cleanup expired login challenges, expired cache rows, delivered emails and old audit logs."
 
     def add_arguments(self, parser):
         parser.add_argument(
             "--audit-days",
             type=int,
             default=180,
-            help="Delete audit logs older than this number of days. Use 0 to skip.",
+            help="Delete audit logs older than this number of days. Use 0 to skip (keep them for archive_audit_logs).",
+        )
+        parser.add_argument(
+            "--outbox-days",
+            type=int,
+            default=7,
+            help="Delete sent outbox emails older than this number of days. Use 0 to skip.",
         )
 
     def handle(self, *args, **options):
@@ -25,6 +32,18 @@ class Command(BaseCommand):
         expired_deleted, _ = expired_qs.delete()
         self.stdout.write(f"Deleted login challenge rows: {expired_deleted}")
 
+        cull_expired = getattr(cache, "cull_expired", None)
+        if cull_expired is not None:
+            self.stdout.write(f"Deleted expired cache rows: {cull_expired()}")
+
+        outbox_days = int(options["outbox_days"])
+        if outbox_days > 0:
+            outbox_deleted, _ = EmailOutbox.objects.filter(
+                status=EmailOutbox.Status.SENT,
+                sent_at__lt=now - timedelta(days=outbox_days),
+            ).delete()
+            self.stdout.write(f"Deleted sent outbox rows: {outbox_deleted}")
+
         audit_days = int(options["audit_days"])
         if audit_days > 0:
             cutoff = now - timedelta(days=audit_days)
@@ -0,0 +1,35 @@
+import secrets
+
+from django.core.management.base import BaseCommand, CommandError
+
+from vault.models import AuditFeedToken
+
+
+class Command(BaseCommand):
+    help = "Create (or revoke) a service token for the audit feed collector."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", type=str, help="Collector name, e.g. siem.")
+        parser.add_argument(
+            "--revoke",
+            action="store_true",
+            help="Deactivate the token with this name instead of creating one.",
+        )
+
+    def handle(self, *args, **options):
+        name = options["name"].strip()
+        if not name:
+            raise CommandError("Token name must not be empty.")
+
+        if options["revoke"]:
+            if not AuditFeedToken.objects.filter(name=name).update(is_active=False):
+                raise CommandError(f"No audit feed token named {name!r}.")
+            self.stdout.write(self.style.SUCCESS(f"Audit feed token {name!r} revoked."))
+            return
+
+        if AuditFeedToken.objects.filter(name=name).exists():
+            raise CommandError(f"Audit feed token {name!r} already exists. Revoke it or pick another name.")
+        key = secrets.token_urlsafe(32)
+        AuditFeedToken.objects.create(name=name, key_digest=AuditFeedToken.digest(key))
+        self.stdout.write(self.style.SUCCESS(f"Audit feed token {name!r} created. It is shown only once:"))
+        self.stdout.write(key)
@@ -0,0 +1,53 @@
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from vault.user_import import import_users
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Create users from a CSV file in batches (same rules as the users API)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file to import, or '-' for stdin.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows inserted per transaction.",
+        )
+        parser.add_argument(
+            "--actor",
+            default="",
+            help="portal_login of the user the import is performed as (defaults to superuser rules).",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, int(options["batch_size"]))
+        actor = None
+        if options["actor"]:
+            actor = User.objects.filter(portal_login=options["actor"], is_active=True).first()
+            if actor is None:
+                raise CommandError(f"Active user '{options['actor']}' not found.")
+
+        try:
+            if options["path"] == "-":
+                result = import_users(sys.stdin, actor=actor, batch_size=batch_size)
+            else:
+                with open(options["path"], encoding="utf-8-sig", newline="") as stream:
+                    result = import_users(stream, actor=actor, batch_size=batch_size)
+        except OSError as exc:
+            raise CommandError(str(exc))
+        except ValidationError as exc:
+            raise CommandError(json.dumps(exc.detail, ensure_ascii=False))
+
+        for error in result.errors:
+            self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'], ensure_ascii=False)}")
+        if result.failed > len(result.errors):
+            self.stderr.write(f"... and {result.failed - len(result.errors)} more rejected rows.")
+        self.stdout.write(self.style.SUCCESS(f"Import complete. Created: {result.created}, rejected: {result.failed}"))
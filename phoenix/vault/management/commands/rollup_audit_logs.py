@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from vault.audit_rollups import rolled_up_through, update_audit_rollups
+
+
+class Command(BaseCommand):
+    help = "Count audit entries added since the last run into the hourly and daily audit rollups."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50000,
+            help="Audit entries counted per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, int(options["batch_size"]))
+
+        total = 0
+        while True:
+            counted = update_audit_rollups(batch_size=batch_size)
+            if not counted:
+                break
+            total += counted
+        self.stdout.write(self.style.SUCCESS(f"Audit entries counted: {total}, through id {rolled_up_through()}"))
@@ -1,11 +1,12 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from django.db.models import Max
 
-from vault.models import Credential, CredentialVersion
+from vault.models import Credential, CredentialVersion, SecretBlob
 
 
 class Command(BaseCommand):
-    help = "Re-encrypt all credential passwords using current encryption settings."
+    help = "Re-encrypt all stored secrets using current encryption settings."
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -17,7 +18,7 @@ class Command(BaseCommand):
         parser.add_argument(
             "--dry-run",
             action="store_true",
-            help="Show how many credentials would be rotated without saving.",
+            help="Show how many secrets would be rotated without saving.",
         )
         parser.add_argument(
             "--no-version",
@@ -30,39 +31,49 @@ class Command(BaseCommand):
         dry_run = bool(options["dry_run"])
         create_version = not bool(options["no_version"])
 
-        qs = Credential.objects.select_related("user", "service").all().order_by("id")
-        total = qs.count()
+        blobs = SecretBlob.objects.order_by("id")
+        total = blobs.count()
         rotated = 0
 
-        self.stdout.write(f"Found credentials: {total}")
+        self.stdout.write(f"Found secrets: {total}")
         if dry_run:
             self.stdout.write(self.style.WARNING("Dry-run mode enabled. No changes will be saved."))
             return
 
-        for credential in qs.iterator(chunk_size=batch_size):
-            with transaction.atomic():
-                plaintext_password = credential.password
-                credential.password = plaintext_password
-                credential.save(update_fields=["password", "updated_at"])
+        # Every secret is stored once in SecretBlob, so re-encrypting the blobs
+        # rotates credentials and their whole version history together.
+        for blob in blobs.iterator(chunk_size=batch_size):
+            blob.value = blob.value
+            blob.save(update_fields=["value"])
+            rotated += 1
+            if rotated % batch_size == 0:
+                self.stdout.write(f"Rotated: {rotated}/{total}")
 
-                if create_version:
-                    max_version = (
-                        CredentialVersion.objects.filter(credential=credential).order_by("-version").values_list("version", flat=True).first()
-                        or 0
+        if create_version:
+            credentials = Credential.objects.annotate(max_version=Max("versions__version")).order_by("id")
+            for start in range(0, credentials.count(), batch_size):
+                with transaction.atomic():
+                    CredentialVersion.objects.bulk_create(
+                        [
+                            CredentialVersion(
+                                credential=credential,
+                                version=(credential.max_version or 0) + 1,
+                                login=credential.login,
+                                secret_type=credential.secret_type,
+                                secret_filename=credential.secret_filename,
+                                ssh_host=credential.ssh_host,
+                                ssh_port=credential.ssh_port,
+                                ssh_algorithm=credential.ssh_algorithm,
+                                ssh_public_key=credential.ssh_public_key,
+                                ssh_fingerprint=credential.ssh_fingerprint,
+                                secret_id=credential.secret_id,
+                                notes=credential.notes,
+                                is_active=credential.is_active,
+                                change_type=CredentialVersion.ChangeType.ROTATE,
+                                changed_by=None,
+                            )
+                            for credential in credentials[start : start + batch_size]
+                        ]
                     )
-                    CredentialVersion.objects.create(
-                        credential=credential,
-                        version=max_version + 1,
-                        login=credential.login,
-                        password=credential.password,
-                        notes=credential.notes,
-                        is_active=credential.is_active,
-                        change_type=CredentialVersion.ChangeType.ROTATE,
-                        changed_by=None,
-                    )
-
-                rotated += 1
-                if rotated % batch_size == 0:
-                    self.stdout.write(f"Rotated: {rotated}/{total}")
 
-        self.stdout.write(self.style.SUCCESS(f"Rotation complete. Rotated {rotated} credentials."))
+        self.stdout.write(self.style.SUCCESS(f"Rotation complete. Rotated {rotated} secrets."))
@@ -0,0 +1,80 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections
+
+from vault.audit import flush_audit_outbox
+from vault.audit_chain import seal_audit_entries
+from vault.audit_rollups import update_audit_rollups
+
+from vault.notifications import dispatch_email_outbox, send_reviewer_digests
+
+
+class Command(BaseCommand):
+    help = "Deliver queued emails from the outbox with retries and dead-lettering; flush, roll up and seal audit entries."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Emails sent per SMTP connection.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep when the outbox is drained.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the outbox once and exit.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, int(options["batch_size"]))
+        interval = max(0.1, float(options["interval"]))
+        once = bool(options["once"])
+
+        self.stdout.write("Outbox dispatcher started.")
+        try:
+            while True:
+                digests = send_reviewer_digests()
+                if digests:
+                    self.stdout.write(f"Reviewer digests queued: {digests}")
+                try:
+                    audit_entries = flush_audit_outbox()
+                except DatabaseError:
+                    audit_entries = 0
+                    self.stderr.write("Audit database unavailable; entries stay queued.")
+                if audit_entries:
+                    self.stdout.write(f"Audit entries moved to the audit database: {audit_entries}")
+                try:
+                    rolled_up = update_audit_rollups()
+                except DatabaseError:
+                    rolled_up = 0
+                    self.stderr.write("Audit database unavailable; rollups not updated.")
+                if rolled_up:
+                    self.stdout.write(f"Audit entries counted in rollups: {rolled_up}")
+                try:
+                    sealed = seal_audit_entries()
+                except DatabaseError:
+                    sealed = 0
+                    self.stderr.write("Audit database unavailable; audit chain not extended.")
+                if sealed:
+                    self.stdout.write(f"Audit entries sealed into the hash chain: {sealed}")
+                result = dispatch_email_outbox(batch_size=batch_size)
+                if result.processed:
+                    self.stdout.write(
+                        f"Sent: {result.sent}, retry scheduled: {result.retried}, dead-lettered: {result.dead}"
+                    )
+                if result.processed >= batch_size:
+                    continue
+                if once:
+                    break
+                time.sleep(interval)
+                close_old_connections()
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS("Outbox dispatcher stopped."))
@@ -0,0 +1,63 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from vault.directory_sync import read_snapshot, sync_directory
+
+
+class Command(BaseCommand):
+    help = "Apply an HR directory snapshot (CSV or JSONL), writing only rows that changed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", default="", help="Users snapshot (.csv or .jsonl).")
+        parser.add_argument("--departments", default="", help="Departments snapshot (.csv or .jsonl).")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows written per transaction.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would change without saving.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Deactivate missing rows even if the snapshot has rejected rows or is empty.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["users"] and not options["departments"]:
+            raise CommandError("Pass --users and/or --departments.")
+        batch_size = max(1, int(options["batch_size"]))
+        dry_run = bool(options["dry_run"])
+        if dry_run:
+            self.stdout.write(self.style.WARNING("Dry-run mode enabled. No changes will be saved."))
+
+        try:
+            result = sync_directory(
+                department_rows=read_snapshot(options["departments"]) if options["departments"] else None,
+                user_rows=read_snapshot(options["users"]) if options["users"] else None,
+                batch_size=batch_size,
+                dry_run=dry_run,
+                force=bool(options["force"]),
+            )
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+        for error in result.errors:
+            self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'], ensure_ascii=False)}")
+        for label, stats in (("Departments", result.departments), ("Users", result.users)):
+            self.stdout.write(
+                f"{label}: created {stats.created}, updated {stats.updated}, unchanged {stats.unchanged}, "
+                f"deactivated {stats.deactivated}, rejected {stats.rejected}"
+            )
+            if stats.deactivation_skipped:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"{label}: snapshot has rejected rows or is empty, deactivation skipped (use --force)."
+                    )
+                )
+        self.stdout.write(self.style.SUCCESS("Directory sync complete."))
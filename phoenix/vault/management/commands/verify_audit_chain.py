@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from vault.audit_chain import verify_audit_chain
+
+
+class Command(BaseCommand):
+    help = "Verify the audit hash chain over the checkpoints taken since the last verified one."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Checkpoint ranges verified in parallel.",
+        )
+        parser.add_argument(
+            "--recheck",
+            action="store_true",
+            help="Verify every checkpoint again, not only new ones. Archived ranges report missing entries.",
+        )
+
+    def handle(self, *args, **options):
+        checked, problems = verify_audit_chain(workers=max(1, int(options["workers"])), recheck=options["recheck"])
+        if problems:
+            for problem in problems:
+                self.stderr.write(problem)
+            raise CommandError(f"Audit chain verification failed: {len(problems)} problems in {checked} checkpoints.")
+        self.stdout.write(self.style.SUCCESS(f"Audit checkpoints verified: {checked}"))
@@ -1,13 +1,45 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework.permissions import SAFE_METHODS
+from whitenoise.middleware import WhiteNoiseMiddleware
 
+from .replica import pin_to_primary, replica_configured
 
-class SecurityHeadersMiddleware:
+
+class AsyncCapableMixin:
+    """Run natively in both the sync (WSGI) and async (ASGI) middleware chains.
+
+    Django runs sync-only middleware in a thread under ASGI, and that thread
+    stays blocked for the rest of the request, so a single sync middleware
+    undoes the async profile.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def _init_async_mode(self):
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process(request)
+
+
+class SecurityHeadersMiddleware(AsyncCapableMixin):
     def __init__(self, get_response):
         self.get_response = get_response
+        self._init_async_mode()
 
-    def __call__(self, request):
-        response = self.get_response(request)
+    def process(self, request):
+        return self._add_headers(self.get_response(request))
 
+    async def __acall__(self, request):
+        return self._add_headers(await self.get_response(request))
+
+    def _add_headers(self, response):
         content_security_policy = getattr(settings, "CONTENT_SECURITY_POLICY", "").strip()
         if content_security_policy:
             response.setdefault("Content-Security-Policy", content_security_policy)
@@ -17,3 +49,63 @@ class SecurityHeadersMiddleware:
             response.setdefault("Permissions-Policy", permissions_policy)
 
         return response
+
+
+class StaticFilesMiddleware(AsyncCapableMixin, WhiteNoiseMiddleware):
+    """WhiteNoise that does not force a thread hop on every ASGI request.
+
+    The static file index is an in-memory dict unless autorefresh is on; only
+    file lookups with autorefresh and serving a file run in a thread.
+    """
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self._init_async_mode()
+
+    def process(self, request):
+        return WhiteNoiseMiddleware.__call__(self, request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+class PrimaryPinMiddleware(AsyncCapableMixin):
+    """Pin users to the primary database for a while after they write.
+
+    Reads of ``ReplicaReadMixin`` views would otherwise miss the user's own
+    change until the replica replays it. ``request.user`` is the one DRF
+    authenticated (DRF copies it onto the Django request).
+    """
+
+    def __init__(self, get_response):
+        if not replica_configured():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self._init_async_mode()
+
+    def process(self, request):
+        response = self.get_response(request)
+        if self._is_write(request, response):
+            pin_to_primary(request.user.pk)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self._is_write(request, response):
+            await sync_to_async(pin_to_primary)(request.user.pk)
+        return response
+
+    def _is_write(self, request, response):
+        user = getattr(request, "user", None)
+        return (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and user is not None
+            and user.is_authenticated
+        )
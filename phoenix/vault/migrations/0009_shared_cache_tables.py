@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("vault", "0008_remove_oauth_client_secret"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                CREATE UNLOGGED TABLE IF NOT EXISTS vault_cache_entry (
+                    key varchar(250) PRIMARY KEY,
+                    value bytea NOT NULL,
+                    expires_at timestamptz NULL
+                );
+                CREATE INDEX IF NOT EXISTS vault_cache_entry_expires_idx
+                    ON vault_cache_entry (expires_at);
+                CREATE UNLOGGED TABLE IF NOT EXISTS vault_rate_bucket (
+                    key varchar(250) PRIMARY KEY,
+                    tokens double precision NOT NULL,
+                    allowed boolean NOT NULL,
+                    updated_at timestamptz NOT NULL,
+                    expires_at timestamptz NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS vault_rate_bucket_expires_idx
+                    ON vault_rate_bucket (expires_at);
+            """,
+            reverse_sql="""
+                DROP TABLE IF EXISTS vault_rate_bucket;
+                DROP TABLE IF EXISTS vault_cache_entry;
+            """,
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.28 on 2026-10-19 08:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vault', '0010_email_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accessrequest',
+            name='is_urgent',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='accessrequest',
+            name='reviewers_notified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        # Requests made before digests were mailed to reviewers one by one already.
+        migrations.RunSQL(
+            sql="UPDATE vault_accessrequest SET reviewers_notified_at = requested_at",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='accessrequest',
+            index=models.Index(condition=models.Q(('reviewers_notified_at__isnull', True), ('status', 'pending')), fields=['requested_at'], name='vault_accessreq_digest_idx'),
+        ),
+    ]
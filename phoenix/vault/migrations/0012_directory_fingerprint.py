@@ -0,0 +1,23 @@
+# Generated by Django 4.2.28 on 2026-10-19 08:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vault', '0011_access_request_digest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='department',
+            name='directory_fingerprint',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='directory_fingerprint',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,52 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+import vault.models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("vault", "0012_directory_fingerprint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SecretBlob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("digest", models.CharField(max_length=64, unique=True)),
+                ("value", vault.models.EncryptedTextField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name="credential",
+            name="password",
+            field=vault.models.EncryptedTextField(null=True),
+        ),
+        migrations.AlterField(
+            model_name="credentialversion",
+            name="password",
+            field=vault.models.EncryptedTextField(null=True),
+        ),
+        migrations.AddField(
+            model_name="credential",
+            name="secret",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="vault.secretblob",
+            ),
+        ),
+        migrations.AddField(
+            model_name="credentialversion",
+            name="secret",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="vault.secretblob",
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations
+
+from vault.encryption import secret_digest
+
+BATCH_SIZE = 500
+
+
+def move_passwords_to_blobs(apps, schema_editor):
+    SecretBlob = apps.get_model("vault", "SecretBlob")
+    blob_ids = {}
+    for model_name in ("Credential", "CredentialVersion"):
+        model = apps.get_model("vault", model_name)
+        batch = []
+        for obj in model.objects.only("id", "password").order_by("id").iterator(chunk_size=BATCH_SIZE):
+            plaintext = obj.password or ""
+            digest = secret_digest(plaintext)
+            if digest not in blob_ids:
+                blob_ids[digest] = SecretBlob.objects.create(digest=digest, value=plaintext).id
+            obj.secret_id = blob_ids[digest]
+            batch.append(obj)
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_update(batch, ["secret"])
+                batch = []
+        model.objects.bulk_update(batch, ["secret"])
+
+
+def restore_passwords_from_blobs(apps, schema_editor):
+    for model_name in ("Credential", "CredentialVersion"):
+        model = apps.get_model("vault", model_name)
+        batch = []
+        for obj in model.objects.select_related("secret").order_by("id").iterator(chunk_size=BATCH_SIZE):
+            obj.password = obj.secret.value if obj.secret_id else ""
+            batch.append(obj)
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_update(batch, ["password"])
+                batch = []
+        model.objects.bulk_update(batch, ["password"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("vault", "0013_secretblob"),
+    ]
+
+    operations = [
+        migrations.RunPython(move_passwords_to_blobs, restore_passwords_from_blobs),
+    ]
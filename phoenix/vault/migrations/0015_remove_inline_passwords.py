@@ -0,0 +1,37 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("vault", "0014_move_passwords_to_secretblob"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="credential",
+            name="password",
+        ),
+        migrations.RemoveField(
+            model_name="credentialversion",
+            name="password",
+        ),
+        migrations.AlterField(
+            model_name="credential",
+            name="secret",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="vault.secretblob",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="credentialversion",
+            name="secret",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="vault.secretblob",
+            ),
+        ),
+    ]
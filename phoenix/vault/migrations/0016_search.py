@@ -0,0 +1,108 @@
+# Generated by Django 4.2.28 on 2026-10-19 08:57
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+import django.db.models.functions.text
+
+# Credential vectors include the service name and url, which a generated
+# column cannot reference, so both vectors are kept up to date by triggers.
+# Writes that leave the searched columns alone (is_active, updated_at) do not
+# fire them.
+SEARCH_TRIGGERS_SQL = """
+CREATE FUNCTION vault_service_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(NEW.url, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER vault_service_search_vector_trg
+    BEFORE INSERT OR UPDATE OF name, url, search_vector ON vault_service
+    FOR EACH ROW EXECUTE FUNCTION vault_service_search_vector();
+
+CREATE FUNCTION vault_credential_search_vector() RETURNS trigger AS $$
+DECLARE
+    service_name text;
+    service_url text;
+BEGIN
+    SELECT name, url INTO service_name, service_url FROM vault_service WHERE id = NEW.service_id;
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(service_name, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(NEW.login, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(service_url, '')), 'B')
+        || setweight(to_tsvector('simple', coalesce(NEW.notes, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER vault_credential_search_vector_trg
+    BEFORE INSERT OR UPDATE OF service_id, login, notes, search_vector ON vault_credential
+    FOR EACH ROW EXECUTE FUNCTION vault_credential_search_vector();
+
+CREATE FUNCTION vault_service_refresh_credential_search() RETURNS trigger AS $$
+BEGIN
+    UPDATE vault_credential SET search_vector = NULL WHERE service_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER vault_service_refresh_credential_search_trg
+    AFTER UPDATE OF name, url ON vault_service
+    FOR EACH ROW
+    WHEN (OLD.name IS DISTINCT FROM NEW.name OR OLD.url IS DISTINCT FROM NEW.url)
+    EXECUTE FUNCTION vault_service_refresh_credential_search();
+
+UPDATE vault_service SET search_vector = NULL;
+UPDATE vault_credential SET search_vector = NULL;
+"""
+
+DROP_SEARCH_TRIGGERS_SQL = """
+DROP TRIGGER IF EXISTS vault_service_refresh_credential_search_trg ON vault_service;
+DROP TRIGGER IF EXISTS vault_credential_search_vector_trg ON vault_credential;
+DROP TRIGGER IF EXISTS vault_service_search_vector_trg ON vault_service;
+DROP FUNCTION IF EXISTS vault_service_refresh_credential_search();
+DROP FUNCTION IF EXISTS vault_credential_search_vector();
+DROP FUNCTION IF EXISTS vault_service_search_vector();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vault', '0015_remove_inline_passwords'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='credential',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunSQL(SEARCH_TRIGGERS_SQL, DROP_SEARCH_TRIGGERS_SQL),
+        migrations.AddIndex(
+            model_name='credential',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='vault_credential_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='vault_service_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('portal_login'), name='gin_trgm_ops'), name='vault_user_login_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('full_name'), name='gin_trgm_ops'), name='vault_user_name_trgm_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.28 on 2026-10-19 09:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vault', '0016_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='accessrequest',
+            index=models.Index(fields=['status', 'requested_at'], name='vault_accessreq_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='accessrequest',
+            index=models.Index(fields=['service', 'status', 'requested_at'], name='vault_accessreq_service_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='credential',
+            index=models.Index(fields=['service', 'is_active', 'updated_at'], name='vault_cred_service_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='credential',
+            index=models.Index(fields=['secret_type', 'is_active', 'updated_at'], name='vault_cred_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='credential',
+            index=models.Index(fields=['is_active', 'updated_at'], name='vault_cred_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['department', 'role', 'is_active'], name='vault_user_dept_role_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.28 on 2026-10-19 09:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vault', '0017_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='department',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.RunSQL(
+            sql=[
+                "UPDATE vault_department SET updated_at = created_at",
+                "UPDATE vault_service SET updated_at = created_at",
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AlterField(
+            model_name='serviceaccess',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='credential',
+            index=models.Index(fields=['updated_at'], name='vault_cred_changed_idx'),
+        ),
+    ]
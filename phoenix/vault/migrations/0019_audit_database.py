@@ -0,0 +1,50 @@
+# Generated by Django 4.2.28 on 2026-10-19 09:39
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def create_audit_table(apps, schema_editor):
+    # Only runs on the dedicated audit database (vault.audit.AuditRouter): the
+    # table is created there from the current model, without the user FK.
+    AuditLog = apps.get_model("vault", "AuditLog")
+    if AuditLog._meta.db_table not in schema_editor.connection.introspection.table_names():
+        schema_editor.create_model(AuditLog)
+
+
+def drop_audit_table(apps, schema_editor):
+    schema_editor.delete_model(apps.get_model("vault", "AuditLog"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vault', '0018_sync_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('payload', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='actor',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(create_audit_table, drop_audit_table, hints={"audit_table": True}),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.28 on 2026-10-19 09:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vault', '0019_audit_database'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=8)),
+                ('bucket', models.DateTimeField()),
+                ('action', models.CharField(max_length=16)),
+                ('object_type', models.CharField(max_length=64)),
+                ('actor_id', models.PositiveBigIntegerField(default=0)),
+                ('department_id', models.PositiveBigIntegerField(default=0)),
+                ('count', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['period', 'bucket'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AuditRollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_audit_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='auditrollup',
+            constraint=models.UniqueConstraint(fields=('period', 'bucket', 'action', 'object_type', 'actor_id', 'department_id'), name='vault_auditrollup_key'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.28 on 2026-10-19 09:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vault', '0020_audit_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditlog',
+            name='last_seen_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='repeat_count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(condition=models.Q(('action', 'view')), fields=['actor', 'object_type', 'object_id', 'created_at'], name='vault_audit_view_repeat_idx'),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 4.2.28 on 2026-10-19 09:54
+
+from django.db import migrations, models, transaction
+import django.db.models.deletion
+
+BATCH_SIZE = 50000
+
+# sha256 hex of the UTF-8 string, as vault.models.user_agent_digest computes it.
+DIGEST_SQL = "encode(sha256(convert_to(a.user_agent, 'UTF8')), 'hex')"
+
+
+def _id_batches(schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT COALESCE(MIN(id), 0), COALESCE(MAX(id), -1) FROM vault_auditlog")
+        low, high = cursor.fetchone()
+    for start in range(low, high + 1, BATCH_SIZE):
+        yield start, start + BATCH_SIZE - 1
+
+
+def move_user_agents(apps, schema_editor):
+    # One short transaction per id range, so a large audit table is never
+    # locked as a whole.
+    for start, end in _id_batches(schema_editor):
+        with transaction.atomic(using=schema_editor.connection.alias), schema_editor.connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO vault_useragent (digest, value)
+                SELECT DISTINCT {DIGEST_SQL}, a.user_agent
+                FROM vault_auditlog a
+                WHERE a.id BETWEEN %s AND %s AND a.user_agent <> ''
+                ON CONFLICT (digest) DO NOTHING
+                """,
+                [start, end],
+            )
+            cursor.execute(
+                f"""
+                UPDATE vault_auditlog a SET agent_id = u.id
+                FROM vault_useragent u
+                WHERE a.id BETWEEN %s AND %s AND a.user_agent <> '' AND u.digest = {DIGEST_SQL}
+                """,
+                [start, end],
+            )
+
+
+def restore_user_agents(apps, schema_editor):
+    for start, end in _id_batches(schema_editor):
+        with transaction.atomic(using=schema_editor.connection.alias), schema_editor.connection.cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE vault_auditlog a SET user_agent = u.value
+                FROM vault_useragent u
+                WHERE a.id BETWEEN %s AND %s AND a.agent_id = u.id
+                """,
+                [start, end],
+            )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('vault', '0021_audit_view_coalescing'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserAgent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=64, unique=True)),
+                ('value', models.CharField(max_length=512)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='agent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='vault.useragent'),
+        ),
+        migrations.RunPython(move_user_agents, restore_user_agents, hints={"model_name": "auditlog"}),
+        migrations.RemoveField(
+            model_name='auditlog',
+            name='user_agent',
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.28 on 2026-10-19 10:00
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vault', '0022_audit_user_agents'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditChainHead',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_audit_id', models.BigIntegerField(default=0)),
+                ('chain_hash', models.CharField(blank=True, default='', max_length=64)),
+                ('pending_rows', models.PositiveBigIntegerField(default=0)),
+                ('checkpointed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AuditCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('after_audit_id', models.BigIntegerField()),
+                ('last_audit_id', models.BigIntegerField(unique=True)),
+                ('start_hash', models.CharField(max_length=64)),
+                ('chain_hash', models.CharField(max_length=64)),
+                ('row_count', models.PositiveBigIntegerField()),
+                ('signature', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('verified_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['last_audit_id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='chain_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
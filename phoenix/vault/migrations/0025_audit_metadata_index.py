@@ -0,0 +1,22 @@
+# Generated by Django 4.2.28 on 2026-10-19 10:06
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # The audit table is large and written on every request: build the index
+    # without blocking inserts.
+    atomic = False
+
+    dependencies = [
+        ('vault', '0024_audit_feed_tokens'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='auditlog',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['metadata'], name='vault_audit_metadata_idx', opclasses=['jsonb_path_ops']),
+        ),
+    ]
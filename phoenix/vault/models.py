@@ -1,9 +1,14 @@
+import hashlib
+
 from django.conf import settings
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, router, transaction
+from django.db.models.functions import Upper
 from django.utils import timezone
 
-from .encryption import decrypt_value, encrypt_value
+from .encryption import batch_encrypt_asymmetric, decrypt_value, encrypt_value, secret_digest
 
 
 class EncryptedTextField(models.TextField):
@@ -70,6 +75,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
     date_joined = models.DateTimeField(default=timezone.now)
+    directory_fingerprint = models.CharField(max_length=64, blank=True, default="")
 
     objects = UserManager()
 
@@ -77,6 +83,13 @@ class User(AbstractBaseUser, PermissionsMixin):
     REQUIRED_FIELDS = []
     EMAIL_FIELD = "email"
 
+    class Meta:
+        indexes = [
+            GinIndex(OpClass(Upper("portal_login"), name="gin_trgm_ops"), name="vault_user_login_trgm_idx"),
+            GinIndex(OpClass(Upper("full_name"), name="gin_trgm_ops"), name="vault_user_name_trgm_idx"),
+            models.Index(fields=["department", "role", "is_active"], name="vault_user_dept_role_idx"),
+        ]
+
     def __str__(self):
         return self.portal_login
 
@@ -100,6 +113,8 @@ class Department(models.Model):
     sort_order = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    directory_fingerprint = models.CharField(max_length=64, blank=True, default="")
 
     class Meta:
         ordering = ["sort_order", "name"]
@@ -116,10 +131,14 @@ class Service(models.Model):
     )
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Maintained by a database trigger from name and url (see migration 0016).
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         ordering = ["name"]
         unique_together = ("name", "url")
+        indexes = [GinIndex(fields=["search_vector"], name="vault_service_search_idx")]
 
     def __str__(self):
         return self.name
@@ -132,7 +151,7 @@ class ServiceAccess(models.Model):
     service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name="accesses")
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         unique_together = ("user", "service")
@@ -142,7 +161,105 @@ class ServiceAccess(models.Model):
         return f"{self.user.portal_login} -> {self.service.name}"
 
 
-class Credential(models.Model):
+class SecretBlobManager(models.Manager):
+    def for_values(self, values):
+        """Map each plaintext to its ``SecretBlob``, creating missing blobs in bulk.
+
+        Existing blobs are matched by digest and loaded without their
+        ciphertext, so known secrets cost neither encryption nor decryption.
+        Matched blobs are locked ``FOR KEY SHARE`` until the caller's
+        transaction ends, so ``prune_credential_versions`` cannot delete one
+        as orphaned before the rows that reuse it are written.
+        """
+        digests = {value: secret_digest(value) for value in values}
+        blobs = self._locked(set(digests.values()))
+        missing = {digest: value for value, digest in digests.items() if digest not in blobs}
+        if missing:
+            sealed = batch_encrypt_asymmetric(list(missing.values())) or list(missing.values())
+            self.bulk_create(
+                [self.model(digest=digest, value=value) for digest, value in zip(missing, sealed)],
+                batch_size=1000,
+                ignore_conflicts=True,
+            )
+            blobs.update(self._locked(missing))
+        return {value: blobs[digest] for value, digest in digests.items()}
+
+    def _locked(self, digests):
+        query = f"SELECT id, digest FROM {self.model._meta.db_table} WHERE digest = ANY(%s) FOR KEY SHARE"
+        return {blob.digest: blob for blob in self.raw(query, [list(digests)])}
+
+    def for_value(self, value):
+        return self.for_values([value])[value]
+
+    def attach(self, instances):
+        """Resolve blobs for unsaved secrets of many instances before ``bulk_create``."""
+        pending = [instance for instance in instances if instance._password_dirty]
+        blobs = self.for_values({instance._password for instance in pending})
+        for instance in pending:
+            instance.secret = blobs[instance._password]
+            instance._password_dirty = False
+
+
+class SecretBlob(models.Model):
+    """An encrypted secret stored once and shared by credentials and their versions."""
+
+    digest = models.CharField(max_length=64, unique=True)
+    value = EncryptedTextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = SecretBlobManager()
+
+    def __str__(self):
+        return f"SecretBlob {self.pk}"
+
+
+class SecretBlobMixin(models.Model):
+    """Exposes ``password`` as plaintext backed by a shared ``SecretBlob``.
+
+    Assigning ``password`` only marks it dirty; ``save()`` looks the value up
+    by digest and reuses an existing blob, so an unchanged secret is never
+    encrypted again.
+    """
+
+    secret = models.ForeignKey(SecretBlob, on_delete=models.PROTECT, related_name="+")
+
+    _password = None
+    _password_dirty = False
+
+    class Meta:
+        abstract = True
+
+    @property
+    def password(self):
+        if self._password is None:
+            self._password = self.secret.value if self.secret_id else ""
+        return self._password
+
+    @password.setter
+    def password(self, value):
+        self._password = value
+        self._password_dirty = True
+
+    def save(self, *args, **kwargs):
+        if not self._password_dirty:
+            return super().save(*args, **kwargs)
+        # The blob lookup and the row write share a transaction so the blob
+        # stays locked until it is referenced.
+        with transaction.atomic(using=kwargs.get("using") or router.db_for_write(type(self), instance=self)):
+            self.secret = SecretBlob.objects.for_value(self._password or "")
+            self._password_dirty = False
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "secret"}
+            super().save(*args, **kwargs)
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._password = None
+        self._password_dirty = False
+
+
+class Credential(SecretBlobMixin):
     class SecretType(models.TextChoices):
         PASSWORD = "password", "Password"
         SSH_KEY = "ssh_key", "SSH Key"
@@ -167,20 +284,74 @@ class Credential(models.Model):
     ssh_algorithm = models.CharField(max_length=16, choices=SSHAlgorithm.choices, blank=True, default="")
     ssh_public_key = models.TextField(blank=True, default="")
     ssh_fingerprint = models.CharField(max_length=128, blank=True, default="")
-    password = EncryptedTextField()
     notes = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by database triggers from the service name and url, login and notes (see migration 0016).
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         unique_together = ("user", "service")
         ordering = ["service__name"]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="vault_credential_search_idx"),
+            models.Index(fields=["service", "is_active", "updated_at"], name="vault_cred_service_idx"),
+            models.Index(fields=["secret_type", "is_active", "updated_at"], name="vault_cred_type_idx"),
+            models.Index(fields=["is_active", "updated_at"], name="vault_cred_updated_idx"),
+            models.Index(fields=["updated_at"], name="vault_cred_changed_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.portal_login} -> {self.service.name}"
 
 
+class UserAgentManager(models.Manager):
+    def for_values(self, values):
+        """Map each non-empty ``User-Agent`` string to its row id, creating missing rows in bulk."""
+        digests = {value: user_agent_digest(value) for value in values if value}
+        if not digests:
+            return {}
+        ids = dict(self.filter(digest__in=set(digests.values())).values_list("digest", "id"))
+        missing = {digest: value for value, digest in digests.items() if digest not in ids}
+        if missing:
+            self.bulk_create(
+                [self.model(digest=digest, value=value) for digest, value in missing.items()],
+                batch_size=1000,
+                ignore_conflicts=True,
+            )
+            ids.update(self.filter(digest__in=list(missing)).values_list("digest", "id"))
+        return {value: ids[digest] for value, digest in digests.items()}
+
+    def attach(self, entries):
+        """Resolve user agents of unsaved ``AuditLog`` entries before ``bulk_create``."""
+        pending = [entry for entry in entries if entry._user_agent_dirty]
+        ids = self.for_values({entry._user_agent for entry in pending})
+        for entry in pending:
+            entry.agent_id = ids.get(entry._user_agent)
+            entry._user_agent_dirty = False
+
+
+def user_agent_digest(value):
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+class UserAgent(models.Model):
+    """A distinct ``User-Agent`` string, stored once and shared by audit entries.
+
+    Lives next to ``AuditLog`` (on the audit database when there is one);
+    rows are never updated or deleted.
+    """
+
+    digest = models.CharField(max_length=64, unique=True)
+    value = models.CharField(max_length=512)
+
+    objects = UserAgentManager()
+
+    def __str__(self):
+        return self.value
+
+
 class AuditLog(models.Model):
     class Action(models.TextChoices):
         CREATE = "create", "Create"
@@ -190,23 +361,183 @@ class AuditLog(models.Model):
         ENABLE = "enable", "Enable"
         LOGIN = "login", "Login"
 
+    # No database constraint: the table may live in the dedicated audit
+    # database (vault.audit.AUDIT_ALIAS), and entries keep the id of deleted users.
     actor = models.ForeignKey(
-        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        null=True,
+        blank=True,
+        db_constraint=False,
     )
     action = models.CharField(max_length=16, choices=Action.choices)
     object_type = models.CharField(max_length=64)
     object_id = models.CharField(max_length=64)
     ip_address = models.GenericIPAddressField(null=True, blank=True)
-    user_agent = models.CharField(max_length=512, blank=True, default="")
+    agent = models.ForeignKey(UserAgent, on_delete=models.PROTECT, null=True, blank=True, related_name="+")
     metadata = models.JSONField(default=dict, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Stamped when the entry is built, not when it reaches the audit database.
+    created_at = models.DateTimeField(default=timezone.now)
+    # Identical views inside AUDIT_VIEW_COALESCE_SECONDS bump one row (vault.audit).
+    repeat_count = models.PositiveIntegerField(default=1)
+    last_seen_at = models.DateTimeField(null=True, blank=True)
+    # Hash chained to the previous entry in id order, set once the entry is
+    # sealed by vault.audit_chain; empty until then.
+    chain_hash = models.CharField(max_length=64, blank=True, default="")
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["actor", "object_type", "object_id", "created_at"],
+                condition=models.Q(action="view"),
+                name="vault_audit_view_repeat_idx",
+            ),
+            # Serves ?metadata.<key>= filters, which compile to ``metadata @> ...``.
+            GinIndex(fields=["metadata"], opclasses=["jsonb_path_ops"], name="vault_audit_metadata_idx"),
+        ]
+
+    _user_agent = None
+    _user_agent_dirty = False
 
     def __str__(self):
         return f"{self.action} {self.object_type} {self.object_id}"
 
+    @property
+    def user_agent(self):
+        """The ``User-Agent`` string; assigning it is resolved to a ``UserAgent`` row on save."""
+        if self._user_agent is None:
+            self._user_agent = self.agent.value if self.agent_id else ""
+        return self._user_agent
+
+    @user_agent.setter
+    def user_agent(self, value):
+        self._user_agent = value or ""
+        self._user_agent_dirty = True
+
+    def save(self, *args, **kwargs):
+        if self._user_agent_dirty:
+            UserAgent.objects.db_manager(kwargs.get("using") or router.db_for_write(AuditLog)).attach([self])
+        super().save(*args, **kwargs)
+
+
+class AuditOutbox(models.Model):
+    """Audit entries the audit database did not accept, kept on the primary.
+
+    ``vault.audit.flush_audit_outbox`` (run by the outbox dispatcher) moves
+    them over once the audit database is reachable again.
+    """
+
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"{self.payload.get('action')} {self.payload.get('object_type')} {self.payload.get('object_id')}"
+
+
+class AuditRollup(models.Model):
+    """Audit entry counts per hour or day, maintained by ``vault.audit_rollups``.
+
+    Actor and department are plain ids (``0`` for none) so rows survive
+    user deletion and the table can sit apart from the audit database.
+    The department is the actor's department when the entry was rolled up.
+    """
+
+    class Period(models.TextChoices):
+        HOUR = "hour", "Hour"
+        DAY = "day", "Day"
+
+    period = models.CharField(max_length=8, choices=Period.choices)
+    bucket = models.DateTimeField()
+    action = models.CharField(max_length=16)
+    object_type = models.CharField(max_length=64)
+    actor_id = models.PositiveBigIntegerField(default=0)
+    department_id = models.PositiveBigIntegerField(default=0)
+    count = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        ordering = ["period", "bucket"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["period", "bucket", "action", "object_type", "actor_id", "department_id"],
+                name="vault_auditrollup_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.period} {self.bucket:%Y-%m-%d %H:00} {self.action} {self.object_type}: {self.count}"
+
+
+class AuditRollupWatermark(models.Model):
+    """Single row: the highest ``AuditLog`` id already counted in ``AuditRollup``."""
+
+    last_audit_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"audit rollups through #{self.last_audit_id}"
+
+
+class AuditChainHead(models.Model):
+    """Single row: the last sealed ``AuditLog`` entry and the hash chain up to it."""
+
+    last_audit_id = models.BigIntegerField(default=0)
+    chain_hash = models.CharField(max_length=64, blank=True, default="")
+    # Entries sealed since the last checkpoint, and when that checkpoint was taken.
+    pending_rows = models.PositiveBigIntegerField(default=0)
+    checkpointed_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"audit chain through #{self.last_audit_id}"
+
+
+class AuditCheckpoint(models.Model):
+    """Signed hash chain state covering the entries with ids in ``(after_audit_id, last_audit_id]``.
+
+    Each checkpoint carries the chain hash it starts from, so ranges can be
+    verified independently; ``verified_at`` marks the ones already checked.
+    """
+
+    after_audit_id = models.BigIntegerField()
+    last_audit_id = models.BigIntegerField(unique=True)
+    start_hash = models.CharField(max_length=64)
+    chain_hash = models.CharField(max_length=64)
+    row_count = models.PositiveBigIntegerField()
+    signature = models.CharField(max_length=64)
+    created_at = models.DateTimeField(default=timezone.now)
+    verified_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["last_audit_id"]
+
+    def __str__(self):
+        return f"audit checkpoint #{self.after_audit_id + 1}-#{self.last_audit_id}"
+
+
+class AuditFeedToken(models.Model):
+    """Service token for a log collector reading ``/api/audit-logs/feed/``.
+
+    Grants the superuser view of the feed and nothing else. Only the sha256
+    of the key is stored; ``create_audit_feed_token`` prints the key once.
+    """
+
+    name = models.CharField(max_length=64, unique=True)
+    key_digest = models.CharField(max_length=64, unique=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"audit feed token {self.name}"
+
+    @staticmethod
+    def digest(key):
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
 
 class DepartmentShare(models.Model):
     department = models.ForeignKey(Department, on_delete=models.CASCADE, related_name="shares")
@@ -284,17 +615,28 @@ class AccessRequest(models.Model):
         related_name="reviewed_access_requests",
     )
     review_comment = models.TextField(blank=True)
+    is_urgent = models.BooleanField(default=False)
     requested_at = models.DateTimeField(auto_now_add=True)
     reviewed_at = models.DateTimeField(null=True, blank=True)
+    reviewers_notified_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ["-requested_at"]
+        indexes = [
+            models.Index(
+                fields=["requested_at"],
+                condition=models.Q(status="pending", reviewers_notified_at__isnull=True),
+                name="vault_accessreq_digest_idx",
+            ),
+            models.Index(fields=["status", "requested_at"], name="vault_accessreq_status_idx"),
+            models.Index(fields=["service", "status", "requested_at"], name="vault_accessreq_service_idx"),
+        ]
 
     def __str__(self):
         return f"{self.requester.portal_login} -> {self.service.name} ({self.status})"
 
 
-class CredentialVersion(models.Model):
+class CredentialVersion(SecretBlobMixin):
     class ChangeType(models.TextChoices):
         CREATE = "create", "Create"
         UPDATE = "update", "Update"
@@ -317,7 +659,6 @@ class CredentialVersion(models.Model):
     ssh_algorithm = models.CharField(max_length=16, choices=Credential.SSHAlgorithm.choices, blank=True, default="")
     ssh_public_key = models.TextField(blank=True, default="")
     ssh_fingerprint = models.CharField(max_length=128, blank=True, default="")
-    password = EncryptedTextField()
     notes = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
     change_type = models.CharField(max_length=16, choices=ChangeType.choices)
@@ -336,3 +677,33 @@ class CredentialVersion(models.Model):
 
     def __str__(self):
         return f"{self.credential_id} v{self.version}"
+
+
+class EmailOutbox(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENT = "sent", "Sent"
+        DEAD = "dead", "Dead"
+
+    subject = models.CharField(max_length=255)
+    body = EncryptedTextField()
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=models.Q(status="pending"),
+                name="vault_outbox_due_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} ({self.status})"
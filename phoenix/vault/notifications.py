@@ -1,23 +1,233 @@
 import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
 
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import AccessRequest, EmailOutbox, User
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class OutboxDispatchResult:
+    sent: int = 0
+    retried: int = 0
+    dead: int = 0
+
+    @property
+    def processed(self):
+        return self.sent + self.retried + self.dead
+
+
 def send_platform_email(subject, body, recipients):
+    """Queue an email in the outbox.
+
+    The row is written on the caller's connection, so it commits or rolls back
+    together with the business change; ``run_outbox_dispatcher`` delivers it.
+    """
     recipients = [email for email in recipients if email]
     if not recipients:
-        return
+        return None
     if not getattr(settings, "EMAIL_NOTIFICATIONS_ENABLED", False):
         logger.info("Email notifications disabled: %s -> %s", subject, recipients)
+        return None
+    return EmailOutbox.objects.create(subject=subject[:255], body=body, recipients=recipients)
+
+
+def send_platform_emails(messages):
+    """Queue many ``(subject, body, recipients)`` emails with one INSERT."""
+    if not getattr(settings, "EMAIL_NOTIFICATIONS_ENABLED", False):
+        logger.info("Email notifications disabled: %s queued emails skipped", len(messages))
+        return []
+    rows = []
+    for subject, body, recipients in messages:
+        recipients = [email for email in recipients if email]
+        if recipients:
+            rows.append(EmailOutbox(subject=subject[:255], body=body, recipients=recipients))
+    return EmailOutbox.objects.bulk_create(rows)
+
+
+def _retry_delay(attempts):
+    base = getattr(settings, "EMAIL_OUTBOX_BACKOFF_SECONDS", 30)
+    cap = getattr(settings, "EMAIL_OUTBOX_BACKOFF_MAX_SECONDS", 3600)
+    return timedelta(seconds=min(cap, base * 2 ** max(0, attempts - 1)))
+
+
+def _record_failure(item, error, now, result):
+    item.attempts += 1
+    item.last_error = str(error)[:2000]
+    if item.attempts >= getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 8):
+        item.status = EmailOutbox.Status.DEAD
+        result.dead += 1
+        logger.error("Email outbox item %s dead-lettered: %s", item.pk, item.last_error)
+    else:
+        item.next_attempt_at = now + _retry_delay(item.attempts)
+        result.retried += 1
+        logger.warning("Email outbox item %s failed (attempt %s): %s", item.pk, item.attempts, item.last_error)
+
+
+def dispatch_email_outbox(batch_size=100):
+    """Deliver one batch of due outbox rows over a single SMTP connection.
+
+    Rows are claimed with ``SKIP LOCKED`` so several dispatchers can run side
+    by side without sending the same email twice.
+    """
+    result = OutboxDispatchResult()
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status=EmailOutbox.Status.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        if not batch:
+            return result
+
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as exc:
+            for item in batch:
+                _record_failure(item, exc, now, result)
+        else:
+            try:
+                for item in batch:
+                    message = EmailMessage(
+                        subject=item.subject,
+                        body=item.body,
+                        from_email=settings.DEFAULT_FROM_EMAIL,
+                        to=item.recipients,
+                        connection=connection,
+                    )
+                    try:
+                        message.send()
+                    except Exception as exc:
+                        _record_failure(item, exc, now, result)
+                    else:
+                        item.attempts += 1
+                        item.status = EmailOutbox.Status.SENT
+                        item.sent_at = timezone.now()
+                        item.last_error = ""
+                        result.sent += 1
+            finally:
+                try:
+                    connection.close()
+                except Exception:
+                    logger.warning("Failed to close SMTP connection cleanly", exc_info=True)
+
+        EmailOutbox.objects.bulk_update(
+            batch,
+            ["status", "attempts", "next_attempt_at", "last_error", "sent_at"],
+        )
+    return result
+
+
+def reviewer_emails_by_department(department_ids):
+    """Map each department id to its reviewers' emails using a single query.
+
+    Superusers review every department, so they appear in each list and also
+    under ``None`` for requesters without a department.
+    """
+    department_ids = {department_id for department_id in department_ids if department_id is not None}
+    rows = (
+        User.objects.filter(is_active=True)
+        .exclude(email="")
+        .filter(Q(is_superuser=True) | Q(role=User.Role.HEAD, department_id__in=department_ids))
+        .values_list("email", "is_superuser", "department_id")
+    )
+    superuser_emails = []
+    head_emails = defaultdict(list)
+    for email, is_superuser, department_id in rows:
+        if is_superuser:
+            superuser_emails.append(email)
+        elif department_id in department_ids:
+            head_emails[department_id].append(email)
+
+    mapping = {None: list(superuser_emails)}
+    for department_id in department_ids:
+        mapping[department_id] = list(dict.fromkeys(head_emails[department_id] + superuser_emails))
+    return mapping
+
+
+def _digest_window():
+    return timedelta(minutes=max(0, getattr(settings, "ACCESS_REQUEST_DIGEST_MINUTES", 0)))
+
+
+def _describe_access_request(access_request):
+    line = f"{access_request.requester.portal_login} -> {access_request.service.name}"
+    if access_request.justification:
+        line += f": {access_request.justification}"
+    return line
+
+
+def notify_reviewers_of_request(access_request):
+    """Tell reviewers about a new access request, now or in the next digest.
+
+    With ``ACCESS_REQUEST_DIGEST_MINUTES`` set, only urgent requests are mailed
+    immediately; the rest are left for ``send_reviewer_digests``.
+    """
+    if not access_request.is_urgent and _digest_window():
         return
-    send_mail(
+    department_id = access_request.requester.department_id
+    emails = reviewer_emails_by_department([department_id])[department_id]
+    subject = "Phoenix Vault: новый запрос доступа"
+    if access_request.is_urgent:
+        subject = "Phoenix Vault: срочный запрос доступа"
+    send_platform_email(
         subject=subject,
-        message=body,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=recipients,
-        fail_silently=True,
+        body=(
+            f"Пользователь {access_request.requester.portal_login} запросил доступ к сервису "
+            f"{access_request.service.name}."
+        ),
+        recipients=emails,
     )
+    access_request.reviewers_notified_at = timezone.now()
+    access_request.save(update_fields=["reviewers_notified_at"])
+
+
+def send_reviewer_digests(now=None):
+    """Send one summary per reviewer of the pending requests not yet notified.
+
+    Nothing is sent until the oldest waiting request is older than the digest
+    window; then everything accumulated so far goes out together. Returns the
+    number of digests queued.
+    """
+    window = _digest_window()
+    if not window:
+        return 0
+    now = now or timezone.now()
+    with transaction.atomic():
+        pending = list(
+            AccessRequest.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("requester", "service")
+            .filter(status=AccessRequest.Status.PENDING, reviewers_notified_at__isnull=True)
+            .order_by("requested_at", "id")
+        )
+        if not pending or pending[0].requested_at > now - window:
+            return 0
+
+        emails_by_department = reviewer_emails_by_department(
+            access_request.requester.department_id for access_request in pending
+        )
+        requests_by_reviewer = defaultdict(list)
+        for access_request in pending:
+            for email in emails_by_department[access_request.requester.department_id]:
+                requests_by_reviewer[email].append(access_request)
+
+        for email, access_requests in requests_by_reviewer.items():
+            lines = [f"Ожидают рассмотрения новые запросы доступа ({len(access_requests)}):", ""]
+            lines.extend(f"- {_describe_access_request(item)}" for item in access_requests)
+            send_platform_email(
+                subject=f"Phoenix Vault: новые запросы доступа ({len(access_requests)})",
+                body="\n".join(lines),
+                recipients=[email],
+            )
 
+        AccessRequest.objects.filter(id__in=[item.id for item in pending]).update(reviewers_notified_at=now)
+    return len(requests_by_reviewer)
@@ -0,0 +1,200 @@
+from dataclasses import dataclass
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from .audit import build_audit_entry, write_audit_entries
+from .models import (
+    AccessRequest,
+    AuditLog,
+    Credential,
+    CredentialVersion,
+    Department,
+    DepartmentShare,
+    Service,
+    ServiceAccess,
+)
+from .notifications import reviewer_emails_by_department, send_platform_email
+
+User = get_user_model()
+
+
+@dataclass
+class OffboardingResult:
+    users: int = 0
+    departments: int = 0
+    services: int = 0
+    credentials: int = 0
+    accesses: int = 0
+    shares: int = 0
+    access_requests: int = 0
+
+
+def _record_disable_versions(credential_ids, actor, now):
+    """Append a ``disable`` version for each credential with one INSERT ... SELECT.
+
+    Versions share the credential's ``SecretBlob``, so nothing is decrypted.
+    """
+    version_table = CredentialVersion._meta.db_table
+    credential_table = Credential._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {version_table} (
+                credential_id, version, login, secret_type, secret_filename, ssh_host, ssh_port,
+                ssh_algorithm, ssh_public_key, ssh_fingerprint, secret_id, notes, is_active,
+                change_type, changed_by_id, created_at
+            )
+            SELECT
+                c.id,
+                COALESCE((SELECT MAX(v.version) FROM {version_table} v WHERE v.credential_id = c.id), 0) + 1,
+                c.login, c.secret_type, c.secret_filename, c.ssh_host, c.ssh_port,
+                c.ssh_algorithm, c.ssh_public_key, c.ssh_fingerprint, c.secret_id, c.notes, false,
+                %s, %s, %s
+            FROM {credential_table} c
+            WHERE c.id = ANY(%s)
+            """,
+            [CredentialVersion.ChangeType.DISABLE, getattr(actor, "pk", None), now, list(credential_ids)],
+        )
+
+
+def _cascade(actor, user_ids, service_ids, department_ids, request, metadata):
+    result = OffboardingResult()
+    now = timezone.now()
+    user_ids, service_ids, department_ids = list(user_ids), list(service_ids), list(department_ids)
+
+    credential_ids = list(
+        Credential.objects.select_for_update()
+        .filter(is_active=True)
+        .filter(Q(user_id__in=user_ids) | Q(service_id__in=service_ids))
+        .values_list("id", flat=True)
+    )
+    if credential_ids:
+        result.credentials = Credential.objects.filter(id__in=credential_ids).update(is_active=False, updated_at=now)
+        _record_disable_versions(credential_ids, actor, now)
+
+    result.accesses = (
+        ServiceAccess.objects.filter(is_active=True)
+        .filter(Q(user_id__in=user_ids) | Q(service_id__in=service_ids))
+        .update(is_active=False, updated_at=now)
+    )
+    result.shares = (
+        DepartmentShare.objects.filter(is_active=True)
+        .filter(Q(grantee_id__in=user_ids) | Q(grantor_id__in=user_ids) | Q(department_id__in=department_ids))
+        .update(is_active=False, updated_at=now)
+    )
+    result.access_requests = (
+        AccessRequest.objects.filter(status=AccessRequest.Status.PENDING)
+        .filter(Q(requester_id__in=user_ids) | Q(service_id__in=service_ids))
+        .update(status=AccessRequest.Status.CANCELED, review_comment="Offboarded", reviewed_at=now)
+    )
+
+    disabled_user_ids = list(User.objects.filter(id__in=user_ids, is_active=True).values_list("id", flat=True))
+    result.users = User.objects.filter(id__in=disabled_user_ids).update(is_active=False)
+    Token.objects.filter(user_id__in=user_ids).delete()
+    disabled_service_ids = list(
+        Service.objects.filter(id__in=service_ids, is_active=True).values_list("id", flat=True)
+    )
+    result.services = Service.objects.filter(id__in=disabled_service_ids).update(is_active=False, updated_at=now)
+    disabled_department_ids = list(
+        Department.objects.filter(id__in=department_ids, is_active=True).values_list("id", flat=True)
+    )
+    result.departments = Department.objects.filter(id__in=disabled_department_ids).update(
+        is_active=False, updated_at=now
+    )
+
+    entry_metadata = {**metadata, "offboarding": True}
+    disabled = (
+        [("Department", object_id) for object_id in disabled_department_ids]
+        + [("User", object_id) for object_id in disabled_user_ids]
+        + [("Service", object_id) for object_id in disabled_service_ids]
+        + [("Credential", object_id) for object_id in credential_ids]
+    )
+    write_audit_entries(
+        [
+            build_audit_entry(
+                actor,
+                AuditLog.Action.DISABLE,
+                object_type=object_type,
+                object_id=object_id,
+                metadata=entry_metadata,
+                request=request,
+            )
+            for object_type, object_id in disabled
+        ]
+    )
+    return result
+
+
+def _summary_recipients(actor, department_ids):
+    """Reviewers of the affected departments plus the actor, resolved before the cascade."""
+    recipients = set()
+    for emails in reviewer_emails_by_department(department_ids).values():
+        recipients.update(emails)
+    if actor is not None and getattr(actor, "email", ""):
+        recipients.add(actor.email)
+    return sorted(recipients)
+
+
+def _send_summary(recipients, subject, summary_line, result):
+    body = "\n".join(
+        [
+            summary_line,
+            "",
+            f"Пользователей отключено: {result.users}",
+            f"Сервисов отключено: {result.services}",
+            f"Учетных данных отключено: {result.credentials}",
+            f"Доступов отключено: {result.accesses}",
+            f"Делегирований отозвано: {result.shares}",
+            f"Запросов доступа отменено: {result.access_requests}",
+        ]
+    )
+    send_platform_email(subject=subject, body=body, recipients=recipients)
+
+
+@transaction.atomic
+def offboard_users(user_ids, actor=None, request=None, metadata=None):
+    """Deactivate users with their credentials, accesses, shares and pending requests.
+
+    Everything is done with set-based UPDATEs plus bulk version and audit
+    inserts in one transaction. Reviewers of the affected departments get one
+    summary email.
+    """
+    user_ids = list(user_ids)
+    users = list(
+        User.objects.filter(id__in=user_ids, is_active=True).values_list("portal_login", "email", "department_id")
+    )
+    offboarded_emails = {email for _, email, _ in users}
+    recipients = [
+        email
+        for email in _summary_recipients(actor, {department_id for _, _, department_id in users})
+        if email not in offboarded_emails
+    ]
+    result = _cascade(actor, user_ids, [], [], request, metadata or {})
+    if result.users:
+        _send_summary(
+            recipients,
+            "Phoenix Vault: сотрудники отключены",
+            f"Отключены пользователи: {', '.join(sorted(portal_login for portal_login, _, _ in users))}.",
+            result,
+        )
+    return result
+
+
+@transaction.atomic
+def offboard_department(department, actor=None, request=None, metadata=None):
+    """Deactivate a department together with its non-superuser users and its services."""
+    recipients = _summary_recipients(actor, [department.id])
+    user_ids = User.objects.filter(department=department, is_superuser=False).values_list("id", flat=True)
+    service_ids = Service.objects.filter(department=department).values_list("id", flat=True)
+    result = _cascade(actor, user_ids, service_ids, [department.id], request, metadata or {})
+    _send_summary(
+        recipients,
+        "Phoenix Vault: отдел отключен",
+        f"Отдел '{department.name}' отключен вместе с сотрудниками и сервисами.",
+        result,
+    )
+    return result
@@ -0,0 +1,30 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class CredentialVersionPagination(CursorPagination):
+    """Keyset pagination over ``(credential, version)``.
+
+    Pages are read with ``version < cursor ORDER BY version DESC LIMIT n``
+    on the unique index and no ``COUNT`` is run, so a page costs the same
+    however long the history is.
+    """
+
+    ordering = "-version"
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+    def get_page_size(self, request):
+        self.page_size = getattr(settings, "CREDENTIAL_VERSIONS_PAGE_SIZE", 50)
+        return super().get_page_size(request)
+
+
+class OptionalLimitOffsetPagination(LimitOffsetPagination):
+    """``?limit=``/``?offset=`` pagination that only applies when ``limit`` is sent.
+
+    Without it list endpoints keep returning a plain array, so existing
+    clients are unaffected.
+    """
+
+    default_limit = None
+    max_limit = 1000
@@ -1,5 +1,7 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+from .models import AuditFeedToken
+
 
 class IsCompanyAdmin(BasePermission):
     def has_permission(self, request, view):
@@ -13,3 +15,13 @@ class IsCompanyAdminOrReadOnly(BasePermission):
             return bool(request.user and request.user.is_authenticated)
         user = request.user
         return bool(user and user.is_authenticated and getattr(user, "is_company_admin", False))
+
+
+class IsAuditFeedReader(BasePermission):
+    """Superusers, or a collector authenticated with an ``AuditFeedToken``."""
+
+    def has_permission(self, request, view):
+        if isinstance(request.auth, AuditFeedToken):
+            return True
+        user = request.user
+        return bool(user and user.is_authenticated and user.is_superuser)
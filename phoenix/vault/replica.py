@@ -0,0 +1,77 @@
+import contextvars
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_ALIAS = "replica"
+
+# Alias reads go to for the current request; set by ReplicaReadMixin only.
+_read_alias = contextvars.ContextVar("phoenix_read_alias", default=None)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in connections.settings
+
+
+def _pin_key(user_id):
+    return f"replica-pin:{user_id}"
+
+
+def pin_to_primary(user_id):
+    """Serve this user's reads from the primary for ``REPLICA_PIN_SECONDS``.
+
+    Called after each of the user's writes so they read their own changes
+    while the replica catches up; other users may see them a moment later.
+    """
+    cache.set(_pin_key(user_id), 1, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user_id):
+    return cache.get(_pin_key(user_id)) is not None
+
+
+class ReplicaRouter:
+    """Send reads to the replica while a ``ReplicaReadMixin`` view runs.
+
+    Writes, migrations and reads inside ``atomic()`` on the primary always
+    use ``default``: a transaction must not read from a replica that lags
+    behind it.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaReadMixin:
+    """Route a viewset's safe-method queries to the replica.
+
+    Authentication has already run on the primary when ``initial`` returns;
+    users pinned by a recent write keep reading from the primary.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            request.method in SAFE_METHODS
+            and replica_configured()
+            and not is_pinned_to_primary(request.user.pk)
+        ):
+            _read_alias.set(REPLICA_ALIAS)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        _read_alias.set(None)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,62 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+
+SEARCH_CONFIG = "simple"
+MAX_SEARCH_TERMS = 8
+
+
+def prefix_query(term):
+    """Build an AND-ed prefix ``tsquery`` from free text, or ``None`` if it has no words.
+
+    Words are reduced to ``\\w`` runs before being put into the raw query, so
+    user input cannot inject ``tsquery`` operators.
+    """
+    words = re.findall(r"\w+", term or "")[:MAX_SEARCH_TERMS]
+    if not words:
+        return None
+    return SearchQuery(" & ".join(f"{word}:*" for word in words), search_type="raw", config=SEARCH_CONFIG)
+
+
+def _rank_by_vector(qs, term, order_by):
+    query = prefix_query(term)
+    if query is None:
+        return qs.none()
+    return (
+        qs.filter(search_vector=query)
+        .annotate(search_rank=SearchRank(F("search_vector"), query))
+        .order_by("-search_rank", *order_by)
+    )
+
+
+def search_services(qs, term):
+    """Match services on name and URL through the trigger-maintained ``search_vector``."""
+    return _rank_by_vector(qs, term, ("name", "id"))
+
+
+def search_credentials(qs, term):
+    """Match credentials on service name, URL, login and notes."""
+    return _rank_by_vector(qs, term, ("service__name", "id"))
+
+
+def search_users(qs, term):
+    """Substring match on ``portal_login`` and ``full_name``, ranked by trigram similarity.
+
+    ``icontains`` compiles to ``UPPER(col) LIKE UPPER('%term%')``, which the
+    ``gin_trgm_ops`` expression indexes answer without a sequential scan.
+    """
+    term = (term or "").strip()
+    if not term:
+        return qs.none()
+    return (
+        qs.filter(Q(portal_login__icontains=term) | Q(full_name__icontains=term))
+        .annotate(
+            search_rank=Greatest(
+                TrigramSimilarity("portal_login", term),
+                TrigramSimilarity("full_name", term),
+            )
+        )
+        .order_by("-search_rank", "portal_login")
+    )
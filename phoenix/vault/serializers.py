@@ -20,6 +20,48 @@ def _is_head_role(role):
     return role in (User.Role.HEAD, "admin")
 
 
+def validate_user_placement(actor, role, department, instance=None):
+    """Apply the role/department rules for ``actor`` creating or editing a user.
+
+    ``actor=None`` stands for an operator running a management command and
+    gets superuser rules. Returns the ``(role, department)`` to store.
+    """
+    if role == "admin":
+        role = User.Role.HEAD
+
+    if actor is None or actor.is_superuser:
+        target_is_superuser = getattr(instance, "is_superuser", False)
+        if (
+            not target_is_superuser
+            and role in (User.Role.HEAD, User.Role.EMPLOYEE)
+            and department is None
+        ):
+            raise serializers.ValidationError("department_id is required for department users.")
+        return role, department
+
+    if not _is_head_role(actor.role):
+        raise serializers.ValidationError("Only department head or superuser can manage users.")
+
+    if actor.department_id is None:
+        raise serializers.ValidationError("Department head must have a department.")
+
+    if instance is not None:
+        if instance.is_superuser:
+            raise serializers.ValidationError("Cannot modify superuser.")
+        if instance.department_id != actor.department_id:
+            raise serializers.ValidationError("You can manage only users from your department.")
+        if instance.role != User.Role.EMPLOYEE:
+            raise serializers.ValidationError("You can manage only employees.")
+
+    if role != User.Role.EMPLOYEE:
+        raise serializers.ValidationError("Department head can create only employees.")
+
+    if department and department.id != actor.department_id:
+        raise serializers.ValidationError("You can assign users only to your department.")
+
+    return role, actor.department
+
+
 class DepartmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Department
@@ -75,46 +117,15 @@ class UserWriteSerializer(serializers.ModelSerializer):
         actor = getattr(request, "user", None)
         instance = getattr(self, "instance", None)
 
-        target_role = attrs.get("role", getattr(instance, "role", User.Role.EMPLOYEE))
-        if target_role == "admin":
-            target_role = User.Role.HEAD
-            attrs["role"] = User.Role.HEAD
-        target_department = attrs.get("department", getattr(instance, "department", None))
-
         if actor is None or not actor.is_authenticated:
             raise serializers.ValidationError("Authentication required.")
 
-        if actor.is_superuser:
-            target_is_superuser = getattr(instance, "is_superuser", False)
-            if (
-                not target_is_superuser
-                and target_role in (User.Role.HEAD, User.Role.EMPLOYEE)
-                and target_department is None
-            ):
-                raise serializers.ValidationError("department_id is required for department users.")
-            return attrs
-
-        if not _is_head_role(actor.role):
-            raise serializers.ValidationError("Only department head or superuser can manage users.")
-
-        if actor.department_id is None:
-            raise serializers.ValidationError("Department head must have a department.")
-
-        if instance is not None:
-            if instance.is_superuser:
-                raise serializers.ValidationError("Cannot modify superuser.")
-            if instance.department_id != actor.department_id:
-                raise serializers.ValidationError("You can manage only users from your department.")
-            if instance.role != User.Role.EMPLOYEE:
-                raise serializers.ValidationError("You can manage only employees.")
-
-        if target_role != User.Role.EMPLOYEE:
-            raise serializers.ValidationError("Department head can create only employees.")
-
-        if target_department and target_department.id != actor.department_id:
-            raise serializers.ValidationError("You can assign users only to your department.")
-
-        attrs["department"] = actor.department
+        attrs["role"], attrs["department"] = validate_user_placement(
+            actor,
+            attrs.get("role", getattr(instance, "role", User.Role.EMPLOYEE)),
+            attrs.get("department", getattr(instance, "department", None)),
+            instance=instance,
+        )
         return attrs
 
     def create(self, validated_data):
@@ -185,6 +196,7 @@ class CredentialReadSerializer(serializers.ModelSerializer):
 
 class CredentialWriteSerializer(serializers.ModelSerializer):
     login = serializers.CharField(required=False, allow_blank=True)
+    password = serializers.CharField(style={"base_template": "textarea.html"})
     secret_file = serializers.FileField(write_only=True, required=False, allow_null=True)
 
     class Meta:
@@ -291,6 +303,40 @@ class CredentialWriteSerializer(serializers.ModelSerializer):
         return attrs
 
 
+class CredentialBulkItemSerializer(CredentialWriteSerializer):
+    """One credential of a bulk import, validated with the regular write rules.
+
+    ``user`` and ``service`` are resolved from ``users_by_id`` and
+    ``services_by_id`` in the context, which the view loads once per batch.
+    The (user, service) uniqueness check is likewise done per batch.
+    """
+
+    user = serializers.IntegerField()
+    service = serializers.IntegerField()
+
+    class Meta(CredentialWriteSerializer.Meta):
+        fields = tuple(
+            name for name in CredentialWriteSerializer.Meta.fields if name not in ("id", "secret_file")
+        )
+        validators = []
+
+    def _resolve(self, lookup_name, pk_value):
+        obj = self.context[lookup_name].get(pk_value)
+        if obj is None:
+            raise serializers.ValidationError(f'Invalid pk "{pk_value}" - object does not exist.')
+        return obj
+
+    def validate_user(self, value):
+        return self._resolve("users_by_id", value)
+
+    def validate_service(self, value):
+        return self._resolve("services_by_id", value)
+
+
+class CredentialBulkCreateSerializer(serializers.Serializer):
+    items = CredentialBulkItemSerializer(many=True, allow_empty=False)
+
+
 class ServiceAccessSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     user_id = serializers.PrimaryKeyRelatedField(
@@ -423,6 +469,7 @@ class AccessRequestReadSerializer(serializers.ModelSerializer):
             "service",
             "status",
             "justification",
+            "is_urgent",
             "reviewer",
             "review_comment",
             "requested_at",
@@ -446,6 +493,7 @@ class AccessRequestWriteSerializer(serializers.ModelSerializer):
             "service_id",
             "status",
             "justification",
+            "is_urgent",
             "requested_at",
             "reviewed_at",
         )
@@ -479,6 +527,11 @@ class AccessRequestReviewSerializer(serializers.ModelSerializer):
         return value
 
 
+class AccessRequestBulkReviewSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=1000)
+    review_comment = serializers.CharField(required=False, allow_blank=True, default="")
+
+
 class CredentialVersionSerializer(serializers.ModelSerializer):
     changed_by = UserSerializer(read_only=True)
 
@@ -495,7 +548,6 @@ class CredentialVersionSerializer(serializers.ModelSerializer):
             "ssh_algorithm",
             "ssh_public_key",
             "ssh_fingerprint",
-            "password",
             "notes",
             "is_active",
             "change_type",
@@ -504,6 +556,11 @@ class CredentialVersionSerializer(serializers.ModelSerializer):
         )
 
 
+class CredentialVersionSecretSerializer(CredentialVersionSerializer):
+    class Meta(CredentialVersionSerializer.Meta):
+        fields = CredentialVersionSerializer.Meta.fields + ("password",)
+
+
 class AuditLogSerializer(serializers.ModelSerializer):
     actor = UserSerializer(read_only=True)
 
@@ -519,4 +576,29 @@ class AuditLogSerializer(serializers.ModelSerializer):
             "ip_address",
             "user_agent",
             "metadata",
+            "repeat_count",
+            "last_seen_at",
+        )
+
+
+class AuditFeedSerializer(serializers.ModelSerializer):
+    """Flat audit entry for ``/api/audit-logs/feed/`` (one JSON line each)."""
+
+    actor = serializers.CharField(source="actor.portal_login", default=None, read_only=True)
+
+    class Meta:
+        model = AuditLog
+        fields = (
+            "id",
+            "created_at",
+            "actor_id",
+            "actor",
+            "action",
+            "object_type",
+            "object_id",
+            "ip_address",
+            "user_agent",
+            "metadata",
+            "repeat_count",
+            "last_seen_at",
         )
@@ -0,0 +1,56 @@
+import base64
+import binascii
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def scope_fingerprint(*parts):
+    """Hash everything that decides which rows a caller can see.
+
+    A cursor is only valid for the scope it was issued in; when the hash
+    changes (role, department, department shares, head's department members)
+    the client gets a full snapshot instead of a delta.
+    """
+    payload = json.dumps(parts, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(moment, scope):
+    payload = json.dumps({"t": moment.isoformat(), "s": scope}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(value):
+    """Return ``(moment, scope)`` from a cursor issued by :func:`encode_cursor`."""
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+        payload = json.loads(raw)
+        moment = parse_datetime(payload["t"])
+        scope = payload["s"]
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError):
+        raise InvalidCursor(value)
+    if moment is None or timezone.is_naive(moment) or not isinstance(scope, str):
+        raise InvalidCursor(value)
+    return moment, scope
+
+
+def next_cursor_moment(since=None):
+    """Point the next cursor slightly into the past.
+
+    ``updated_at`` is stamped before commit, so a row written by a slow
+    transaction can become visible after a poll that already passed its
+    timestamp. Re-reading the last ``SYNC_CURSOR_LAG_SECONDS`` on every poll
+    catches those rows; clients apply changes as idempotent upserts.
+    """
+    lag = max(0, int(getattr(settings, "SYNC_CURSOR_LAG_SECONDS", 30)))
+    moment = timezone.now() - timedelta(seconds=lag)
+    return max(since, moment) if since else moment
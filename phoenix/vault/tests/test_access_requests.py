@@ -1,13 +1,17 @@
 from datetime import timedelta
 from unittest.mock import patch
 
+import psycopg
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
 from django.test.utils import override_settings
 from django.utils import timezone
 from rest_framework.test import APIClient
 
-from vault.models import AccessRequest, Department, Service, ServiceAccess
+from vault.models import AccessRequest, Department, EmailOutbox, Service, ServiceAccess
+from vault.notifications import send_reviewer_digests
 
 User = get_user_model()
 
@@ -171,23 +175,163 @@ class AccessRequestFlowTests(TestCase):
     @override_settings(EMAIL_NOTIFICATIONS_ENABLED=False)
     def test_create_request_does_not_send_email_when_notifications_disabled(self):
         self._auth(self.employee)
-        with patch("vault.notifications.send_mail") as mocked_send_mail:
+        with patch("vault.notifications.EmailMessage.send") as mocked_send:
             response = self.client.post(
                 "/api/access-requests/",
                 {"service_id": self.service.id, "justification": "Need for work"},
                 format="json",
             )
         self.assertEqual(response.status_code, 201)
-        mocked_send_mail.assert_not_called()
+        mocked_send.assert_not_called()
+        self.assertFalse(EmailOutbox.objects.exists())
 
     @override_settings(EMAIL_NOTIFICATIONS_ENABLED=True)
-    def test_create_request_sends_email_when_notifications_enabled(self):
+    def test_create_request_queues_email_when_notifications_enabled(self):
         self._auth(self.employee)
-        with patch("vault.notifications.send_mail") as mocked_send_mail:
+        with patch("vault.notifications.EmailMessage.send") as mocked_send:
             response = self.client.post(
                 "/api/access-requests/",
                 {"service_id": self.service.id, "justification": "Need for work"},
                 format="json",
             )
         self.assertEqual(response.status_code, 201)
-        mocked_send_mail.assert_called_once()
+        mocked_send.assert_not_called()
+        queued = EmailOutbox.objects.get()
+        self.assertEqual(queued.status, EmailOutbox.Status.PENDING)
+        self.assertEqual(queued.recipients, ["head@example.com"])
+
+    @override_settings(EMAIL_NOTIFICATIONS_ENABLED=True, ACCESS_REQUEST_DIGEST_MINUTES=15)
+    def test_pending_requests_are_grouped_into_one_digest_per_reviewer(self):
+        superuser = User.objects.create_superuser(portal_login="root", password="root-pass-123", email="root@example.com")
+        second_service = Service.objects.create(name="Wiki", url="https://wiki.local", department=self.department)
+        self._auth(self.employee)
+        for service in (self.service, second_service):
+            response = self.client.post(
+                "/api/access-requests/",
+                {"service_id": service.id, "justification": "Need for work"},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 201)
+        self._auth(self.other_employee)
+        self.client.post("/api/access-requests/", {"service_id": self.service.id}, format="json")
+        self.assertFalse(EmailOutbox.objects.exists())
+
+        self.assertEqual(send_reviewer_digests(), 0)
+        self.assertEqual(send_reviewer_digests(now=timezone.now() + timedelta(minutes=16)), 2)
+
+        digests = {tuple(item.recipients): item for item in EmailOutbox.objects.all()}
+        self.assertEqual(set(digests), {("head@example.com",), (superuser.email,)})
+        self.assertIn("(2)", digests[("head@example.com",)].subject)
+        self.assertIn("emp.it -> Wiki", digests[("head@example.com",)].body)
+        self.assertIn("emp.other -> Repo", digests[(superuser.email,)].body)
+        self.assertFalse(AccessRequest.objects.filter(reviewers_notified_at__isnull=True).exists())
+        self.assertEqual(send_reviewer_digests(now=timezone.now() + timedelta(hours=1)), 0)
+
+    @override_settings(EMAIL_NOTIFICATIONS_ENABLED=True, ACCESS_REQUEST_DIGEST_MINUTES=15)
+    def test_urgent_request_bypasses_digest(self):
+        self._auth(self.employee)
+        response = self.client.post(
+            "/api/access-requests/",
+            {"service_id": self.service.id, "justification": "Incident", "is_urgent": True},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        queued = EmailOutbox.objects.get()
+        self.assertEqual(queued.recipients, ["head@example.com"])
+        self.assertIn("срочный", queued.subject)
+        self.assertEqual(send_reviewer_digests(now=timezone.now() + timedelta(hours=1)), 0)
+
+
+class AccessRequestBulkReviewTests(TransactionTestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.department = Department.objects.create(name="IT")
+        self.other_department = Department.objects.create(name="Sales")
+        self.head = User.objects.create_user(
+            portal_login="head.it",
+            role=User.Role.HEAD,
+            department=self.department,
+        )
+        self.employee = User.objects.create_user(
+            portal_login="emp.it",
+            role=User.Role.EMPLOYEE,
+            department=self.department,
+            email="emp@example.com",
+        )
+        self.foreign_employee = User.objects.create_user(
+            portal_login="emp.sales",
+            role=User.Role.EMPLOYEE,
+            department=self.other_department,
+        )
+        self.services = [
+            Service.objects.create(name=f"Service {index}", url=f"https://s{index}.local", department=self.department)
+            for index in range(4)
+        ]
+        self.pending = [
+            AccessRequest.objects.create(requester=self.employee, service=service) for service in self.services[:3]
+        ]
+        self.already_rejected = AccessRequest.objects.create(
+            requester=self.employee,
+            service=self.services[3],
+            status=AccessRequest.Status.REJECTED,
+        )
+        self.foreign = AccessRequest.objects.create(requester=self.foreign_employee, service=self.services[0])
+        self.client.force_authenticate(user=self.head)
+
+    @override_settings(EMAIL_NOTIFICATIONS_ENABLED=True)
+    def test_bulk_approve_reports_per_item_results(self):
+        ids = [item.id for item in self.pending[:2]] + [self.already_rejected.id, self.foreign.id]
+
+        response = self.client.post(
+            "/api/access-requests/bulk-approve/",
+            {"ids": ids, "review_comment": "ok"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item["result"] for item in response.json()["results"]],
+            ["approved", "approved", "not_pending", "not_found"],
+        )
+        self.assertEqual(
+            AccessRequest.objects.filter(status=AccessRequest.Status.APPROVED, reviewer=self.head).count(),
+            2,
+        )
+        self.assertEqual(ServiceAccess.objects.filter(user=self.employee, is_active=True).count(), 2)
+        self.assertEqual(AccessRequest.objects.get(pk=self.foreign.pk).status, AccessRequest.Status.PENDING)
+        queued = EmailOutbox.objects.get()
+        self.assertIn("Service 0, Service 1", queued.body)
+
+    def test_rows_locked_by_another_reviewer_are_skipped(self):
+        held = self.pending[0]
+        db = connection.settings_dict
+        other = psycopg.connect(
+            dbname=db["NAME"],
+            user=db["USER"],
+            password=db["PASSWORD"],
+            host=db["HOST"],
+            port=db["PORT"] or None,
+        )
+        self.addCleanup(other.close)
+        with other.cursor() as cursor:
+            cursor.execute("SELECT id FROM vault_accessrequest WHERE id = %s FOR UPDATE", [held.id])
+
+        response = self.client.post(
+            "/api/access-requests/bulk-reject/",
+            {"ids": [item.id for item in self.pending]},
+            format="json",
+        )
+        other.rollback()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["result"] for item in response.json()["results"]], ["locked", "rejected", "rejected"])
+        self.assertEqual(AccessRequest.objects.get(pk=held.pk).status, AccessRequest.Status.PENDING)
+
+    def test_employee_cannot_bulk_review(self):
+        self.client.force_authenticate(user=self.employee)
+        response = self.client.post(
+            "/api/access-requests/bulk-approve/",
+            {"ids": [self.pending[0].id]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 403)
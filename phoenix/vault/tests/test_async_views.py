@@ -0,0 +1,60 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase
+from rest_framework.authtoken.models import Token
+
+from vault.models import Department, Service
+
+User = get_user_model()
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        self.dep_it = Department.objects.create(name="IT")
+        self.head_it = User.objects.create_user(
+            portal_login="head.it",
+            role=User.Role.HEAD,
+            department=self.dep_it,
+        )
+        self.employee = User.objects.create_user(
+            portal_login="emp.it",
+            role=User.Role.EMPLOYEE,
+            department=self.dep_it,
+        )
+        self.gitlab = Service.objects.create(name="GitLab", url="https://gitlab.local", department=self.dep_it)
+        Service.objects.create(name="Legacy", url="https://legacy.local", department=self.dep_it, is_active=False)
+
+    async def _headers(self, user):
+        token = await sync_to_async(lambda: Token.objects.get(user=user).key)()
+        return {"Authorization": f"Token {token}"}
+
+    async def test_health_and_public_config(self):
+        client = AsyncClient()
+
+        self.assertEqual((await client.get("/api/health/live/")).json()["status"], "ok")
+        self.assertEqual((await client.get("/api/health/ready/")).json()["database"], "up")
+        self.assertEqual((await client.get("/api/config/public/")).json()["product_name"], "Phoenix Vault")
+
+    async def test_me_requires_token_and_returns_department(self):
+        self.assertEqual((await AsyncClient().get("/api/me/")).status_code, 401)
+
+        response = await AsyncClient().get("/api/me/", headers=await self._headers(self.employee))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["department"]["name"], "IT")
+
+    async def test_async_list_keeps_visibility_and_sync_actions_still_work(self):
+        client = AsyncClient()
+        employee = await self._headers(self.employee)
+        response = await client.get("/api/services/", headers=employee)
+        self.assertEqual([item["name"] for item in response.json()], ["GitLab"])
+        response = await client.get("/api/departments/", headers=employee)
+        self.assertEqual([item["id"] for item in response.json()], [self.dep_it.id])
+        payload = {"name": "Vault", "url": "https://vault.local"}
+        response = await client.post("/api/services/", payload, content_type="application/json", headers=employee)
+        self.assertEqual(response.status_code, 403)
+
+        head = await self._headers(self.head_it)
+        response = await client.post("/api/services/", payload, content_type="application/json", headers=head)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(len((await client.get("/api/services/", headers=head)).json()), 3)
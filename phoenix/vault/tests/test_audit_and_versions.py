@@ -1,11 +1,23 @@
 from datetime import timedelta
+from io import StringIO
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
 from django.utils import timezone
 from rest_framework.test import APIClient
 
-from vault.models import AuditLog, Credential, Department, DepartmentShare, Service
+from vault.audit import build_audit_entry, log_action, write_audit_entries
+from vault.models import (
+    AuditLog,
+    Credential,
+    CredentialVersion,
+    Department,
+    DepartmentShare,
+    SecretBlob,
+    Service,
+    UserAgent,
+)
 
 User = get_user_model()
 
@@ -125,6 +137,39 @@ class AuditVisibilityTests(TestCase):
         self.assertEqual(by_object_type.status_code, 200)
         self.assertTrue(by_object_type.json())
 
+    def test_metadata_filters_combine_with_scope_and_other_filters(self):
+        AuditLog.objects.create(
+            actor=self.employee_it,
+            action=AuditLog.Action.VIEW,
+            object_type="Credential",
+            object_id="4",
+            metadata={"download": "ssh_private_key", "count": 2, "bulk": True, "origin": {"source": "it"}},
+        )
+        AuditLog.objects.create(
+            actor=self.employee_finance,
+            action=AuditLog.Action.VIEW,
+            object_type="Credential",
+            object_id="5",
+            metadata={"download": "ssh_private_key", "count": "2"},
+        )
+        self._auth(self.head_marketing)
+
+        def object_ids(**params):
+            response = self.client.get("/api/audit-logs/", params)
+            self.assertEqual(response.status_code, 200)
+            return sorted(item["object_id"] for item in response.json())
+
+        self.assertEqual(object_ids(**{"metadata.download": "ssh_private_key"}), ["4"])
+        self.assertEqual(object_ids(**{"metadata.download": "ssh_private_key", "action": "create"}), [])
+        self.assertEqual(object_ids(**{"metadata.source": "it", "actor": "emp.it"}), ["1"])
+        self.assertEqual(object_ids(**{"metadata.origin.source": "it", "metadata.bulk": "true"}), ["4"])
+        self.assertEqual(object_ids(**{"metadata.bulk": "1"}), [])
+
+        self._auth(self.superuser)
+        self.assertEqual(object_ids(**{"metadata.count": "2"}), ["4", "5"])
+        self.assertEqual(object_ids(**{"metadata.source": ["it", "finance"]}), ["1", "3"])
+        self.assertEqual(self.client.get("/api/audit-logs/", {"metadata.a b": "x"}).status_code, 400)
+
     def test_superuser_can_export_audit_logs_as_csv(self):
         self._auth(self.superuser)
         response = self.client.get("/api/audit-logs/export/")
@@ -201,7 +246,7 @@ class CredentialVersioningTests(TestCase):
 
         versions_response = self.client.get(f"/api/credentials/{credential_id}/versions/")
         self.assertEqual(versions_response.status_code, 200)
-        payload = versions_response.json()
+        payload = versions_response.json()["results"]
         self.assertEqual(len(payload), 2)
         self.assertEqual(payload[0]["change_type"], "update")
         self.assertEqual(payload[0]["changed_by"]["portal_login"], self.head_it.portal_login)
@@ -222,6 +267,79 @@ class CredentialVersioningTests(TestCase):
         response = self.client.get(f"/api/credentials/{credential.id}/versions/")
         self.assertEqual(response.status_code, 404)
 
+    def _credential_with_history(self, versions):
+        credential = Credential.objects.create(
+            user=self.employee_it,
+            service=self.service,
+            login="emp.it@login",
+            password="secret-0",
+        )
+        for number in range(1, versions + 1):
+            CredentialVersion.objects.create(
+                credential=credential,
+                version=number,
+                login=credential.login,
+                password=f"secret-{number}",
+                change_type=CredentialVersion.ChangeType.UPDATE,
+            )
+        return credential
+
+    def test_versions_are_cursor_paginated_without_secrets(self):
+        credential = self._credential_with_history(5)
+        self._auth(self.head_it)
+
+        with self.assertNumQueries(4):
+            first = self.client.get(f"/api/credentials/{credential.id}/versions/", {"page_size": 2}).json()
+        self.assertEqual([item["version"] for item in first["results"]], [5, 4])
+        self.assertNotIn("password", first["results"][0])
+        self.assertIsNone(first["previous"])
+
+        second = self.client.get(first["next"]).json()
+        third = self.client.get(second["next"]).json()
+        self.assertEqual([item["version"] for item in second["results"]], [3, 2])
+        self.assertEqual([item["version"] for item in third["results"]], [1])
+        self.assertIsNone(third["next"])
+
+    def test_reveal_returns_one_version_secret_and_is_audited(self):
+        credential = self._credential_with_history(3)
+        self._auth(self.head_it)
+
+        response = self.client.get(f"/api/credentials/{credential.id}/versions/2/reveal/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()["version"], response.json()["password"]), (2, "secret-2"))
+        entry = AuditLog.objects.get(object_type="CredentialVersion", metadata__reveal=True)
+        self.assertEqual((entry.actor, entry.metadata["version"]), (self.head_it, 2))
+        missing = self.client.get(f"/api/credentials/{credential.id}/versions/9/reveal/")
+        self.assertEqual(missing.status_code, 404)
+
+    def test_employee_cannot_reveal_foreign_credential_version(self):
+        credential = self._credential_with_history(1)
+        self._auth(self.employee_finance)
+
+        response = self.client.get(f"/api/credentials/{credential.id}/versions/1/reveal/")
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_prune_keeps_newest_versions_and_drops_unreferenced_secrets(self):
+        credential = self._credential_with_history(6)
+        CredentialVersion.objects.filter(credential=credential, version=6).update(
+            created_at=timezone.now() - timedelta(days=400)
+        )
+        other = Credential.objects.create(
+            user=self.employee_finance,
+            service=self.foreign_service,
+            login="fin",
+            password="secret-1",
+        )
+
+        call_command("prune_credential_versions", keep=3, max_age_days=365, batch_size=2, stdout=StringIO())
+
+        self.assertEqual(list(credential.versions.order_by("version").values_list("version", flat=True)), [4, 5, 6])
+        remaining = {blob.value for blob in SecretBlob.objects.all()}
+        self.assertEqual(remaining, {"secret-0", "secret-1", "secret-4", "secret-5", "secret-6"})
+        self.assertEqual(other.password, "secret-1")
+
     def test_employee_cannot_list_department_shares(self):
         DepartmentShare.objects.create(
             department=self.dep_it,
@@ -234,3 +352,89 @@ class CredentialVersioningTests(TestCase):
         self._auth(self.employee_it)
         response = self.client.get("/api/department-shares/")
         self.assertEqual(response.status_code, 403)
+
+
+@override_settings(AUDIT_VIEW_COALESCE_SECONDS=300)
+class AuditViewCoalescingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.dep_it = Department.objects.create(name="IT")
+        self.employee = User.objects.create_user(
+            portal_login="emp.it.coalesce",
+            role=User.Role.EMPLOYEE,
+            department=self.dep_it,
+        )
+        service = Service.objects.create(name="Repo", url="https://repo.local", department=self.dep_it)
+        self.credential = Credential.objects.create(user=self.employee, service=service, login="emp", password="s-0")
+        CredentialVersion.objects.create(credential=self.credential, version=1, login="emp", password="s-1")
+        self.client.force_authenticate(user=self.employee)
+
+    def _list_rows(self):
+        return list(
+            AuditLog.objects.filter(object_type="Credential", object_id="list")
+            .order_by("id")
+            .values_list("ip_address", "repeat_count")
+        )
+
+    def test_repeated_views_bump_one_row_per_actor_and_ip(self):
+        for _ in range(3):
+            self.client.get("/api/credentials/", REMOTE_ADDR="10.0.0.1")
+        self.client.get("/api/credentials/", REMOTE_ADDR="10.0.0.2")
+
+        self.assertEqual(self._list_rows(), [("10.0.0.1", 3), ("10.0.0.2", 1)])
+        entry = AuditLog.objects.get(ip_address="10.0.0.1", object_id="list")
+        self.assertGreaterEqual(entry.last_seen_at, entry.created_at)
+        history_url = f"/api/credentials/{self.credential.id}/versions/"
+        self.client.get(history_url, REMOTE_ADDR="10.0.0.1")
+        self.client.get(history_url, REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(AuditLog.objects.get(object_type="CredentialVersion").repeat_count, 2)
+
+    def test_views_outside_the_window_start_a_new_row(self):
+        self.client.get("/api/credentials/", REMOTE_ADDR="10.0.0.1")
+        AuditLog.objects.update(created_at=timezone.now() - timedelta(minutes=6))
+        self.client.get("/api/credentials/", REMOTE_ADDR="10.0.0.1")
+
+        self.assertEqual(self._list_rows(), [("10.0.0.1", 1), ("10.0.0.1", 1)])
+        with override_settings(AUDIT_VIEW_COALESCE_SECONDS=0):
+            self.client.get("/api/credentials/", REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(len(self._list_rows()), 3)
+
+    def test_reveals_are_never_coalesced(self):
+        for _ in range(2):
+            response = self.client.get(
+                f"/api/credentials/{self.credential.id}/versions/1/reveal/", REMOTE_ADDR="10.0.0.1"
+            )
+            self.assertEqual(response.status_code, 200)
+
+        reveals = AuditLog.objects.filter(metadata__reveal=True)
+        self.assertEqual(list(reveals.values_list("repeat_count", flat=True)), [1, 1])
+
+
+class AuditUserAgentTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.superuser = User.objects.create_superuser(portal_login="root.ua", password="root-pass-123")
+        self.client.force_authenticate(user=self.superuser)
+
+    def test_user_agents_are_stored_once_and_served_as_strings(self):
+        browser = "Mozilla/5.0 (X11; Linux x86_64) Firefox/128.0"
+        request = RequestFactory().get("/", HTTP_USER_AGENT=browser)
+        for object_id in ("1", "2"):
+            log_action(self.superuser, AuditLog.Action.LOGIN, object_type="User", object_id=object_id, request=request)
+        write_audit_entries(
+            [
+                build_audit_entry(self.superuser, AuditLog.Action.LOGIN, object_type="User", object_id="3", request=request),
+                build_audit_entry(self.superuser, AuditLog.Action.LOGIN, object_type="User", object_id="4"),
+            ]
+        )
+
+        agent = UserAgent.objects.get()
+        self.assertEqual(agent.value, browser)
+        self.assertEqual(
+            list(AuditLog.objects.order_by("object_id").values_list("agent_id", flat=True)),
+            [agent.id, agent.id, agent.id, None],
+        )
+        listed = self.client.get("/api/audit-logs/").json()
+        self.assertEqual([item["user_agent"] for item in listed], ["", browser, browser, browser])
+        export = self.client.get("/api/audit-logs/export/").content.decode("utf-8")
+        self.assertEqual(export.count(f'"{browser}"'), 3)
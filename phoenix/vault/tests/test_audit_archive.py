@@ -0,0 +1,110 @@
+import json
+import os
+import stat
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from vault import audit_archive
+from vault.models import AuditLog, Department
+
+User = get_user_model()
+
+
+class AuditArchiveTests(TestCase):
+    def setUp(self):
+        archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(archive_dir.cleanup)
+        self.archive_dir = archive_dir.name
+        overrides = override_settings(AUDIT_ARCHIVE_DIR=self.archive_dir, AUDIT_ARCHIVE_COMPRESSION="gzip")
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        self.dep_it = Department.objects.create(name="IT")
+        self.head_it = User.objects.create_user(portal_login="head.it", role=User.Role.HEAD, department=self.dep_it)
+        self.employee = User.objects.create_user(
+            portal_login="emp.it",
+            role=User.Role.EMPLOYEE,
+            department=self.dep_it,
+        )
+        self.outsider = User.objects.create_user(portal_login="emp.other", role=User.Role.EMPLOYEE)
+        self.now = timezone.now()
+
+    def _log(self, actor, object_id, days_ago, action=AuditLog.Action.VIEW):
+        return AuditLog.objects.create(
+            actor=actor,
+            action=action,
+            object_type="Credential",
+            object_id=object_id,
+            created_at=self.now - timedelta(days=days_ago),
+            metadata={"source": "archive" if days_ago > 90 else "live"},
+        )
+
+    def _archive(self, days=90, **options):
+        out = StringIO()
+        call_command("archive_audit_logs", days=days, stdout=out, **options)
+        return out.getvalue()
+
+    def test_command_moves_old_entries_into_read_only_segments(self):
+        self._log(self.employee, "old-1", days_ago=200)
+        self._log(self.outsider, "old-2", days_ago=120)
+        self._log(self.employee, "hot", days_ago=1)
+
+        output = self._archive(segment_size=1)
+
+        self.assertIn("Archived audit rows: 2 in 2 segments", output)
+        self.assertEqual(list(AuditLog.objects.values_list("object_id", flat=True)), ["hot"])
+        indexes = audit_archive.segment_indexes()
+        self.assertEqual([index["actor_ids"] for index in indexes], [[self.employee.id], [self.outsider.id]])
+        self.assertEqual(indexes[0]["max_created_at"], self.now - timedelta(days=200))
+        for name in os.listdir(self.archive_dir):
+            self.assertFalse(os.stat(os.path.join(self.archive_dir, name)).st_mode & stat.S_IWUSR)
+
+        self.assertIn("Archived audit rows: 0 in 0 segments", self._archive())
+
+    def test_list_and_export_reach_into_the_archive_only_with_a_date_range(self):
+        self._log(self.employee, "archived-own-dept", days_ago=200)
+        self._log(self.outsider, "archived-other-dept", days_ago=200)
+        self._log(self.employee, "hot", days_ago=1)
+        self._archive()
+        client = APIClient()
+        client.force_authenticate(user=self.head_it)
+        date_from = (self.now - timedelta(days=365)).date().isoformat()
+
+        hot_only = client.get("/api/audit-logs/").json()
+        reaching = client.get("/api/audit-logs/", {"date_from": date_from}).json()
+        filtered = client.get("/api/audit-logs/", {"date_from": date_from, "actor": "other"}).json()
+        by_metadata = client.get("/api/audit-logs/", {"date_from": date_from, "metadata.source": "archive"}).json()
+        export = client.get("/api/audit-logs/export/", {"date_from": date_from}).content.decode("utf-8")
+
+        self.assertEqual([item["object_id"] for item in hot_only], ["hot"])
+        self.assertEqual([item["object_id"] for item in reaching], ["hot", "archived-own-dept"])
+        self.assertEqual(reaching[1]["actor"]["department"]["name"], "IT")
+        self.assertEqual(filtered, [])
+        self.assertEqual([item["object_id"] for item in by_metadata], ["archived-own-dept"])
+        self.assertIn("archived-own-dept", export)
+        self.assertNotIn("archived-other-dept", export)
+
+    def test_search_opens_only_overlapping_segments(self):
+        self._log(self.employee, "january", days_ago=300)
+        self._log(self.outsider, "march", days_ago=240)
+        self._log(self.employee, "may", days_ago=180)
+        self._archive(segment_size=1)
+
+        with patch.object(audit_archive, "_open_segment", wraps=audit_archive._open_segment) as opened:
+            by_date = audit_archive.search_archive(self.now - timedelta(days=250), self.now - timedelta(days=200))
+            by_actor = audit_archive.search_archive(self.now - timedelta(days=400), actor_ids={self.outsider.id})
+
+        self.assertEqual([entry.object_id for entry in by_date], ["march"])
+        self.assertEqual([entry.object_id for entry in by_actor], ["march"])
+        self.assertEqual(opened.call_count, 2)
+        sidecar = next(name for name in os.listdir(self.archive_dir) if name.endswith(audit_archive.INDEX_SUFFIX))
+        with open(os.path.join(self.archive_dir, sidecar), encoding="utf-8") as handle:
+            self.assertEqual(json.load(handle)["count"], 1)
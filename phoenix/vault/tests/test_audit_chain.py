@@ -0,0 +1,122 @@
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from vault.audit import _coalesce_view
+from vault.audit_archive import archive_audit_logs
+from vault.audit_chain import seal_audit_entries, verify_audit_chain
+from vault.audit_rollups import update_audit_rollups
+from vault.models import AuditChainHead, AuditCheckpoint, AuditLog
+
+User = get_user_model()
+
+NOW = datetime(2026, 3, 10, 12, 30, tzinfo=dt_timezone.utc)
+
+
+@override_settings(
+    AUDIT_ROLLUP_LAG_SECONDS=60,
+    AUDIT_VIEW_COALESCE_SECONDS=300,
+    AUDIT_CHAIN_CHECKPOINT_ROWS=2,
+    AUDIT_CHAIN_CHECKPOINT_SECONDS=3600,
+)
+class AuditChainTests(TestCase):
+    def setUp(self):
+        self.employee = User.objects.create_user(portal_login="emp.it", role=User.Role.EMPLOYEE)
+
+    def _log(self, object_id, at, **fields):
+        return AuditLog.objects.create(
+            actor=self.employee,
+            action=AuditLog.Action.VIEW,
+            object_type="Credential",
+            object_id=object_id,
+            created_at=at,
+            **fields,
+        )
+
+    def test_settled_entries_are_chained_with_checkpoints_every_n_rows_or_hour(self):
+        first = self._log("1", NOW - timedelta(hours=2), user_agent="Firefox", metadata={"b": 1, "a": [1, 2]})
+        self._log("2", NOW - timedelta(hours=2), repeat_count=3, last_seen_at=NOW - timedelta(hours=1))
+        self._log("3", NOW - timedelta(hours=1))
+        recent = self._log("4", NOW - timedelta(seconds=30))
+
+        self.assertEqual(seal_audit_entries(now=NOW), 3)
+        self.assertEqual(AuditLog.objects.get(pk=recent.pk).chain_hash, "")
+        self.assertEqual(len(AuditLog.objects.get(pk=first.pk).chain_hash), 64)
+        self.assertEqual(list(AuditCheckpoint.objects.values_list("row_count", flat=True)), [2])
+        self.assertEqual(AuditChainHead.objects.get().pending_rows, 1)
+
+        self.assertEqual(seal_audit_entries(now=NOW + timedelta(hours=1)), 1)
+        self.assertEqual(list(AuditCheckpoint.objects.values_list("row_count", flat=True)), [2, 2])
+        self.assertEqual(seal_audit_entries(now=NOW + timedelta(hours=3)), 0)
+
+        out = StringIO()
+        call_command("verify_audit_chain", stdout=out)
+        self.assertIn("Audit checkpoints verified: 2", out.getvalue())
+        self.assertEqual(verify_audit_chain(), (0, []))
+        self.assertEqual(verify_audit_chain(recheck=True), (2, []))
+
+    def test_verification_reports_edited_and_deleted_entries(self):
+        for object_id in "1234":
+            self._log(object_id, NOW - timedelta(hours=2))
+        seal_audit_entries(now=NOW)
+        first, second = AuditCheckpoint.objects.order_by("last_audit_id")
+
+        AuditLog.objects.filter(object_id="4").update(metadata={"forged": True})
+        self.assertEqual(verify_audit_chain(), (2, [f"{second}: entry #{second.last_audit_id} does not match its chain hash"]))
+        self.assertIsNotNone(AuditCheckpoint.objects.get(pk=first.pk).verified_at)
+        self.assertIsNone(AuditCheckpoint.objects.get(pk=second.pk).verified_at)
+
+        AuditLog.objects.filter(object_id="4").delete()
+        self.assertEqual(verify_audit_chain(), (1, [f"{second}: 1 entries, 2 sealed"]))
+        AuditCheckpoint.objects.filter(pk=second.pk).update(row_count=1)
+        with self.assertRaisesMessage(CommandError, "1 problems in 1 checkpoints"):
+            call_command("verify_audit_chain", stdout=StringIO(), stderr=StringIO())
+
+    def test_sealed_views_are_not_coalesced_into(self):
+        entry = self._log("1", NOW - timedelta(hours=2))
+        seal_audit_entries(now=NOW, checkpoint=True)
+
+        repeat = AuditLog(
+            actor=self.employee,
+            action=AuditLog.Action.VIEW,
+            object_type="Credential",
+            object_id="1",
+            created_at=entry.created_at + timedelta(seconds=60),
+        )
+        _coalesce_view(repeat, "default")
+
+        self.assertIsNotNone(repeat.pk)
+        self.assertEqual(AuditLog.objects.get(pk=entry.pk).repeat_count, 1)
+        self.assertEqual(verify_audit_chain(), (1, []))
+
+    def test_archived_ranges_still_verify_and_unverified_ranges_stay_live(self):
+        now = timezone.now()
+        old, recent = now - timedelta(days=200), now - timedelta(hours=1)
+        for object_id, at in (("1", old), ("2", recent), ("3", old), ("4", old)):
+            self._log(object_id, at)
+        seal_audit_entries()
+        self.assertEqual(verify_audit_chain(), (2, []))
+        self._log("5", old)
+        seal_audit_entries(checkpoint=True)
+        update_audit_rollups()
+
+        with tempfile.TemporaryDirectory() as archive_dir, override_settings(AUDIT_ARCHIVE_DIR=archive_dir):
+            written = archive_audit_logs(now - timedelta(days=1))
+            self.assertEqual(sum(index["count"] for index in written), 3)
+            self.assertEqual(sorted(AuditLog.objects.values_list("object_id", flat=True)), ["2", "5"])
+            self.assertEqual(verify_audit_chain(recheck=True), (3, []))
+
+            self.assertEqual(sum(index["count"] for index in archive_audit_logs(now - timedelta(days=1))), 1)
+            self.assertEqual(verify_audit_chain(recheck=True), (3, []))
+
+            AuditLog.objects.filter(object_id="2").update(metadata={"forged": True})
+            first = AuditCheckpoint.objects.order_by("last_audit_id").first()
+            self.assertEqual(
+                verify_audit_chain(recheck=True),
+                (3, [f"{first}: entry #{first.last_audit_id} does not match its chain hash"]),
+            )
@@ -0,0 +1,103 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, connections, transaction
+from django.test import TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from vault.audit import AUDIT_ALIAS, AuditRouter, flush_audit_outbox, log_action
+from vault.models import AuditLog, AuditOutbox, Department
+
+User = get_user_model()
+
+
+class AuditDatabaseTests(TransactionTestCase):
+    """The stand-in audit database is a second connection to the test database."""
+
+    databases = {"default", AUDIT_ALIAS} if AUDIT_ALIAS in settings.DATABASES else {"default"}
+
+    def setUp(self):
+        configured = connections.settings.get(AUDIT_ALIAS)
+        if configured is None:
+            self.addCleanup(connections.settings.pop, AUDIT_ALIAS)
+        else:
+            self.addCleanup(connections.settings.__setitem__, AUDIT_ALIAS, configured)
+        self.addCleanup(self._drop_audit_connection)
+        self._use_audit_database()
+
+        self.dep_it = Department.objects.create(name="IT")
+        self.head_it = User.objects.create_user(portal_login="head.it", role=User.Role.HEAD, department=self.dep_it)
+        self.employee = User.objects.create_user(
+            portal_login="emp.it",
+            role=User.Role.EMPLOYEE,
+            department=self.dep_it,
+        )
+        self.outsider = User.objects.create_user(portal_login="emp.other", role=User.Role.EMPLOYEE)
+
+    def _drop_audit_connection(self):
+        if AUDIT_ALIAS in connections:
+            connections[AUDIT_ALIAS].close()
+            del connections[AUDIT_ALIAS]
+
+    def _use_audit_database(self, **overrides):
+        self._drop_audit_connection()
+        connections.settings[AUDIT_ALIAS] = {**connection.settings_dict, **overrides}
+
+    def _audit_rows(self):
+        return list(AuditLog.objects.using(AUDIT_ALIAS).values_list("object_id", flat=True))
+
+    def test_entries_are_written_after_the_business_transaction(self):
+        with transaction.atomic():
+            log_action(self.employee, AuditLog.Action.VIEW, object_type="Credential", object_id="committed")
+            self.assertEqual(self._audit_rows(), [])
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            log_action(self.employee, AuditLog.Action.VIEW, object_type="Credential", object_id="rolled-back")
+            raise RuntimeError
+
+        self.assertEqual(self._audit_rows(), ["committed"])
+
+    def test_unreachable_audit_database_falls_back_to_the_outbox(self):
+        self._use_audit_database(PORT="1")
+        with self.assertLogs("vault.audit", "WARNING"):
+            entry = log_action(self.employee, AuditLog.Action.LOGIN, object_type="User", object_id="parked")
+        self.assertEqual(entry.pk, None)
+        self.assertEqual(AuditOutbox.objects.count(), 1)
+
+        self._use_audit_database()
+        self.assertEqual(flush_audit_outbox(), 1)
+
+        stored = AuditLog.objects.get(object_id="parked")
+        self.assertEqual((stored.actor_id, stored.created_at), (self.employee.id, entry.created_at))
+        self.assertFalse(AuditOutbox.objects.exists())
+
+    @override_settings(AUDIT_VIEW_COALESCE_SECONDS=300)
+    def test_repeated_views_are_coalesced_on_the_audit_database(self):
+        for _ in range(2):
+            with transaction.atomic():
+                log_action(self.employee, AuditLog.Action.VIEW, object_type="Credential", object_id="list", coalesce=True)
+
+        self.assertEqual(
+            list(AuditLog.objects.using(AUDIT_ALIAS).values_list("object_id", "repeat_count")), [("list", 2)]
+        )
+
+    def test_audit_list_scopes_and_filters_without_cross_database_joins(self):
+        for actor in (self.head_it, self.employee, self.outsider):
+            log_action(actor, AuditLog.Action.LOGIN, object_type="User", object_id=actor.portal_login)
+        client = APIClient()
+        client.force_authenticate(user=self.head_it)
+
+        listed = client.get("/api/audit-logs/").json()
+        filtered = client.get("/api/audit-logs/", {"actor": "emp"}).json()
+
+        self.assertEqual(sorted(item["object_id"] for item in listed), ["emp.it", "head.it"])
+        self.assertEqual([item["actor"]["portal_login"] for item in filtered], ["emp.it"])
+        self.assertEqual(filtered[0]["actor"]["department"]["name"], "IT")
+
+    def test_audit_database_only_migrates_the_audit_table(self):
+        router = AuditRouter()
+
+        self.assertFalse(router.allow_migrate(AUDIT_ALIAS, "vault", model_name="credential"))
+        self.assertFalse(router.allow_migrate(AUDIT_ALIAS, "auth", model_name="permission"))
+        self.assertTrue(router.allow_migrate(AUDIT_ALIAS, "vault", model_name="auditlog"))
+        self.assertTrue(router.allow_migrate(AUDIT_ALIAS, "vault", model_name="useragent"))
+        self.assertTrue(router.allow_migrate(AUDIT_ALIAS, "vault", audit_table=True))
+        self.assertFalse(router.allow_migrate("default", "vault", audit_table=True))
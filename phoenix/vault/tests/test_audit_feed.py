@@ -0,0 +1,122 @@
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import AsyncMock, patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from vault.audit_archive import archive_audit_logs
+from vault.audit_chain import seal_audit_entries, verify_audit_chain
+from vault.audit_rollups import update_audit_rollups
+from vault.models import AuditFeedToken, AuditLog
+
+User = get_user_model()
+
+
+@override_settings(AUDIT_ROLLUP_LAG_SECONDS=60, AUDIT_VIEW_COALESCE_SECONDS=300)
+class AuditFeedTests(TestCase):
+    def setUp(self):
+        self.superuser = User.objects.create_superuser(portal_login="root", password="root-pass-123")
+        self.employee = User.objects.create_user(portal_login="emp.it", role=User.Role.EMPLOYEE)
+        self.client = APIClient()
+        self.hour_ago = timezone.now() - timedelta(hours=1)
+
+    def _log(self, object_id, at=None, actor=None):
+        return AuditLog.objects.create(
+            actor=actor,
+            action=AuditLog.Action.VIEW,
+            object_type="Credential",
+            object_id=object_id,
+            created_at=at or self.hour_ago,
+        )
+
+    def _feed(self, **params):
+        response = self.client.get("/api/audit-logs/feed/", params)
+        if response.status_code != 200:
+            return response, []
+        return response, [json.loads(line) for line in response.content.decode("utf-8").splitlines()]
+
+    def test_batches_follow_the_cursor_and_stop_before_unsettled_entries(self):
+        first = self._log("1", actor=self.employee)
+        second = self._log("2")
+        third = self._log("3")
+        self._log("recent", at=timezone.now())
+        self.client.force_authenticate(user=self.superuser)
+
+        response, lines = self._feed(limit=2)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson; charset=utf-8")
+        self.assertEqual([line["id"] for line in lines], [first.id, second.id])
+        self.assertEqual(lines[0]["actor"], "emp.it")
+        self.assertIsNone(lines[1]["actor"])
+        self.assertEqual(response["X-Audit-Feed-Cursor"], str(second.id))
+
+        response, lines = self._feed(after=response["X-Audit-Feed-Cursor"], limit=2)
+        self.assertEqual([line["object_id"] for line in lines], ["3"])
+        self.assertEqual(response["X-Audit-Feed-Cursor"], str(third.id))
+
+        response, lines = self._feed(after=third.id)
+        self.assertEqual(lines, [])
+        self.assertEqual(response["X-Audit-Feed-Cursor"], str(third.id))
+        self.assertEqual(self._feed(limit=0)[0].status_code, 400)
+
+        self.client.force_authenticate(user=self.employee)
+        self.assertEqual(self._feed()[0].status_code, 403)
+
+    def test_service_token_reads_only_the_feed_until_revoked(self):
+        entry = self._log("1")
+        out = StringIO()
+        call_command("create_audit_feed_token", "siem", stdout=out)
+        key = out.getvalue().splitlines()[-1]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Feed {key}")
+
+        response, lines = self._feed()
+        self.assertEqual([line["id"] for line in lines], [entry.id])
+        self.assertIsNotNone(AuditFeedToken.objects.get(name="siem").last_used_at)
+        self.assertIn(self.client.get("/api/audit-logs/").status_code, (401, 403))
+
+        call_command("create_audit_feed_token", "siem", revoke=True, stdout=StringIO())
+        self.assertEqual(self._feed()[0].status_code, 401)
+
+    def test_caught_up_collector_waits_for_new_entries(self):
+        entry = self._log("1")
+        self.client.force_authenticate(user=self.superuser)
+
+        with (
+            patch("vault.views.feed_batch", side_effect=[[], [entry]]) as batches,
+            patch("vault.views.asyncio.sleep", new_callable=AsyncMock) as sleep,
+        ):
+            response, lines = self._feed(wait=10)
+
+        self.assertEqual([line["id"] for line in lines], [entry.id])
+        self.assertEqual(batches.call_count, 2)
+        sleep.assert_awaited_once()
+        self.assertEqual(self._feed(wait=3600)[0].status_code, 400)
+
+    def test_cursor_behind_archived_entries_resumes_without_gaps(self):
+        old = timezone.now() - timedelta(days=200)
+        first = self._log("1", at=old, actor=self.employee)
+        live = self._log("2")
+        third = self._log("3", at=old)
+        fourth = self._log("4", at=old)
+        seal_audit_entries(checkpoint=True)
+        verify_audit_chain()
+        update_audit_rollups()
+        self.client.force_authenticate(user=self.superuser)
+
+        with tempfile.TemporaryDirectory() as archive_dir, override_settings(AUDIT_ARCHIVE_DIR=archive_dir):
+            archive_audit_logs(timezone.now() - timedelta(days=1))
+            self.assertEqual(list(AuditLog.objects.values_list("id", flat=True)), [live.id])
+
+            response, lines = self._feed(limit=2)
+            self.assertEqual([line["id"] for line in lines], [first.id, live.id])
+            self.assertEqual(lines[0]["actor"], "emp.it")
+            response, lines = self._feed(after=response["X-Audit-Feed-Cursor"], limit=2)
+            self.assertEqual([line["id"] for line in lines], [third.id, fourth.id])
+            response, lines = self._feed(after=response["X-Audit-Feed-Cursor"])
+            self.assertEqual(lines, [])
+            self.assertEqual(response["X-Audit-Feed-Cursor"], str(fourth.id))
@@ -0,0 +1,115 @@
+import tempfile
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from vault.audit_archive import archive_audit_logs
+from vault.audit_chain import seal_audit_entries, verify_audit_chain
+from vault.audit_rollups import rolled_up_through, update_audit_rollups
+from vault.models import AuditLog, AuditRollup, Department
+
+User = get_user_model()
+
+NOW = datetime(2026, 3, 10, 12, 30, tzinfo=dt_timezone.utc)
+
+
+@override_settings(AUDIT_ROLLUP_LAG_SECONDS=60)
+class AuditRollupTests(TestCase):
+    def setUp(self):
+        self.dep_it = Department.objects.create(name="IT")
+        self.dep_hr = Department.objects.create(name="HR")
+        self.superuser = User.objects.create_superuser(portal_login="root", password="root-pass-123")
+        self.head_it = User.objects.create_user(portal_login="head.it", role=User.Role.HEAD, department=self.dep_it)
+        self.employee = User.objects.create_user(
+            portal_login="emp.it",
+            role=User.Role.EMPLOYEE,
+            department=self.dep_it,
+        )
+        self.hr_employee = User.objects.create_user(
+            portal_login="emp.hr",
+            role=User.Role.EMPLOYEE,
+            department=self.dep_hr,
+        )
+
+    def _log(self, actor, action, at, object_type="Credential"):
+        return AuditLog.objects.create(actor=actor, action=action, object_type=object_type, object_id="1", created_at=at)
+
+    def _counts(self, period, **filters):
+        return {
+            (row.bucket, row.action, row.actor_id, row.department_id): row.count
+            for row in AuditRollup.objects.filter(period=period, **filters)
+        }
+
+    def test_new_entries_are_added_to_hourly_and_daily_counts(self):
+        morning = NOW.replace(hour=9, minute=5)
+        self._log(self.employee, AuditLog.Action.VIEW, morning)
+        self._log(self.employee, AuditLog.Action.VIEW, morning + timedelta(minutes=10))
+        self._log(self.hr_employee, AuditLog.Action.LOGIN, morning + timedelta(hours=1))
+        self._log(None, AuditLog.Action.LOGIN, morning)
+
+        self.assertEqual(update_audit_rollups(now=NOW), 4)
+        self.assertEqual(update_audit_rollups(now=NOW), 0)
+
+        hourly = self._counts(AuditRollup.Period.HOUR)
+        self.assertEqual(hourly[(morning.replace(minute=0), "view", self.employee.id, self.dep_it.id)], 2)
+        self.assertEqual(hourly[(morning.replace(hour=10, minute=0), "login", self.hr_employee.id, self.dep_hr.id)], 1)
+        self.assertEqual(hourly[(morning.replace(minute=0), "login", 0, 0)], 1)
+
+        just_now = self._log(self.employee, AuditLog.Action.VIEW, NOW - timedelta(seconds=5))
+        self.assertEqual(update_audit_rollups(now=NOW), 0)
+        self.assertEqual(update_audit_rollups(now=NOW + timedelta(minutes=5)), 1)
+        self.assertEqual(rolled_up_through(), just_now.id)
+
+        daily = self._counts(AuditRollup.Period.DAY, action="view")
+        self.assertEqual(daily, {(NOW.replace(hour=0, minute=0), "view", self.employee.id, self.dep_it.id): 3})
+
+    def test_stats_are_scoped_and_served_from_the_rollups(self):
+        day = timezone.now().replace(hour=9) - timedelta(days=2)
+        self._log(self.head_it, AuditLog.Action.LOGIN, day)
+        self._log(self.employee, AuditLog.Action.VIEW, day)
+        self._log(self.employee, AuditLog.Action.VIEW, day + timedelta(days=1))
+        self._log(self.hr_employee, AuditLog.Action.VIEW, day)
+        call_command("rollup_audit_logs", stdout=StringIO())
+        client = APIClient()
+        params = {"date_from": (day - timedelta(days=1)).date().isoformat()}
+
+        client.force_authenticate(user=self.head_it)
+        with CaptureQueriesContext(connection) as queries:
+            head = client.get("/api/audit-logs/stats/", {**params, "group_by": "action"}).json()
+        client.force_authenticate(user=self.superuser)
+        everyone = client.get("/api/audit-logs/stats/", {**params, "group_by": "department", "action": "view"}).json()
+        client.force_authenticate(user=self.hr_employee)
+        own = client.get("/api/audit-logs/stats/", {**params, "period": "hour"}).json()
+        invalid = client.get("/api/audit-logs/stats/", {"group_by": "ip_address"})
+
+        self.assertNotIn("vault_auditlog", " ".join(query["sql"] for query in queries))
+        self.assertEqual(
+            [(row["action"], row["count"]) for row in head["results"]],
+            [("login", 1), ("view", 1), ("view", 1)],
+        )
+        self.assertEqual(
+            [(row["department_id"], row["count"]) for row in everyone["results"]],
+            [(self.dep_it.id, 1), (self.dep_hr.id, 1), (self.dep_it.id, 1)],
+        )
+        self.assertEqual([row["count"] for row in own["results"]], [1])
+        self.assertEqual(invalid.status_code, 400)
+
+    def test_archive_keeps_entries_not_yet_counted(self):
+        self._log(self.employee, AuditLog.Action.VIEW, NOW - timedelta(days=400))
+        seal_audit_entries(now=NOW, checkpoint=True)
+        verify_audit_chain()
+
+        with tempfile.TemporaryDirectory() as archive_dir:
+            self.assertEqual(archive_audit_logs(NOW, directory=archive_dir), [])
+            update_audit_rollups(now=NOW)
+            self.assertEqual(len(archive_audit_logs(NOW, directory=archive_dir)), 1)
+
+        self.assertFalse(AuditLog.objects.exists())
+        self.assertEqual(AuditRollup.objects.get(period=AuditRollup.Period.DAY).count, 1)
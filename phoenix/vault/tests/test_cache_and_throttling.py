@@ -0,0 +1,75 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache, caches
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+
+from vault.cache import PostgresCache
+from vault.throttling import LoginBurstThrottle
+
+
+class TwoPerMinuteThrottle(LoginBurstThrottle):
+    rate = "2/min"
+
+
+class PostgresCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_default_cache_is_shared_postgres_tier(self):
+        self.assertIsInstance(caches["default"], PostgresCache)
+
+    def test_set_get_add_incr_and_delete(self):
+        cache.set("answer", {"value": 41}, timeout=60)
+        self.assertEqual(cache.get("answer"), {"value": 41})
+        self.assertFalse(cache.add("answer", "other"))
+
+        self.assertTrue(cache.add("counter", 1))
+        self.assertEqual(cache.incr("counter", 4), 5)
+        self.assertEqual(cache.get_many(["answer", "counter", "missing"]), {"answer": {"value": 41}, "counter": 5})
+
+        self.assertTrue(cache.delete("answer"))
+        self.assertIsNone(cache.get("answer"))
+        with self.assertRaises(ValueError):
+            cache.incr("answer")
+
+    def test_expired_entries_are_invisible_and_replaceable(self):
+        cache.set("short", "value", timeout=0)
+        self.assertIsNone(cache.get("short"))
+
+        cache.set("live", "value", timeout=60)
+        cache.set("live", "value", timeout=0)
+        self.assertIsNone(cache.get("live"))
+        cache.set("live", "value", timeout=60)
+        cache.set("live", "value", timeout=-5)
+        self.assertIsNone(cache.get("live"))
+        self.assertFalse(cache.add("live", "other", timeout=0))
+        self.assertIsNone(cache.get("live"))
+        cache.set("live", "value", timeout=60)
+        self.assertFalse(cache.add("live", "other", timeout=0))
+        self.assertEqual(cache.get("live"), "value")
+
+        cache.set("stale", "old", timeout=-1)
+        self.assertFalse(cache.has_key("stale"))
+        self.assertTrue(cache.add("stale", "new", timeout=60))
+        self.assertEqual(cache.get("stale"), "new")
+
+
+class TokenBucketThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+
+    def _allow(self, throttle):
+        request = self.factory.post("/api/auth/login/", REMOTE_ADDR="10.0.0.7")
+        request.user = AnonymousUser()
+        return throttle.allow_request(request, view=None)
+
+    def test_bucket_is_shared_between_worker_instances(self):
+        worker_a = TwoPerMinuteThrottle()
+        worker_b = TwoPerMinuteThrottle()
+
+        self.assertTrue(self._allow(worker_a))
+        self.assertTrue(self._allow(worker_b))
+        self.assertFalse(self._allow(worker_a))
+        self.assertGreater(worker_a.wait(), 0)
+        self.assertLessEqual(worker_a.wait(), 30)
@@ -0,0 +1,148 @@
+import base64
+import json
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from vault import encryption
+from vault.models import AuditLog, Credential, CredentialVersion, Department, EmailOutbox, Service, ServiceAccess
+
+User = get_user_model()
+
+
+class CredentialBulkCreateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.dep_it = Department.objects.create(name="IT")
+        self.dep_mkt = Department.objects.create(name="Marketing")
+        self.head_it = User.objects.create_user(
+            portal_login="head.it",
+            role=User.Role.HEAD,
+            department=self.dep_it,
+        )
+        self.employees = [
+            User.objects.create_user(
+                portal_login=f"emp{index}.it",
+                role=User.Role.EMPLOYEE,
+                department=self.dep_it,
+                email=f"emp{index}@example.com",
+            )
+            for index in range(3)
+        ]
+        self.emp_mkt = User.objects.create_user(
+            portal_login="emp.mkt",
+            role=User.Role.EMPLOYEE,
+            department=self.dep_mkt,
+        )
+        self.services = [
+            Service.objects.create(name=f"Service {index}", url=f"https://s{index}.local", department=self.dep_it)
+            for index in range(2)
+        ]
+
+    def _items(self):
+        return [
+            {
+                "user": employee.id,
+                "service": service.id,
+                "login": f"{employee.portal_login}@{service.id}",
+                "password": f"secret-{employee.id}-{service.id}",
+            }
+            for employee in self.employees
+            for service in self.services
+        ]
+
+    @override_settings(EMAIL_NOTIFICATIONS_ENABLED=True)
+    def test_head_provisions_team_in_constant_number_of_queries(self):
+        ServiceAccess.objects.create(user=self.employees[0], service=self.services[0], is_active=False)
+        self.client.force_authenticate(user=self.head_it)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post("/api/credentials/bulk/", {"items": self._items()}, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["created"], 6)
+        self.assertLessEqual(len(queries), 15)
+
+        credential = Credential.objects.get(user=self.employees[1], service=self.services[1])
+        self.assertEqual(credential.password, f"secret-{self.employees[1].id}-{self.services[1].id}")
+        self.assertEqual(ServiceAccess.objects.filter(is_active=True).count(), 6)
+        self.assertTrue(ServiceAccess.objects.get(user=self.employees[0], service=self.services[0]).is_active)
+        version = CredentialVersion.objects.get(credential=credential)
+        self.assertEqual((version.version, version.change_type), (1, CredentialVersion.ChangeType.CREATE))
+        self.assertEqual(version.password, credential.password)
+        self.assertEqual(
+            AuditLog.objects.filter(action=AuditLog.Action.CREATE, object_type="Credential").count(),
+            6,
+        )
+        self.assertEqual(EmailOutbox.objects.count(), 3)
+        self.assertIn("Service 0, Service 1", EmailOutbox.objects.first().body)
+
+    def test_invalid_items_reject_whole_batch_with_per_item_errors(self):
+        Credential.objects.create(user=self.employees[0], service=self.services[0], login="x", password="y")
+        self.client.force_authenticate(user=self.head_it)
+        items = [
+            {"user": self.employees[0].id, "service": self.services[0].id, "login": "dup", "password": "p"},
+            {"user": self.emp_mkt.id, "service": self.services[0].id, "login": "foreign", "password": "p"},
+            {"user": self.employees[1].id, "service": 999999, "login": "missing", "password": "p"},
+            {"user": self.employees[1].id, "service": self.services[1].id, "login": "", "password": "p"},
+            {"user": self.employees[2].id, "service": self.services[1].id, "login": "ok", "password": "p"},
+        ]
+
+        response = self.client.post("/api/credentials/bulk/", {"items": items}, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["items"]
+        self.assertIn("service", errors[2])
+        self.assertIn("login", errors[3])
+        self.assertEqual(errors[4], {})
+        self.assertEqual(Credential.objects.count(), 1)
+
+        response = self.client.post("/api/credentials/bulk/", {"items": [items[0], items[1], items[4]]}, format="json")
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()["items"]
+        self.assertIn("unique", errors[0]["non_field_errors"][0])
+        self.assertIn("department", errors[1]["non_field_errors"][0])
+        self.assertEqual(Credential.objects.count(), 1)
+
+    def test_employee_cannot_use_bulk_endpoint(self):
+        self.client.force_authenticate(user=self.employees[0])
+        response = self.client.post("/api/credentials/bulk/", {"items": self._items()}, format="json")
+        self.assertEqual(response.status_code, 403)
+
+
+class BatchEncryptionTests(TestCase):
+    def setUp(self):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        settings_override = override_settings(
+            ASYMMETRIC_PUBLIC_KEY=private_key.public_key()
+            .public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+            .decode(),
+            ASYMMETRIC_PRIVATE_KEY=private_key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            ).decode(),
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        for loader in (encryption.get_public_key, encryption.get_private_key):
+            loader.cache_clear()
+            self.addCleanup(loader.cache_clear)
+
+    def test_batch_shares_one_wrapped_key_and_round_trips(self):
+        sealed = encryption.batch_encrypt_asymmetric(["one", "two"])
+
+        self.assertTrue(all(value.startswith(encryption.ASYM_V1_PREFIX) for value in sealed))
+        self.assertNotEqual(sealed[0], sealed[1])
+        payloads = [
+            json.loads(base64.urlsafe_b64decode(value[len(encryption.ASYM_V1_PREFIX) :]))
+            for value in sealed
+        ]
+        self.assertEqual(payloads[0]["ek"], payloads[1]["ek"])
+        self.assertEqual([encryption.decrypt_value(value) for value in sealed], ["one", "two"])
+        self.assertEqual(encryption.encrypt_value(sealed[0]), sealed[0])
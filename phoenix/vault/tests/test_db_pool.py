@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, connections
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+
+def _pooled_settings(**overrides):
+    settings_dict = {
+        **connection.settings_dict,
+        "CONN_MAX_AGE": 0,
+        "OPTIONS": {**connection.settings_dict["OPTIONS"], "pool": {"min_size": 1, "max_size": 1, "timeout": 5}},
+    }
+    settings_dict.update(overrides)
+    return settings_dict
+
+
+class ConnectionPoolTests(TestCase):
+    def _pooled_connection(self, **overrides):
+        connections.settings["pool_test"] = _pooled_settings(**overrides)
+        self.addCleanup(connections.settings.pop, "pool_test")
+        wrapper = connections["pool_test"]
+        self.addCleanup(connections.__delitem__, "pool_test")
+        self.addCleanup(wrapper.close_pool)
+        return wrapper
+
+    def test_closed_connections_go_back_to_the_pool(self):
+        wrapper = self._pooled_connection()
+
+        backend_pids = []
+        for _ in range(2):
+            with wrapper.cursor() as cursor:
+                cursor.execute("SELECT pg_backend_pid()")
+                backend_pids.append(cursor.fetchone()[0])
+            wrapper.close()
+
+        self.assertEqual(backend_pids[0], backend_pids[1])
+        stats = wrapper.pool_stats()
+        self.assertEqual(stats["requests_num"], 2)
+        self.assertEqual(stats["pool_available"], stats["pool_size"])
+
+    def test_pool_rejects_persistent_connections(self):
+        wrapper = self._pooled_connection(CONN_MAX_AGE=60)
+
+        with self.assertRaises(ImproperlyConfigured):
+            wrapper.pool_stats()
+
+    def test_ready_check_reports_pool_stats(self):
+        client = APIClient()
+        unpooled_options = {key: value for key, value in connection.settings_dict["OPTIONS"].items() if key != "pool"}
+        with patch.dict(connection.settings_dict, {"OPTIONS": unpooled_options}):
+            self.assertNotIn("database_pool", client.get("/api/health/ready/").json())
+
+        with patch.dict(connection.settings_dict, _pooled_settings()):
+            self.addCleanup(connection.close_pool)
+            response = client.get("/api/health/ready/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("pool_available", response.json()["database_pool"])
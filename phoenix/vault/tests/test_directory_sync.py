@@ -0,0 +1,141 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from vault.models import AuditLog, Credential, CredentialVersion, Department, Service, ServiceAccess
+
+User = get_user_model()
+
+
+class DirectorySyncTests(TestCase):
+    def _write(self, suffix, content):
+        with tempfile.NamedTemporaryFile("w", suffix=suffix, encoding="utf-8", delete=False) as handle:
+            handle.write(content)
+        self.addCleanup(os.remove, handle.name)
+        return handle.name
+
+    def _sync(self, **files):
+        stdout, stderr = StringIO(), StringIO()
+        call_command("sync_directory", stdout=stdout, stderr=stderr, **files)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_nightly_snapshot_only_touches_changed_rows(self):
+        departments = self._write(".csv", "name,sort_order\nIT,1\nSales,2\n")
+        users = self._write(
+            ".csv",
+            "portal_login,full_name,email,role,department\n"
+            "ann,Ann,ann@example.com,head,IT\n"
+            "bob,Bob,bob@example.com,employee,IT\n"
+            "cat,Cat,,employee,Sales\n"
+            "ghost,Ghost,,employee,Nowhere\n",
+        )
+        local = User.objects.create_user(portal_login="local", role=User.Role.EMPLOYEE)
+
+        output, errors = self._sync(departments=departments, users=users)
+        self.assertIn("Departments: created 2, updated 0, unchanged 0, deactivated 0, rejected 0", output)
+        self.assertIn("Users: created 3, updated 0, unchanged 0, deactivated 0, rejected 1", output)
+        self.assertIn("Row 5", errors)
+        self.assertEqual(User.objects.get(portal_login="ann").role, User.Role.HEAD)
+        self.assertTrue(User.objects.get(portal_login="bob").auth_token.key)
+
+        audit_count = AuditLog.objects.count()
+        with self.assertNumQueries(3):
+            output, _ = self._sync(departments=departments, users=users)
+        self.assertIn("Users: created 0, updated 0, unchanged 3, deactivated 0", output)
+        self.assertEqual(AuditLog.objects.count(), audit_count)
+
+        users_jsonl = self._write(
+            ".jsonl",
+            "\n".join(
+                json.dumps(row)
+                for row in (
+                    {"portal_login": "ann", "full_name": "Ann", "email": "ann@example.com", "role": "head",
+                     "department": "IT"},
+                    {"portal_login": "bob", "full_name": "Robert", "email": "bob@example.com",
+                     "department": "Sales", "is_active": True},
+                )
+            ),
+        )
+        output, _ = self._sync(users=users_jsonl)
+        self.assertIn("Users: created 0, updated 1, unchanged 1, deactivated 1", output)
+        bob = User.objects.get(portal_login="bob")
+        self.assertEqual((bob.full_name, bob.department.name), ("Robert", "Sales"))
+        cat = User.objects.get(portal_login="cat")
+        self.assertFalse(cat.is_active)
+        self.assertEqual(cat.directory_fingerprint, "")
+        local.refresh_from_db()
+        self.assertTrue(local.is_active)
+
+        output, _ = self._sync(departments=self._write(".csv", "name,sort_order\nIT,5\n"))
+        self.assertIn("Departments: created 0, updated 1, unchanged 0, deactivated 1", output)
+        self.assertFalse(Department.objects.get(name="Sales").is_active)
+
+    def test_dry_run_reports_without_saving(self):
+        users = self._write(".csv", "portal_login,department\nann,IT\n")
+        Department.objects.create(name="IT")
+
+        output, _ = self._sync(users=users, dry_run=True)
+
+        self.assertIn("Users: created 1", output)
+        self.assertFalse(User.objects.filter(portal_login="ann").exists())
+
+    def test_rejected_or_empty_snapshot_does_not_offboard(self):
+        Department.objects.create(name="IT")
+        self._sync(
+            users=self._write(".csv", "portal_login,email,department\nann,ann@example.com,IT\nbob,,IT\n"),
+            departments=self._write(".csv", "name,sort_order\nIT,1\nSales,2\n"),
+        )
+
+        output, errors = self._sync(
+            users=self._write(".csv", "portal_login,email,department\nann,not-an-email,IT\nbob,,IT\n"),
+            departments=self._write(".csv", "name,sort_order\nIT,1\nSales,x\n"),
+        )
+        self.assertIn("Users: created 0, updated 0, unchanged 1, deactivated 0, rejected 1", output)
+        self.assertIn("Departments: created 0, updated 0, unchanged 1, deactivated 0, rejected 1", output)
+        self.assertTrue(User.objects.get(portal_login="ann").is_active)
+        self.assertTrue(Department.objects.get(name="Sales").is_active)
+
+        empty = self._write(".csv", "portal_login,email,department\n")
+        output, _ = self._sync(users=empty)
+        self.assertIn("Users: snapshot has rejected rows or is empty, deactivation skipped", output)
+        self.assertEqual(User.objects.filter(is_active=True).count(), 2)
+
+        output, _ = self._sync(users=self._write(".csv", "portal_login,department\nbob,IT\nbob,IT\n"), force=True)
+        self.assertIn("deactivated 1, rejected 1", output)
+        self.assertFalse(User.objects.get(portal_login="ann").is_active)
+
+    def test_rows_switched_off_go_through_offboarding(self):
+        departments = self._write(".csv", "name,sort_order\nIT,1\nSales,2\n")
+        self._sync(
+            departments=departments,
+            users=self._write(".csv", "portal_login,department\nann,IT\nbob,Sales\n"),
+        )
+        ann, bob = User.objects.get(portal_login="ann"), User.objects.get(portal_login="bob")
+        it, sales = Department.objects.get(name="IT"), Department.objects.get(name="Sales")
+        mail = Service.objects.create(name="Mail", url="https://mail.local", department=it)
+        crm = Service.objects.create(name="CRM", url="https://crm.local", department=sales)
+        ann_mail = Credential.objects.create(user=ann, service=mail, login="ann", password="secret")
+        bob_crm = Credential.objects.create(user=bob, service=crm, login="bob", password="secret")
+
+        output, _ = self._sync(
+            departments=self._write(".csv", "name,sort_order,is_active\nIT,1,true\nSales,2,false\n"),
+            users=self._write(".csv", "portal_login,department,is_active\nann,IT,false\nbob,Sales,true\n"),
+        )
+
+        self.assertIn("Users: created 0, updated 1", output)
+        ann_mail.refresh_from_db()
+        self.assertFalse(ann_mail.is_active)
+        self.assertFalse(ServiceAccess.objects.get(user=ann).is_active)
+        disabled = CredentialVersion.objects.filter(change_type=CredentialVersion.ChangeType.DISABLE)
+        self.assertTrue(disabled.filter(credential=ann_mail).exists())
+        self.assertFalse(User.objects.get(pk=ann.pk).is_active)
+        bob_crm.refresh_from_db()
+        self.assertFalse(bob_crm.is_active)
+        self.assertFalse(Service.objects.get(pk=crm.pk).is_active)
+        self.assertFalse(Department.objects.get(name="Sales").is_active)
+        self.assertEqual(AuditLog.objects.filter(action=AuditLog.Action.DISABLE, object_type="Department").count(), 1)
@@ -0,0 +1,118 @@
+import socketserver
+import threading
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from vault.models import EmailOutbox
+from vault.notifications import dispatch_email_outbox, send_platform_email
+
+
+class _SMTPStandInHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: records messages, refuses *bounce* recipients."""
+
+    def _reply(self, line):
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        self.server.connections += 1
+        self._reply("220 stand-in ESMTP")
+        data_lines = None
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            if data_lines is not None:
+                if line.rstrip(b"\r\n") == b".":
+                    self.server.messages.append(b"".join(data_lines).decode("utf-8", "replace"))
+                    data_lines = None
+                    self._reply("250 queued")
+                else:
+                    data_lines.append(line)
+                continue
+
+            command = line.strip().decode("ascii", "replace")
+            verb = command.split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                self._reply("250 stand-in")
+            elif verb == "RCPT" and "bounce" in command.lower():
+                self._reply("550 mailbox unavailable")
+            elif verb == "DATA":
+                data_lines = []
+                self._reply("354 end with .")
+            elif verb == "QUIT":
+                self._reply("221 bye")
+                return
+            else:
+                self._reply("250 ok")
+
+
+class _SMTPStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SMTPStandInHandler)
+        self.connections = 0
+        self.messages = []
+
+
+class EmailOutboxDispatcherTests(TestCase):
+    def setUp(self):
+        self.smtp = _SMTPStandIn()
+        thread = threading.Thread(target=self.smtp.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.smtp.server_close)
+        self.addCleanup(self.smtp.shutdown)
+
+        settings_override = override_settings(
+            EMAIL_NOTIFICATIONS_ENABLED=True,
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=self.smtp.server_address[1],
+            EMAIL_HOST_USER="",
+            EMAIL_HOST_PASSWORD="",
+            EMAIL_USE_TLS=False,
+            EMAIL_USE_SSL=False,
+            EMAIL_OUTBOX_MAX_ATTEMPTS=2,
+            EMAIL_OUTBOX_BACKOFF_SECONDS=60,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_batch_is_delivered_over_one_smtp_connection(self):
+        for index in range(3):
+            send_platform_email(f"Subject {index}", f"Body {index}", [f"user{index}@example.com"])
+
+        call_command("run_outbox_dispatcher", once=True, batch_size=10, stdout=StringIO())
+
+        self.assertEqual(self.smtp.connections, 1)
+        self.assertEqual(len(self.smtp.messages), 3)
+        self.assertIn("Body 2", self.smtp.messages[2])
+        self.assertEqual(EmailOutbox.objects.filter(status=EmailOutbox.Status.SENT).count(), 3)
+
+    def test_failed_delivery_backs_off_then_dead_letters(self):
+        good = send_platform_email("Good", "Body", ["ok@example.com"])
+        bad = send_platform_email("Bad", "Body", ["bounce@example.com"])
+
+        first = dispatch_email_outbox()
+        self.assertEqual((first.sent, first.retried, first.dead), (1, 1, 0))
+        bad.refresh_from_db()
+        self.assertEqual(bad.status, EmailOutbox.Status.PENDING)
+        self.assertEqual(bad.attempts, 1)
+        self.assertGreater(bad.next_attempt_at, timezone.now() + timedelta(seconds=50))
+        self.assertIn("550", bad.last_error)
+
+        self.assertEqual(dispatch_email_outbox().processed, 0)
+
+        EmailOutbox.objects.filter(pk=bad.pk).update(next_attempt_at=timezone.now())
+        second = dispatch_email_outbox()
+        self.assertEqual(second.dead, 1)
+        bad.refresh_from_db()
+        good.refresh_from_db()
+        self.assertEqual(bad.status, EmailOutbox.Status.DEAD)
+        self.assertEqual(good.status, EmailOutbox.Status.SENT)
+        self.assertEqual(len(self.smtp.messages), 1)
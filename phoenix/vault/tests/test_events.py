@@ -0,0 +1,73 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TransactionTestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from vault.models import AccessRequest, Department, Service
+
+User = get_user_model()
+
+
+class EventStreamTests(TransactionTestCase):
+    def setUp(self):
+        self.dep_it = Department.objects.create(name="IT")
+        self.head_it = User.objects.create_user(
+            portal_login="head.it",
+            role=User.Role.HEAD,
+            department=self.dep_it,
+        )
+        self.employee = User.objects.create_user(
+            portal_login="emp.it",
+            role=User.Role.EMPLOYEE,
+            department=self.dep_it,
+        )
+        self.service = Service.objects.create(name="GitLab", url="https://gitlab.local", department=self.dep_it)
+
+    def _post(self, user, url, data=None):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.post(url, data or {}, format="json")
+        self.assertIn(response.status_code, (200, 201), response.content)
+        return response.json()
+
+    async def _open_stream(self, user):
+        token = await sync_to_async(lambda: Token.objects.get(user=user).key)()
+        response = await AsyncClient().get("/api/events/", headers={"Authorization": f"Token {token}"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = response.streaming_content
+        self.assertEqual(await anext(stream), b"retry: 3000\n\n")
+        return stream
+
+    async def test_reviewers_and_requester_receive_pushed_events(self):
+        head_stream = await self._open_stream(self.head_it)
+        employee_stream = await self._open_stream(self.employee)
+        try:
+            created = await sync_to_async(self._post)(
+                self.employee, "/api/access-requests/", {"service_id": self.service.id}
+            )
+            chunk = await asyncio.wait_for(anext(head_stream), timeout=5)
+            self.assertIn(b"event: access_request.created\n", chunk)
+            self.assertIn(f'"id": {created["id"]}'.encode(), chunk)
+
+            await sync_to_async(self._post)(self.head_it, f"/api/access-requests/{created['id']}/approve/")
+            chunk = await asyncio.wait_for(anext(employee_stream), timeout=5)
+            self.assertIn(b"event: access_request.approved\n", chunk)
+            self.assertIn(f'"status": "{AccessRequest.Status.APPROVED}"'.encode(), chunk)
+        finally:
+            await head_stream.aclose()
+            await employee_stream.aclose()
+
+    async def test_stream_requires_token(self):
+        response = await AsyncClient().get("/api/events/")
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_stream_is_not_served_over_wsgi(self):
+        client = APIClient()
+        client.force_authenticate(user=self.employee)
+
+        self.assertEqual(client.get("/api/events/").status_code, 503)
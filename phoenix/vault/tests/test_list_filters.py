@@ -0,0 +1,136 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from vault.models import AccessRequest, Credential, Department, Service
+
+User = get_user_model()
+
+
+class ListFilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.superuser = User.objects.create_superuser(
+            portal_login="root",
+            password="root-pass-123",
+        )
+        self.dep_it = Department.objects.create(name="IT")
+        self.dep_fin = Department.objects.create(name="Finance")
+        self.head_it = User.objects.create_user(
+            portal_login="head.it",
+            role=User.Role.HEAD,
+            department=self.dep_it,
+        )
+        self.alice = User.objects.create_user(
+            portal_login="alice",
+            role=User.Role.EMPLOYEE,
+            department=self.dep_it,
+        )
+        self.bob = User.objects.create_user(
+            portal_login="bob",
+            role=User.Role.EMPLOYEE,
+            department=self.dep_fin,
+            is_active=False,
+        )
+        self.gitlab = Service.objects.create(name="GitLab", url="https://gitlab.local", department=self.dep_it)
+        self.vpn = Service.objects.create(name="VPN", url="https://vpn.local", department=self.dep_it)
+        self.alice_gitlab = Credential.objects.create(
+            user=self.alice,
+            service=self.gitlab,
+            login="alice",
+            password="secret",
+        )
+        self.alice_vpn = Credential.objects.create(
+            user=self.alice,
+            service=self.vpn,
+            secret_type=Credential.SecretType.API_TOKEN,
+            login="api-token",
+            password="token",
+            is_active=False,
+        )
+        self.bob_gitlab = Credential.objects.create(user=self.bob, service=self.gitlab, login="bob", password="s")
+        Credential.objects.filter(pk=self.bob_gitlab.pk).update(updated_at=timezone.now() - timedelta(days=10))
+        self.client.force_authenticate(user=self.superuser)
+
+    def _ids(self, url, params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [item["id"] for item in response.json()]
+
+    def test_credential_filters_and_ordering(self):
+        url = "/api/credentials/"
+        self.assertEqual(
+            self._ids(url, {"service": self.gitlab.id, "ordering": "-user"}),
+            [self.bob_gitlab.id, self.alice_gitlab.id],
+        )
+        self.assertEqual(self._ids(url, {"department": self.dep_fin.id}), [self.bob_gitlab.id])
+        self.assertEqual(self._ids(url, {"secret_type": "api_token"}), [self.alice_vpn.id])
+        self.assertEqual(
+            self._ids(url, {"is_active": "true", "ordering": "user"}),
+            [self.alice_gitlab.id, self.bob_gitlab.id],
+        )
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        self.assertEqual(
+            self._ids(url, {"updated_since": since, "ordering": "service"}),
+            [self.alice_gitlab.id, self.alice_vpn.id],
+        )
+
+    def test_head_filters_stay_inside_visibility_scope(self):
+        self.client.force_authenticate(user=self.head_it)
+        self.assertEqual(self._ids("/api/credentials/", {"department": self.dep_fin.id}), [])
+        self.assertEqual(self._ids("/api/users/", {"department": self.dep_fin.id}), [])
+
+    def test_limit_returns_a_page_only_when_requested(self):
+        response = self.client.get("/api/credentials/", {"limit": 2, "ordering": "created_at"})
+
+        payload = response.json()
+        self.assertEqual(payload["count"], 3)
+        self.assertEqual([item["id"] for item in payload["results"]], [self.alice_gitlab.id, self.alice_vpn.id])
+        self.assertIsNotNone(payload["next"])
+        self.assertIsInstance(self.client.get("/api/credentials/").json(), list)
+
+    def test_access_request_filters(self):
+        pending = AccessRequest.objects.create(requester=self.alice, service=self.vpn)
+        approved = AccessRequest.objects.create(
+            requester=self.bob,
+            service=self.gitlab,
+            status=AccessRequest.Status.APPROVED,
+        )
+        AccessRequest.objects.filter(pk=approved.pk).update(requested_at=timezone.now() - timedelta(days=5))
+        url = "/api/access-requests/"
+
+        self.assertEqual(self._ids(url, {"status": "pending"}), [pending.id])
+        self.assertEqual(self._ids(url, {"service": self.gitlab.id}), [approved.id])
+        self.assertEqual(self._ids(url, {"department": self.dep_it.id}), [pending.id])
+        self.assertEqual(
+            self._ids(url, {"date_to": (timezone.now() - timedelta(days=1)).date().isoformat()}),
+            [approved.id],
+        )
+        self.assertEqual(self._ids(url, {"ordering": "requested_at"}), [approved.id, pending.id])
+
+    def test_user_filters(self):
+        url = "/api/users/"
+        self.assertEqual(self._ids(url, {"role": "employee", "is_active": "true"}), [self.alice.id])
+        self.assertEqual(
+            self._ids(url, {"department": self.dep_it.id, "ordering": "-portal_login"}),
+            [self.head_it.id, self.alice.id],
+        )
+        self.assertEqual(self._ids(url, {"is_active": "false"}), [self.bob.id])
+
+    def test_invalid_filters_are_rejected(self):
+        cases = [
+            ("/api/credentials/", {"service": "abc"}, "service"),
+            ("/api/credentials/", {"secret_type": "pgp"}, "secret_type"),
+            ("/api/credentials/", {"updated_since": "yesterday"}, "updated_since"),
+            ("/api/credentials/", {"ordering": "password"}, "ordering"),
+            ("/api/access-requests/", {"status": "done"}, "status"),
+            ("/api/users/", {"is_active": "maybe"}, "is_active"),
+        ]
+        for url, params, field in cases:
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(field, response.json())
@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from vault.models import (
+    AccessRequest,
+    AuditLog,
+    Credential,
+    CredentialVersion,
+    Department,
+    DepartmentShare,
+    EmailOutbox,
+    Service,
+    ServiceAccess,
+)
+
+User = get_user_model()
+
+
+@override_settings(EMAIL_NOTIFICATIONS_ENABLED=True)
+class OffboardingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.superuser = User.objects.create_superuser(
+            portal_login="root",
+            password="root-pass-123",
+            email="root@example.com",
+        )
+        self.dep_it = Department.objects.create(name="IT")
+        self.dep_ops = Department.objects.create(name="Ops")
+        self.head_it = User.objects.create_user(
+            portal_login="head.it",
+            role=User.Role.HEAD,
+            department=self.dep_it,
+            email="head@example.com",
+        )
+        self.leaver = User.objects.create_user(
+            portal_login="leaver",
+            role=User.Role.EMPLOYEE,
+            department=self.dep_it,
+            email="leaver@example.com",
+        )
+        self.ops_user = User.objects.create_user(
+            portal_login="ops.user",
+            role=User.Role.EMPLOYEE,
+            department=self.dep_ops,
+        )
+        self.it_services = [
+            Service.objects.create(name=f"IT {index}", url=f"https://it{index}.local", department=self.dep_it)
+            for index in range(3)
+        ]
+        self.ops_service = Service.objects.create(name="Ops", url="https://ops.local", department=self.dep_ops)
+        for service in self.it_services:
+            Credential.objects.create(user=self.leaver, service=service, login="leaver", password="secret")
+        self.ops_credential = Credential.objects.create(
+            user=self.ops_user,
+            service=self.it_services[0],
+            login="ops",
+            password="ops-secret",
+        )
+        CredentialVersion.objects.create(
+            credential=self.ops_credential,
+            version=4,
+            login="ops",
+            password="old",
+            change_type=CredentialVersion.ChangeType.UPDATE,
+        )
+        Credential.objects.create(user=self.ops_user, service=self.ops_service, login="ops", password="keep")
+        AccessRequest.objects.create(requester=self.leaver, service=self.ops_service)
+        DepartmentShare.objects.create(
+            department=self.dep_ops,
+            grantor=self.superuser,
+            grantee=self.head_it,
+            expires_at=timezone.now() + timedelta(days=1),
+        )
+
+    def test_user_offboarding_cascades_in_one_pass(self):
+        self.client.force_authenticate(user=self.head_it)
+
+        with self.assertNumQueries(16):
+            response = self.client.delete(f"/api/users/{self.leaver.id}/")
+
+        self.assertEqual(response.status_code, 204)
+        self.leaver.refresh_from_db()
+        self.assertFalse(self.leaver.is_active)
+        self.assertFalse(Token.objects.filter(user=self.leaver).exists())
+        self.assertFalse(Credential.objects.filter(user=self.leaver, is_active=True).exists())
+        self.assertFalse(ServiceAccess.objects.filter(user=self.leaver, is_active=True).exists())
+        self.assertEqual(
+            CredentialVersion.objects.filter(
+                credential__user=self.leaver,
+                change_type=CredentialVersion.ChangeType.DISABLE,
+                is_active=False,
+            ).count(),
+            3,
+        )
+        self.assertEqual(
+            AccessRequest.objects.get(requester=self.leaver).status,
+            AccessRequest.Status.CANCELED,
+        )
+        self.assertTrue(Credential.objects.get(pk=self.ops_credential.pk).is_active)
+        self.assertEqual(
+            AuditLog.objects.filter(action=AuditLog.Action.DISABLE, metadata__offboarding=True).count(),
+            4,
+        )
+        summary = EmailOutbox.objects.get()
+        self.assertEqual(summary.recipients, ["head@example.com", "root@example.com"])
+        self.assertIn("Учетных данных отключено: 3", summary.body)
+
+    def test_department_offboarding_disables_users_services_and_their_credentials(self):
+        self.client.force_authenticate(user=self.superuser)
+
+        response = self.client.delete(f"/api/departments/{self.dep_it.id}/")
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Department.objects.get(pk=self.dep_it.pk).is_active)
+        self.assertFalse(User.objects.filter(department=self.dep_it, is_active=True).exists())
+        self.assertFalse(Service.objects.filter(department=self.dep_it, is_active=True).exists())
+        ops_credential = Credential.objects.get(pk=self.ops_credential.pk)
+        self.assertFalse(ops_credential.is_active)
+        latest = ops_credential.versions.order_by("-version").first()
+        self.assertEqual((latest.version, latest.change_type), (5, CredentialVersion.ChangeType.DISABLE))
+        self.assertEqual(latest.password, "ops-secret")
+        self.assertTrue(Credential.objects.get(service=self.ops_service).is_active)
+        self.assertFalse(DepartmentShare.objects.get().is_active)
+        self.assertEqual(EmailOutbox.objects.count(), 1)
@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, connections, router, transaction
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from vault.models import AuditLog, Department, Service
+from vault.replica import REPLICA_ALIAS, _read_alias
+
+User = get_user_model()
+
+
+class ReplicaRoutingTests(TransactionTestCase):
+    """The stand-in replica is a second connection to the test database."""
+
+    databases = {"default", REPLICA_ALIAS} if REPLICA_ALIAS in settings.DATABASES else {"default"}
+
+    def setUp(self):
+        configured = connections.settings.get(REPLICA_ALIAS)
+        connections.settings[REPLICA_ALIAS] = {**connection.settings_dict}
+        if configured is None:
+            self.addCleanup(connections.settings.pop, REPLICA_ALIAS)
+        else:
+            self.addCleanup(connections.settings.__setitem__, REPLICA_ALIAS, configured)
+        self.addCleanup(connections.__delitem__, REPLICA_ALIAS)
+        self.addCleanup(lambda: connections[REPLICA_ALIAS].close())
+        self.addCleanup(cache.clear)
+
+        self.dep_it = Department.objects.create(name="IT")
+        self.head_it = User.objects.create_user(
+            portal_login="head.it",
+            role=User.Role.HEAD,
+            department=self.dep_it,
+        )
+        Service.objects.create(name="GitLab", url="https://gitlab.local", department=self.dep_it)
+        AuditLog.objects.create(actor=self.head_it, action=AuditLog.Action.LOGIN, object_type="User")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.head_it)
+
+    def _get(self, url):
+        with CaptureQueriesContext(connections[REPLICA_ALIAS]) as replica, CaptureQueriesContext(connection) as primary:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response, " ".join(q["sql"] for q in replica), " ".join(q["sql"] for q in primary)
+
+    def test_audit_and_catalog_reads_use_the_replica(self):
+        response, replica_sql, primary_sql = self._get("/api/audit-logs/")
+        self.assertEqual(len(response.json()), 1)
+        self.assertIn("vault_auditlog", replica_sql)
+        self.assertNotIn("vault_auditlog", primary_sql)
+
+        _, replica_sql, primary_sql = self._get("/api/services/")
+        self.assertIn("vault_service", replica_sql)
+        self.assertNotIn("vault_service", primary_sql)
+
+    def test_other_endpoints_stay_on_the_primary(self):
+        _, replica_sql, primary_sql = self._get("/api/credentials/")
+
+        self.assertEqual(replica_sql, "")
+        self.assertIn("vault_credential", primary_sql)
+
+    def test_writer_reads_from_the_primary_after_writing(self):
+        response = self.client.post(
+            "/api/services/",
+            {"name": "VPN", "url": "https://vpn.local", "department": self.dep_it.id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+
+        response, replica_sql, primary_sql = self._get("/api/services/")
+
+        self.assertIn("VPN", [item["name"] for item in response.json()])
+        self.assertNotIn("vault_service", replica_sql)
+        self.assertIn("vault_service", primary_sql)
+
+    def test_transactions_never_read_from_the_replica(self):
+        marker = _read_alias.set(REPLICA_ALIAS)
+        self.addCleanup(_read_alias.reset, marker)
+
+        self.assertEqual(router.db_for_read(Service), REPLICA_ALIAS)
+        self.assertEqual(router.db_for_write(Service), "default")
+        with transaction.atomic():
+            self.assertEqual(router.db_for_read(Service), "default")
@@ -0,0 +1,114 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from vault.models import Credential, Department, Service, ServiceAccess
+
+User = get_user_model()
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.superuser = User.objects.create_superuser(
+            portal_login="root",
+            password="root-pass-123",
+        )
+        self.dep_it = Department.objects.create(name="IT")
+        self.dep_fin = Department.objects.create(name="Finance")
+        self.head_it = User.objects.create_user(
+            portal_login="head.it",
+            full_name="Irina Head",
+            role=User.Role.HEAD,
+            department=self.dep_it,
+        )
+        self.employee = User.objects.create_user(
+            portal_login="ivan.petrov",
+            full_name="Ivan Petrov",
+            role=User.Role.EMPLOYEE,
+            department=self.dep_it,
+        )
+        self.finance_employee = User.objects.create_user(
+            portal_login="ivan.fin",
+            full_name="Ivan Finance",
+            role=User.Role.EMPLOYEE,
+            department=self.dep_fin,
+        )
+        self.gitlab = Service.objects.create(name="GitLab", url="https://gitlab.local", department=self.dep_it)
+        self.grafana = Service.objects.create(
+            name="Grafana dashboards",
+            url="https://grafana.local",
+            department=self.dep_it,
+        )
+        self.billing = Service.objects.create(name="Billing", url="https://billing.local", department=self.dep_fin)
+        for service in (self.gitlab, self.grafana):
+            ServiceAccess.objects.create(user=self.employee, service=service)
+        self.gitlab_credential = Credential.objects.create(
+            user=self.employee,
+            service=self.gitlab,
+            login="ivan",
+            password="secret",
+            notes="deploy token for runners",
+        )
+        self.grafana_credential = Credential.objects.create(
+            user=self.employee,
+            service=self.grafana,
+            login="viewer",
+            password="secret",
+        )
+        Credential.objects.create(
+            user=self.finance_employee,
+            service=self.billing,
+            login="ivan",
+            password="secret",
+            notes="deploy token",
+        )
+
+    def _ids(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return [item["id"] for item in response.json()]
+
+    def test_service_search_matches_word_prefixes(self):
+        self.client.force_authenticate(user=self.superuser)
+
+        self.assertEqual(self._ids("/api/services/", search="graf dash"), [self.grafana.id])
+        self.assertEqual(self._ids("/api/services/", search="git"), [self.gitlab.id])
+        self.assertEqual(self._ids("/api/services/", search="!&|:*"), [])
+
+    def test_credential_search_covers_service_and_notes_within_visibility(self):
+        self.client.force_authenticate(user=self.superuser)
+        self.assertEqual(len(self._ids("/api/credentials/", search="deploy")), 2)
+
+        self.client.force_authenticate(user=self.employee)
+        self.assertEqual(self._ids("/api/credentials/", search="deploy"), [self.gitlab_credential.id])
+        self.assertEqual(self._ids("/api/credentials/", search="grafana"), [self.grafana_credential.id])
+
+    def test_credential_search_ranks_service_name_above_notes(self):
+        self.grafana_credential.notes = "gitlab mirror"
+        self.grafana_credential.save()
+        self.client.force_authenticate(user=self.employee)
+
+        self.assertEqual(
+            self._ids("/api/credentials/", search="gitlab"),
+            [self.gitlab_credential.id, self.grafana_credential.id],
+        )
+
+    def test_service_rename_refreshes_credential_search(self):
+        self.gitlab.name = "Forgejo"
+        self.gitlab.save()
+        self.client.force_authenticate(user=self.employee)
+
+        self.assertEqual(self._ids("/api/credentials/", search="forgejo"), [self.gitlab_credential.id])
+        self.assertEqual(self._ids("/api/credentials/", search="gitlab"), [self.gitlab_credential.id])
+
+    def test_user_search_is_substring_and_scoped_for_heads(self):
+        self.client.force_authenticate(user=self.superuser)
+        self.assertEqual(
+            set(self._ids("/api/users/", search="ivan")),
+            {self.employee.id, self.finance_employee.id},
+        )
+        self.assertEqual(self._ids("/api/users/", search="petro"), [self.employee.id])
+
+        self.client.force_authenticate(user=self.head_it)
+        self.assertEqual(self._ids("/api/users/", search="ivan"), [self.employee.id])
@@ -0,0 +1,129 @@
+import threading
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.test import TestCase, TransactionTestCase
+from rest_framework.test import APIClient
+
+from vault.encryption import decrypt_value, secret_digest
+from vault.models import Credential, CredentialVersion, Department, SecretBlob, Service
+
+User = get_user_model()
+
+
+class SecretBlobStorageTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.dep_it = Department.objects.create(name="IT")
+        self.head_it = User.objects.create_user(
+            portal_login="head.it",
+            role=User.Role.HEAD,
+            department=self.dep_it,
+        )
+        self.employee = User.objects.create_user(
+            portal_login="emp.it",
+            role=User.Role.EMPLOYEE,
+            department=self.dep_it,
+        )
+        self.services = [
+            Service.objects.create(name=f"Service {index}", url=f"https://s{index}.local", department=self.dep_it)
+            for index in range(2)
+        ]
+        self.client.force_authenticate(user=self.head_it)
+
+    def _create(self, service, password="shared-secret"):
+        response = self.client.post(
+            "/api/credentials/",
+            {"user": self.employee.id, "service": service.id, "login": "emp", "password": password},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return Credential.objects.get(pk=response.json()["id"])
+
+    def test_unchanged_secret_is_stored_once_across_versions(self):
+        credential = self._create(self.services[0])
+
+        response = self.client.patch(f"/api/credentials/{credential.id}/", {"notes": "moved"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        response = self.client.put(
+            f"/api/credentials/{credential.id}/",
+            {
+                "user": self.employee.id,
+                "service": self.services[0].id,
+                "login": "emp",
+                "password": "shared-secret",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self._create(self.services[1])
+
+        blob = SecretBlob.objects.get()
+        self.assertEqual(blob.digest, secret_digest("shared-secret"))
+        self.assertEqual(CredentialVersion.objects.filter(secret=blob).count(), 4)
+        self.assertEqual(Credential.objects.filter(secret=blob).count(), 2)
+
+    def test_changed_secret_gets_new_blob_and_history_keeps_the_old_one(self):
+        credential = self._create(self.services[0])
+
+        response = self.client.patch(f"/api/credentials/{credential.id}/", {"password": "rotated"}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+        credential.refresh_from_db()
+        self.assertEqual(credential.password, "rotated")
+        self.assertEqual(SecretBlob.objects.count(), 2)
+        first, second = credential.versions.order_by("version")
+        self.assertEqual((first.password, second.password), ("shared-secret", "rotated"))
+        self.assertEqual(second.secret_id, credential.secret_id)
+
+    def test_blob_value_is_encrypted_at_rest(self):
+        credential = self._create(self.services[0])
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT value FROM vault_secretblob WHERE id = %s", [credential.secret_id])
+            ciphertext = cursor.fetchone()[0]
+        self.assertNotEqual(ciphertext, "shared-secret")
+        self.assertEqual(decrypt_value(ciphertext), "shared-secret")
+
+    def test_rotation_reencrypts_blobs_and_versions_share_them(self):
+        credential = self._create(self.services[0])
+        self._create(self.services[1])
+
+        call_command("rotate_credential_encryption", stdout=StringIO())
+
+        self.assertEqual(SecretBlob.objects.count(), 1)
+        latest = credential.versions.order_by("-version").first()
+        self.assertEqual((latest.version, latest.change_type), (2, CredentialVersion.ChangeType.ROTATE))
+        self.assertEqual(latest.secret_id, credential.secret_id)
+        self.assertEqual(latest.password, "shared-secret")
+
+
+class SecretBlobPruneRaceTests(TransactionTestCase):
+    def test_prune_skips_a_blob_that_a_concurrent_save_is_reusing(self):
+        department = Department.objects.create(name="IT")
+        user = User.objects.create_user(portal_login="emp.it", role=User.Role.EMPLOYEE, department=department)
+        service = Service.objects.create(name="Mail", url="https://mail.local", department=department)
+        orphan = SecretBlob.objects.for_value("reused-secret")
+        looked_up, pruned = threading.Event(), threading.Event()
+
+        def save_credential():
+            try:
+                with transaction.atomic():
+                    blob = SecretBlob.objects.for_value("reused-secret")
+                    looked_up.set()
+                    pruned.wait(10)
+                    Credential.objects.create(user=user, service=service, login="emp", secret=blob)
+            finally:
+                connections.close_all()
+
+        thread = threading.Thread(target=save_credential)
+        thread.start()
+        looked_up.wait(10)
+        call_command("prune_credential_versions", keep=1, stdout=StringIO())
+        pruned.set()
+        thread.join()
+
+        self.assertEqual(Credential.objects.get().secret_id, orphan.id)
+        self.assertEqual(Credential.objects.get().password, "reused-secret")
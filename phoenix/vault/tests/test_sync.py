@@ -0,0 +1,115 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from vault.models import AuditLog, Credential, Department, Service, ServiceAccess
+
+User = get_user_model()
+
+
+@override_settings(SYNC_CURSOR_LAG_SECONDS=0)
+class SyncTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.dep_it = Department.objects.create(name="IT")
+        self.dep_fin = Department.objects.create(name="Finance")
+        self.head_it = User.objects.create_user(
+            portal_login="head.it",
+            role=User.Role.HEAD,
+            department=self.dep_it,
+        )
+        self.employee = User.objects.create_user(
+            portal_login="emp.it",
+            role=User.Role.EMPLOYEE,
+            department=self.dep_it,
+        )
+        self.gitlab = Service.objects.create(name="GitLab", url="https://gitlab.local", department=self.dep_it)
+        self.vpn = Service.objects.create(name="VPN", url="https://vpn.local", department=self.dep_it)
+        self.gitlab_credential = Credential.objects.create(
+            user=self.employee,
+            service=self.gitlab,
+            login="emp",
+            password="secret",
+        )
+        self.vpn_credential = Credential.objects.create(
+            user=self.employee,
+            service=self.vpn,
+            login="emp",
+            password="secret",
+        )
+
+    def _sync(self, user, cursor=None):
+        self.client.force_authenticate(user=user)
+        response = self.client.get("/api/sync/", {"since": cursor} if cursor else {})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def _ids(self, payload, key):
+        return [item["id"] for item in payload[key]]
+
+    def test_first_sync_is_a_full_snapshot(self):
+        payload = self._sync(self.employee)
+
+        self.assertTrue(payload["reset"])
+        self.assertEqual(self._ids(payload, "departments"), [self.dep_it.id])
+        self.assertEqual(
+            sorted(self._ids(payload, "credentials")),
+            [self.gitlab_credential.id, self.vpn_credential.id],
+        )
+        self.assertEqual(payload["credentials"][0]["password"], "secret")
+        self.assertTrue(
+            AuditLog.objects.filter(action=AuditLog.Action.VIEW, object_type="Credential", object_id="sync").exists()
+        )
+
+    def test_delta_returns_only_rows_changed_after_the_cursor(self):
+        cursor = self._sync(self.employee)["cursor"]
+
+        with self.assertNumQueries(4):
+            payload = self._sync(self.employee, cursor)
+        self.assertFalse(payload["reset"])
+        self.assertEqual(payload["credentials"], [])
+        self.assertEqual(payload["services"], [])
+
+        self.gitlab_credential.notes = "rotated"
+        self.gitlab_credential.save()
+        payload = self._sync(self.employee, payload["cursor"])
+
+        self.assertEqual(self._ids(payload, "credentials"), [self.gitlab_credential.id])
+        self.assertEqual(payload["credentials"][0]["notes"], "rotated")
+        self.assertEqual(payload["tombstones"]["credentials"], [])
+
+    def test_revoked_rows_become_tombstones(self):
+        cursor = self._sync(self.employee)["cursor"]
+        access = ServiceAccess.objects.get(user=self.employee, service=self.vpn)
+        self.client.force_authenticate(user=self.head_it)
+        self.assertEqual(self.client.delete(f"/api/credentials/{self.vpn_credential.id}/").status_code, 204)
+        self.assertEqual(self.client.delete(f"/api/services/{self.gitlab.id}/").status_code, 204)
+
+        payload = self._sync(self.employee, cursor)
+
+        self.assertEqual(payload["credentials"], [])
+        self.assertEqual(payload["accesses"], [])
+        self.assertEqual(
+            payload["tombstones"]["credentials"],
+            sorted([self.gitlab_credential.id, self.vpn_credential.id]),
+        )
+        self.assertIn(access.id, payload["tombstones"]["accesses"])
+        self.assertEqual(payload["tombstones"]["services"], [self.gitlab.id])
+
+    def test_head_scope_change_forces_reset(self):
+        cursor = self._sync(self.head_it)["cursor"]
+        self.assertFalse(self._sync(self.head_it, cursor)["reset"])
+
+        self.employee.department = self.dep_fin
+        self.employee.save()
+        payload = self._sync(self.head_it, cursor)
+
+        self.assertTrue(payload["reset"])
+        self.assertEqual(payload["credentials"], [])
+
+    def test_invalid_cursor_is_rejected(self):
+        self.client.force_authenticate(user=self.employee)
+        response = self.client.get("/api/sync/", {"since": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("since", response.json())
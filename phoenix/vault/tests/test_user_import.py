@@ -0,0 +1,122 @@
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from vault import user_import
+from vault.models import AuditLog, Department
+
+User = get_user_model()
+
+
+class UserImportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.dep_it = Department.objects.create(name="IT")
+        self.dep_mkt = Department.objects.create(name="Marketing")
+        self.head_it = User.objects.create_user(
+            portal_login="head.it",
+            role=User.Role.HEAD,
+            department=self.dep_it,
+        )
+        User.objects.create_user(portal_login="taken", role=User.Role.EMPLOYEE, department=self.dep_it)
+
+    def test_head_imports_csv_with_per_row_errors(self):
+        csv_body = "\n".join(
+            [
+                "portal_login,full_name,email,role,department",
+                "new.one,New One,one@example.com,employee,",
+                "new.head,New Head,,head,",
+                "new.mkt,Other,,employee,Marketing",
+                "taken,Duplicate,,employee,",
+                "bad.mail,Bad,not-an-email,employee,",
+                "new.two,New Two,,,IT",
+                "new.one,Again,,employee,",
+            ]
+        )
+        self.client.force_authenticate(user=self.head_it)
+
+        response = self.client.post(
+            "/api/users/import/",
+            {"file": SimpleUploadedFile("users.csv", csv_body.encode("utf-8"), content_type="text/csv")},
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual((payload["created"], payload["failed"]), (2, 5))
+        self.assertEqual(
+            {error["row"]: sorted(error["errors"]) for error in payload["errors"]},
+            {
+                3: ["non_field_errors"],
+                4: ["non_field_errors"],
+                5: ["portal_login"],
+                6: ["email"],
+                8: ["portal_login"],
+            },
+        )
+        imported = User.objects.get(portal_login="new.one")
+        self.assertEqual((imported.department, imported.role), (self.dep_it, User.Role.EMPLOYEE))
+        self.assertFalse(imported.has_usable_password())
+        self.assertTrue(Token.objects.filter(user=imported).exists())
+        self.assertEqual(
+            AuditLog.objects.filter(actor=self.head_it, action=AuditLog.Action.CREATE, object_type="User").count(),
+            2,
+        )
+
+    def test_employee_cannot_import(self):
+        employee = User.objects.get(portal_login="taken")
+        self.client.force_authenticate(user=employee)
+        response = self.client.post(
+            "/api/users/import/",
+            {"file": SimpleUploadedFile("users.csv", b"portal_login\nx\n", content_type="text/csv")},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_command_streams_file_in_batches(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", encoding="utf-8", delete=False) as handle:
+            handle.write("portal_login,role,department_id,is_active\n")
+            for index in range(25):
+                handle.write(f"bulk.{index},employee,{self.dep_mkt.id},{'no' if index == 0 else 'yes'}\n")
+            handle.write("orphan,employee,,yes\n")
+            path = handle.name
+        self.addCleanup(os.remove, path)
+
+        stdout, stderr = StringIO(), StringIO()
+        with self.assertNumQueries(1 + 6 * 5):
+            call_command("import_users", path, batch_size=5, stdout=stdout, stderr=stderr)
+
+        self.assertIn("Created: 25, rejected: 1", stdout.getvalue())
+        self.assertIn("Row 27", stderr.getvalue())
+        self.assertEqual(User.objects.filter(portal_login__startswith="bulk.", department=self.dep_mkt).count(), 25)
+        self.assertFalse(User.objects.get(portal_login="bulk.0").is_active)
+        self.assertEqual(Token.objects.filter(user__portal_login__startswith="bulk.").count(), 25)
+
+    def test_login_created_concurrently_is_reported_as_a_row_error(self):
+        check_taken = user_import._drop_taken
+
+        def racing_create(rows, *args):
+            remaining = check_taken(rows, *args)
+            User.objects.get_or_create(portal_login="race", defaults={"role": User.Role.EMPLOYEE})
+            return remaining
+
+        stdout, stderr = StringIO(), StringIO()
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", encoding="utf-8", delete=False) as handle:
+            handle.write("portal_login,department\nfirst,IT\nrace,IT\nlast,IT\n")
+        self.addCleanup(os.remove, handle.name)
+        with patch("vault.user_import._drop_taken", side_effect=racing_create):
+            call_command("import_users", handle.name, stdout=stdout, stderr=stderr)
+
+        self.assertIn("Created: 2, rejected: 1", stdout.getvalue())
+        self.assertIn("Row 3", stderr.getvalue())
+        imported = AuditLog.objects.filter(metadata__import=True).values_list("object_id", flat=True)
+        expected = User.objects.filter(portal_login__in=["first", "last"]).values_list("pk", flat=True)
+        self.assertEqual(set(imported), {str(pk) for pk in expected})
@@ -1,13 +1,46 @@
 from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
 
 
-class LoginBurstThrottle(AnonRateThrottle):
+class TokenBucketThrottleMixin:
+    """Token bucket kept in the shared cache, one atomic round trip per request.
+
+    The bucket holds ``num_requests`` tokens and refills at
+    ``num_requests / duration`` per second, so the long-run rate matches the
+    configured one regardless of how many workers serve traffic. Cache
+    backends without ``consume_token`` (e.g. LocMemCache) fall back to DRF's
+    per-process history throttle.
+    """
+
+    _wait_seconds = None
+
+    def allow_request(self, request, view):
+        consume_token = getattr(self.cache, "consume_token", None)
+        if self.rate is None or consume_token is None:
+            return super().allow_request(request, view)
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        allowed, self._wait_seconds = consume_token(
+            self.key,
+            self.num_requests,
+            self.num_requests / self.duration,
+        )
+        return allowed
+
+    def wait(self):
+        if self._wait_seconds is not None:
+            return self._wait_seconds
+        return super().wait()
+
+
+class LoginBurstThrottle(TokenBucketThrottleMixin, AnonRateThrottle):
     scope = "login_burst"
 
 
-class LoginSustainedThrottle(AnonRateThrottle):
+class LoginSustainedThrottle(TokenBucketThrottleMixin, AnonRateThrottle):
     scope = "login_sustained"
 
 
-class AccessRequestCreateThrottle(UserRateThrottle):
+class AccessRequestCreateThrottle(TokenBucketThrottleMixin, UserRateThrottle):
     scope = "access_request_create"
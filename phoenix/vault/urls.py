@@ -3,10 +3,12 @@ from rest_framework.routers import DefaultRouter
 
 from .views import (
     AccessRequestViewSet,
+    AuditFeedView,
     AuditLogViewSet,
     CredentialViewSet,
     DepartmentShareViewSet,
     DepartmentViewSet,
+    EventStreamView,
     HealthLiveView,
     HealthReadyView,
     MeView,
@@ -14,6 +16,7 @@ from .views import (
     PortalLoginView,
     ServiceAccessViewSet,
     ServiceViewSet,
+    SyncView,
     UserViewSet,
 )
 
@@ -33,5 +36,9 @@ urlpatterns = [
     path("health/live/", HealthLiveView.as_view(), name="health-live"),
     path("health/ready/", HealthReadyView.as_view(), name="health-ready"),
     path("me/", MeView.as_view(), name="me"),
+    path("sync/", SyncView.as_view(), name="sync"),
+    path("events/", EventStreamView.as_view(), name="events"),
+    # Before the router, which would read "feed" as an audit log id.
+    path("audit-logs/feed/", AuditFeedView.as_view(), name="audit-log-feed"),
     path("", include(router.urls)),
 ]
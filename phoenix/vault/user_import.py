@@ -0,0 +1,202 @@
+import csv
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+from rest_framework.authtoken.models import Token
+
+from .audit import build_audit_entry, write_audit_entries
+from .models import AuditLog, Department
+from .serializers import validate_user_placement
+
+User = get_user_model()
+
+TRUE_VALUES = {"1", "true", "yes", "y", "да"}
+FALSE_VALUES = {"0", "false", "no", "n", "нет"}
+
+
+@dataclass
+class UserImportResult:
+    created: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+
+
+class RowError(Exception):
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def _detail(exc):
+    detail = exc.detail
+    if isinstance(detail, list):
+        return [str(item) for item in detail]
+    return [str(detail)]
+
+
+class UserRowParser:
+    """Turns CSV rows into unsaved ``User`` objects using the API's rules.
+
+    Departments are loaded once; everything else is checked in memory so a
+    row costs no queries until its batch is written.
+    """
+
+    def __init__(self, actor):
+        self.actor = actor
+        departments = list(Department.objects.filter(is_active=True))
+        self.departments_by_id = {str(department.id): department for department in departments}
+        self.departments_by_name = {department.name.casefold(): department for department in departments}
+
+    def _department(self, row):
+        department_id = (row.get("department_id") or "").strip()
+        department_name = (row.get("department") or "").strip()
+        if department_id:
+            department = self.departments_by_id.get(department_id)
+            if department is None:
+                raise RowError({"department_id": [f'Invalid pk "{department_id}" - object does not exist.']})
+            return department
+        if department_name:
+            department = self.departments_by_name.get(department_name.casefold())
+            if department is None:
+                raise RowError({"department": [f'Department "{department_name}" does not exist.']})
+            return department
+        return None
+
+    def parse(self, row):
+        errors = {}
+        portal_login = User.normalize_username((row.get("portal_login") or "").strip())
+        if not portal_login:
+            errors["portal_login"] = ["This field is required."]
+        elif len(portal_login) > User._meta.get_field("portal_login").max_length:
+            errors["portal_login"] = ["Ensure this field has no more than 64 characters."]
+
+        full_name = (row.get("full_name") or "").strip()
+        if len(full_name) > User._meta.get_field("full_name").max_length:
+            errors["full_name"] = ["Ensure this field has no more than 128 characters."]
+
+        email = (row.get("email") or "").strip()
+        if email:
+            try:
+                validate_email(email)
+            except DjangoValidationError:
+                errors["email"] = ["Enter a valid email address."]
+
+        role = (row.get("role") or "").strip().lower() or User.Role.EMPLOYEE
+        if role not in User.Role.values and role != "admin":
+            errors["role"] = [f'"{role}" is not a valid choice.']
+
+        is_active = (row.get("is_active") or "").strip().lower()
+        if is_active and is_active not in TRUE_VALUES | FALSE_VALUES:
+            errors["is_active"] = ["Must be a valid boolean."]
+
+        try:
+            department = self._department(row)
+        except RowError as exc:
+            errors.update(exc.errors)
+            department = None
+        if errors:
+            raise RowError(errors)
+
+        try:
+            role, department = validate_user_placement(self.actor, role, department)
+        except serializers.ValidationError as exc:
+            raise RowError({"non_field_errors": _detail(exc)})
+
+        user = User(
+            portal_login=portal_login,
+            full_name=full_name,
+            email=email,
+            role=role,
+            department=department,
+            is_active=is_active not in FALSE_VALUES,
+        )
+        user.set_unusable_password()
+        return user
+
+
+def _record_error(result, line_number, errors, max_errors):
+    result.failed += 1
+    if len(result.errors) < max_errors:
+        result.errors.append({"row": line_number, "errors": errors})
+
+
+def _drop_taken(parsed, result, max_errors):
+    """Report rows whose login already exists (or repeats in the batch); return the rest."""
+    logins = [user.portal_login for _, user in parsed]
+    taken = set(User.objects.filter(portal_login__in=logins).values_list("portal_login", flat=True))
+    rows = []
+    seen = set()
+    for line_number, user in parsed:
+        if user.portal_login in taken or user.portal_login in seen:
+            errors = {"portal_login": ["user with this portal login already exists."]}
+            _record_error(result, line_number, errors, max_errors)
+            continue
+        seen.add(user.portal_login)
+        rows.append((line_number, user))
+    return rows
+
+
+def _write_batch(parsed, actor, request, result, max_errors):
+    rows = _drop_taken(parsed, result, max_errors)
+    while rows:
+        users = [user for _, user in rows]
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                Token.objects.bulk_create([Token(user=user, key=Token.generate_key()) for user in users])
+                write_audit_entries(
+                    [
+                        build_audit_entry(
+                            actor, AuditLog.Action.CREATE, user, metadata={"import": True}, request=request
+                        )
+                        for user in users
+                    ]
+                )
+        except IntegrityError:
+            # A login created concurrently since the check: report it and retry the rest.
+            remaining = _drop_taken(rows, result, max_errors)
+            if len(remaining) == len(rows):
+                raise
+            rows = remaining
+            continue
+        result.created += len(users)
+        return
+
+
+def import_users(stream, actor=None, request=None, batch_size=1000, max_errors=1000):
+    """Create users from a CSV text stream in batches.
+
+    Columns: ``portal_login`` (required), ``full_name``, ``email``, ``role``,
+    ``department`` (name) or ``department_id``, ``is_active``. Rows follow the
+    same role and department rules as ``UserWriteSerializer``. Each batch is
+    inserted with ``bulk_create`` together with its tokens and audit rows.
+    Invalid rows are skipped and reported with their CSV line number. Only
+    one batch is held in memory at a time. Imported users get unusable
+    passwords and sign in with one-time codes.
+    """
+    result = UserImportResult()
+    reader = csv.DictReader(stream)
+    if not reader.fieldnames or "portal_login" not in [name.strip() for name in reader.fieldnames]:
+        raise serializers.ValidationError({"file": "CSV header must include portal_login."})
+    reader.fieldnames = [name.strip() for name in reader.fieldnames]
+
+    parser = UserRowParser(actor)
+    audit_actor = actor if actor is not None and actor.is_authenticated else None
+    rows = ((reader.line_num, row) for row in reader)
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            break
+        parsed = []
+        for line_number, row in chunk:
+            try:
+                parsed.append((line_number, parser.parse(row)))
+            except RowError as exc:
+                _record_error(result, line_number, exc.errors, max_errors)
+        _write_batch(parsed, audit_actor, request, result, max_errors)
+    return result
@@ -1,39 +1,76 @@
+import asyncio
+import io
+import json
+import re
+from datetime import timedelta
 from urllib.parse import urlencode
 
+from asgiref.sync import sync_to_async
+
 from django.conf import settings
 from django.contrib.auth import authenticate, get_user_model
-from django.db import connection
-from django.db.models import Max, Q
-from django.http import HttpResponse
+from django.db import connection, transaction
+from django.db.models import Max, Q, Sum, prefetch_related_objects
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
 from django.utils.dateparse import parse_date, parse_datetime
+from django.views import View
 from rest_framework import status, viewsets
+from rest_framework.authentication import TokenAuthentication
 from rest_framework.authtoken.models import Token
 from rest_framework.decorators import action
-from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.exceptions import AuthenticationFailed, PermissionDenied, ValidationError
 from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from .async_views import AsyncAPIView, AsyncViewSetMixin
+from .audit import audit_actor_ids, build_audit_entry, log_action, with_audit_actors, write_audit_entries
+from .audit_archive import search_archive
+from .audit_feed import AuditFeedTokenAuthentication, feed_batch
+from .events import (
+    ACCESS_REQUEST_APPROVED,
+    ACCESS_REQUEST_CREATED,
+    ACCESS_REQUEST_REJECTED,
+    CREDENTIAL_ISSUED,
+    CREDENTIAL_UPDATED,
+    event_hub,
+    publish_event,
+    publish_events,
+    reviewer_ids_for_department,
+)
 from .models import (
     AccessRequest,
     AuditLog,
+    AuditRollup,
     Credential,
     CredentialVersion,
     Department,
     DepartmentShare,
+    SecretBlob,
     Service,
     ServiceAccess,
 )
-from .notifications import send_platform_email
-from .security import generate_login_challenge, get_client_ip, get_user_agent, verify_login_challenge
+from .notifications import notify_reviewers_of_request, send_platform_email, send_platform_emails
+from .offboarding import offboard_department, offboard_users
+from .pagination import CredentialVersionPagination, OptionalLimitOffsetPagination
+from .permissions import IsAuditFeedReader
+from .replica import ReplicaReadMixin
+from .search import search_credentials, search_services, search_users
+from .security import generate_login_challenge, verify_login_challenge
+from .sync import InvalidCursor, decode_cursor, encode_cursor, next_cursor_moment, scope_fingerprint
 from .serializers import (
+    AccessRequestBulkReviewSerializer,
     AccessRequestReadSerializer,
     AccessRequestReviewSerializer,
     AccessRequestWriteSerializer,
+    AuditFeedSerializer,
     AuditLogSerializer,
+    CredentialBulkCreateSerializer,
     CredentialReadSerializer,
+    CredentialVersionSecretSerializer,
     CredentialVersionSerializer,
     CredentialWriteSerializer,
     DepartmentSerializer,
@@ -44,36 +81,11 @@ from .serializers import (
     UserWriteSerializer,
 )
 from .throttling import AccessRequestCreateThrottle, LoginBurstThrottle, LoginSustainedThrottle
+from .user_import import import_users
 
 User = get_user_model()
 
 
-def log_action(
-    actor,
-    action,
-    obj=None,
-    metadata=None,
-    request=None,
-    object_type=None,
-    object_id=None,
-):
-    if obj is not None:
-        object_type = obj.__class__.__name__
-        object_id = str(obj.pk)
-    if not object_type or object_id is None:
-        raise ValueError("object_type/object_id required when obj is None")
-
-    AuditLog.objects.create(
-        actor=actor,
-        action=action,
-        object_type=object_type,
-        object_id=str(object_id),
-        ip_address=get_client_ip(request) if request else None,
-        user_agent=get_user_agent(request) if request else "",
-        metadata=metadata or {},
-    )
-
-
 def _is_superuser(user):
     return bool(user and user.is_authenticated and user.is_superuser)
 
@@ -102,6 +114,54 @@ def _head_visible_department_ids(user):
     return ids
 
 
+def _visible_departments(user):
+    qs = Department.objects.all()
+    if _is_superuser(user):
+        return qs
+    if _is_department_head(user):
+        return qs.filter(id__in=_head_visible_department_ids(user))
+    if user.department_id:
+        return qs.filter(id=user.department_id)
+    return qs.none()
+
+
+def _visible_services(user):
+    qs = Service.objects.select_related("department")
+    if _is_superuser(user):
+        return qs
+    if _is_department_head(user):
+        visible_department_ids = _head_visible_department_ids(user)
+        return qs.filter(Q(is_active=True) | Q(department_id__in=visible_department_ids)).distinct()
+    return qs.filter(is_active=True)
+
+
+def _visible_accesses(user):
+    qs = ServiceAccess.objects.select_related("user", "service", "service__department", "user__department")
+    if _is_superuser(user):
+        return qs
+    if _is_department_head(user):
+        return qs.filter(user__department_id__in=_head_visible_department_ids(user))
+    return qs.filter(user=user, is_active=True, service__is_active=True)
+
+
+def _visible_credentials(user):
+    qs = Credential.objects.select_related("user", "service", "service__department", "user__department")
+    if _is_superuser(user):
+        return qs
+    if _is_department_head(user):
+        return qs.filter(user__department_id__in=_head_visible_department_ids(user))
+    return (
+        qs.filter(
+            user=user,
+            is_active=True,
+            service__is_active=True,
+            service__accesses__user=user,
+            service__accesses__is_active=True,
+        )
+        .distinct()
+    )
+
+
 def _build_auth_payload(user, token_key):
     return {
         "id": user.id,
@@ -135,6 +195,99 @@ def _direct_passwordless_allowed(user):
     return user.role in allowed_roles
 
 
+def _query_param(request, name):
+    return str(request.query_params.get(name, "")).strip()
+
+
+def _query_int(request, name):
+    raw = _query_param(request, name)
+    if not raw:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValidationError({name: "A valid integer is required."})
+
+
+def _query_bool(request, name):
+    raw = _query_param(request, name).lower()
+    if not raw:
+        return None
+    if raw in ("1", "true", "yes"):
+        return True
+    if raw in ("0", "false", "no"):
+        return False
+    raise ValidationError({name: "Must be a valid boolean."})
+
+
+def _query_choice(request, name, choices):
+    raw = _query_param(request, name)
+    if raw and raw not in choices:
+        raise ValidationError({name: f'"{raw}" is not a valid choice.'})
+    return raw
+
+
+def _query_datetime(request, name, is_end=False):
+    raw = _query_param(request, name)
+    value = _parse_range_bound(raw, is_end=is_end)
+    if raw and value is None:
+        raise ValidationError({name: "Enter a valid date or datetime."})
+    return value
+
+
+_METADATA_KEY_RE = re.compile(r"[A-Za-z0-9_]+")
+_METADATA_SCALAR_RE = re.compile(r"-?\d+(\.\d+)?|true|false|null")
+
+
+def _query_metadata(request):
+    """``?metadata.<key>=<value>`` params as ``(path, values)`` pairs; ``a.b`` reaches a nested key.
+
+    A value matches the JSON string and, when it reads as a number,
+    ``true``, ``false`` or ``null``, that JSON value too. A repeated key
+    matches any of its values.
+    """
+    filters = []
+    for name in sorted(request.query_params):
+        if not name.startswith("metadata."):
+            continue
+        path = tuple(name[len("metadata.") :].split("."))
+        if not all(_METADATA_KEY_RE.fullmatch(key) for key in path):
+            raise ValidationError({name: "Metadata keys may contain only letters, digits and underscores."})
+        values = []
+        for raw in request.query_params.getlist(name):
+            raw = raw.strip()
+            values.append(raw)
+            if _METADATA_SCALAR_RE.fullmatch(raw):
+                values.append(json.loads(raw))
+        filters.append((path, values))
+    return filters
+
+
+def _metadata_condition(path, values):
+    """``metadata @> {...}`` for each value, OR-ed; served by ``vault_audit_metadata_idx``."""
+    condition = Q()
+    for value in values:
+        for key in reversed(path):
+            value = {key: value}
+        condition |= Q(metadata__contains=value)
+    return condition
+
+
+def _apply_ordering(qs, request, allowed):
+    """Order by ``?ordering=a,-b`` restricted to ``allowed`` (public name -> ORM path)."""
+    raw = _query_param(request, "ordering")
+    if not raw:
+        return qs
+    order_by = []
+    for item in raw.split(","):
+        item = item.strip()
+        name = item.lstrip("-")
+        if name not in allowed:
+            raise ValidationError({"ordering": f'Cannot order by "{name}". Allowed: {", ".join(sorted(allowed))}.'})
+        order_by.append(f"-{allowed[name]}" if item.startswith("-") else allowed[name])
+    return qs.order_by(*order_by, "id")
+
+
 def _record_credential_version(credential, changed_by=None, change_type=CredentialVersion.ChangeType.UPDATE):
     max_version = (
         CredentialVersion.objects.filter(credential=credential).aggregate(max_v=Max("version"))["max_v"]
@@ -151,7 +304,7 @@ def _record_credential_version(credential, changed_by=None, change_type=Credenti
         ssh_algorithm=credential.ssh_algorithm,
         ssh_public_key=credential.ssh_public_key,
         ssh_fingerprint=credential.ssh_fingerprint,
-        password=credential.password,
+        secret_id=credential.secret_id,
         notes=credential.notes,
         is_active=credential.is_active,
         change_type=change_type,
@@ -159,12 +312,43 @@ def _record_credential_version(credential, changed_by=None, change_type=Credenti
     )
 
 
-def _reviewer_emails_for_request(access_request):
-    department_id = access_request.requester.department_id
-    reviewers = User.objects.filter(is_active=True).filter(
-        Q(is_superuser=True) | Q(role=User.Role.HEAD, department_id=department_id)
+def _credential_event_data(credential):
+    return {"id": credential.id, "service_id": credential.service_id, "is_active": credential.is_active}
+
+
+def _access_request_event_data(access_request):
+    return {
+        "id": access_request.id,
+        "service_id": access_request.service_id,
+        "requester_id": access_request.requester_id,
+        "status": access_request.status,
+    }
+
+
+def _send_login_challenge_email(user, challenge, one_time_code, one_time_token):
+    if not user.email:
+        return
+    frontend_base_url = getattr(settings, "FRONTEND_BASE_URL", "").strip().rstrip("/")
+    magic_link = ""
+    if frontend_base_url:
+        query = urlencode({"portal_login": user.portal_login, "magic_token": one_time_token})
+        magic_link = f"{frontend_base_url}/?{query}"
+
+    email_body_lines = [
+        "Для входа в Phoenix Vault используйте одноразовый код:",
+        "",
+        f"Код: {one_time_code}",
+        "",
+        f"Код действителен до: {challenge.expires_at.isoformat()}",
+    ]
+    if magic_link:
+        email_body_lines.extend(["", f"Или войдите по ссылке: {magic_link}"])
+
+    send_platform_email(
+        subject="Phoenix Vault: одноразовый код входа",
+        body="\n".join(email_body_lines),
+        recipients=[user.email],
     )
-    return [u.email for u in reviewers if u.email]
 
 
 def _parse_range_bound(value, is_end=False):
@@ -222,29 +406,9 @@ class PortalLoginView(APIView):
                         {"detail": "Для входа по одноразовому коду у пользователя должна быть указана почта."},
                         status=status.HTTP_400_BAD_REQUEST,
                     )
-                challenge, one_time_code, one_time_token = generate_login_challenge(user, request=request)
-                frontend_base_url = getattr(settings, "FRONTEND_BASE_URL", "").strip().rstrip("/")
-                magic_link = ""
-                if frontend_base_url:
-                    query = urlencode({"portal_login": user.portal_login, "magic_token": one_time_token})
-                    magic_link = f"{frontend_base_url}/?{query}"
-
-                email_body_lines = [
-                    "Для входа в Phoenix Vault используйте одноразовый код:",
-                    "",
-                    f"Код: {one_time_code}",
-                    "",
-                    f"Код действителен до: {challenge.expires_at.isoformat()}",
-                ]
-                if magic_link:
-                    email_body_lines.extend(["", f"Или войдите по ссылке: {magic_link}"])
-
-                if user.email:
-                    send_platform_email(
-                        subject="Phoenix Vault: одноразовый код входа",
-                        body="\n".join(email_body_lines),
-                        recipients=[user.email],
-                    )
+                with transaction.atomic():
+                    challenge, one_time_code, one_time_token = generate_login_challenge(user, request=request)
+                    _send_login_challenge_email(user, challenge, one_time_code, one_time_token)
 
                 response_payload = {
                     "detail": "challenge sent",
@@ -273,33 +437,42 @@ class PortalLoginView(APIView):
         return Response(_build_auth_payload(user, token.key))
 
 
-class HealthLiveView(APIView):
+class HealthLiveView(AsyncAPIView):
     permission_classes = [AllowAny]
     authentication_classes = []
 
-    def get(self, request):
+    async def get(self, request):
         return Response({"status": "ok", "service": "phoenix-api"})
 
 
-class HealthReadyView(APIView):
+def _ping_database():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+
+
+class HealthReadyView(AsyncAPIView):
     permission_classes = [AllowAny]
     authentication_classes = []
 
-    def get(self, request):
+    async def get(self, request):
         try:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-                cursor.fetchone()
+            await sync_to_async(_ping_database)()
         except Exception:
             return Response({"status": "degraded", "database": "down"}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
-        return Response({"status": "ok", "database": "up"})
+        payload = {"status": "ok", "database": "up"}
+        stats = connection.pool_stats()
+        if stats is not None:
+            # Per worker process: each gunicorn worker has a pool of its own.
+            payload["database_pool"] = stats
+        return Response(payload)
 
 
-class PublicConfigView(APIView):
+class PublicConfigView(AsyncAPIView):
     permission_classes = [AllowAny]
     authentication_classes = []
 
-    def get(self, request):
+    async def get(self, request):
         return Response(
             {
                 "product_name": "Phoenix Vault",
@@ -311,17 +484,197 @@ class PublicConfigView(APIView):
         )
 
 
-class MeView(APIView):
+class MeView(AsyncAPIView):
+    permission_classes = [IsAuthenticated]
+
+    async def get(self, request):
+        user = await User.objects.select_related("department").aget(pk=request.user.pk)
+        return Response(UserSerializer(user).data)
+
+
+def _authenticate_stream(request):
+    try:
+        return TokenAuthentication().authenticate(request)
+    finally:
+        # Django closes the request's connection only when the response ends,
+        # and a stream stays open for minutes; do not hold a connection for it.
+        connection.close()
+
+
+class EventStreamView(View):
+    """Server-sent events for the authenticated user, fed by ``LISTEN/NOTIFY``.
+
+    Only served by the ASGI application: each open stream is a coroutine, not
+    a worker. Streams end after ``SSE_MAX_STREAM_SECONDS`` and the client
+    reconnects (``EventSource`` does this on its own), so streams left behind
+    by dropped connections are bounded.
+    """
+
+    async def get(self, request):
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(
+                {"detail": "Event stream is available only from the ASGI application."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        try:
+            authenticated = await sync_to_async(_authenticate_stream)(request)
+        except AuthenticationFailed as exc:
+            return JsonResponse({"detail": str(exc.detail)}, status=status.HTTP_401_UNAUTHORIZED)
+        if authenticated is None:
+            return JsonResponse(
+                {"detail": "Authentication credentials were not provided."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+        user = authenticated[0]
+        queue = await event_hub.subscribe(user.id)
+        response = StreamingHttpResponse(self._stream(user.id, queue), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def _stream(self, user_id, queue):
+        loop = asyncio.get_running_loop()
+        heartbeat = max(1, getattr(settings, "SSE_HEARTBEAT_SECONDS", 15))
+        deadline = loop.time() + max(1, getattr(settings, "SSE_MAX_STREAM_SECONDS", 300))
+        try:
+            yield "retry: 3000\n\n"
+            while loop.time() < deadline:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout=min(heartbeat, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if item is None:
+                    return
+                event, data = item
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        finally:
+            event_hub.unsubscribe(user_id, queue)
+
+
+def _sync_scope(user):
+    parts = [user.id, user.role, user.is_superuser, user.department_id]
+    if _is_department_head(user) and not _is_superuser(user):
+        department_ids = sorted(_head_visible_department_ids(user))
+        member_ids = list(
+            User.objects.filter(department_id__in=department_ids).order_by("id").values_list("id", flat=True)
+        )
+        parts += [department_ids, member_ids]
+    return scope_fingerprint(*parts)
+
+
+def _changed_rows(qs, since, service_ids=()):
+    condition = Q(updated_at__gt=since)
+    if service_ids:
+        condition |= Q(service_id__in=service_ids)
+    return list(qs.filter(condition).values_list("id", "service_id"))
+
+
+def _split_sync_changes(changed_ids, visible_queryset):
+    """Split changed ids into rows still visible to the caller and tombstone ids."""
+    changed_ids = set(changed_ids)
+    if not changed_ids:
+        return [], []
+    rows = list(visible_queryset().filter(id__in=changed_ids).order_by("id"))
+    return rows, sorted(changed_ids - {row.id for row in rows})
+
+
+class SyncView(APIView):
+    """Delta feed of credentials, accesses, services and departments for offline clients.
+
+    Without ``since`` (or when the caller's visibility scope changed since the
+    cursor was issued) the response is a full snapshot with ``reset: true``.
+    Otherwise it carries only rows whose ``updated_at`` moved past the cursor,
+    and ``tombstones`` lists ids of changed rows the caller can no longer see.
+    """
+
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        serializer = UserSerializer(request.user)
-        return Response(serializer.data)
+        user = request.user
+        scope = _sync_scope(user)
+        since = None
+        cursor = _query_param(request, "since")
+        if cursor:
+            try:
+                since, cursor_scope = decode_cursor(cursor)
+            except InvalidCursor:
+                raise ValidationError({"since": "Invalid cursor."})
+            if cursor_scope != scope:
+                since = None
+        next_moment = next_cursor_moment(since)
+
+        if since is None:
+            departments = list(_visible_departments(user))
+            services = list(_visible_services(user))
+            accesses = list(_visible_accesses(user))
+            credentials = list(_visible_credentials(user).select_related("secret"))
+            tombstones = {"departments": [], "services": [], "accesses": [], "credentials": []}
+        else:
+            departments = list(_visible_departments(user).filter(updated_at__gt=since))
+            service_ids = list(Service.objects.filter(updated_at__gt=since).values_list("id", flat=True))
+            services, gone_services = _split_sync_changes(service_ids, lambda: _visible_services(user))
+            if _is_superuser(user) or _is_department_head(user):
+                access_changes = _changed_rows(_visible_accesses(user), since, service_ids)
+                credential_changes = _changed_rows(_visible_credentials(user), since, service_ids)
+            else:
+                # Employees also learn about their own rows that dropped out of
+                # visibility (a revoked access, a disabled credential); their
+                # credentials follow the matching access.
+                access_changes = _changed_rows(ServiceAccess.objects.filter(user=user), since, service_ids)
+                credential_changes = _changed_rows(
+                    Credential.objects.filter(user=user),
+                    since,
+                    {*service_ids, *(service_id for _, service_id in access_changes)},
+                )
+            accesses, gone_accesses = _split_sync_changes(
+                (row_id for row_id, _ in access_changes), lambda: _visible_accesses(user)
+            )
+            credentials, gone_credentials = _split_sync_changes(
+                (row_id for row_id, _ in credential_changes),
+                lambda: _visible_credentials(user).select_related("secret"),
+            )
+            tombstones = {
+                "departments": [],
+                "services": gone_services,
+                "accesses": gone_accesses,
+                "credentials": gone_credentials,
+            }
+
+        if credentials:
+            log_action(
+                actor=user,
+                action=AuditLog.Action.VIEW,
+                object_type="Credential",
+                object_id="sync",
+                metadata={"count": len(credentials), "reset": since is None},
+                request=request,
+                coalesce=True,
+            )
+        return Response(
+            {
+                "cursor": encode_cursor(next_moment, scope),
+                "reset": since is None,
+                "departments": DepartmentSerializer(departments, many=True).data,
+                "services": ServiceSerializer(services, many=True).data,
+                "accesses": ServiceAccessSerializer(accesses, many=True).data,
+                "credentials": CredentialReadSerializer(credentials, many=True).data,
+                "tombstones": tombstones,
+            }
+        )
 
 
 class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.select_related("department")
     permission_classes = [IsAuthenticated]
+    pagination_class = OptionalLimitOffsetPagination
+    ordering_fields = {
+        "portal_login": "portal_login",
+        "full_name": "full_name",
+        "role": "role",
+        "department": "department__name",
+        "date_joined": "date_joined",
+    }
 
     def _ensure_can_manage_users(self):
         user = self.request.user
@@ -335,6 +688,24 @@ class UserViewSet(viewsets.ModelViewSet):
         return UserWriteSerializer
 
     def get_queryset(self):
+        qs = self._scoped_queryset()
+        if self.action != "list":
+            return qs
+        role = _query_choice(self.request, "role", User.Role.values)
+        department = _query_int(self.request, "department")
+        is_active = _query_bool(self.request, "is_active")
+        if role:
+            qs = qs.filter(role=role)
+        if department is not None:
+            qs = qs.filter(department_id=department)
+        if is_active is not None:
+            qs = qs.filter(is_active=is_active)
+        search = _query_param(self.request, "search")
+        if search:
+            qs = search_users(qs, search)
+        return _apply_ordering(qs, self.request, self.ordering_fields)
+
+    def _scoped_queryset(self):
         user = self.request.user
         if _is_superuser(user):
             return User.objects.select_related("department")
@@ -392,26 +763,39 @@ class UserViewSet(viewsets.ModelViewSet):
             if target.department_id != actor.department_id:
                 raise PermissionDenied("You can disable only your department users.")
 
-        target.is_active = False
-        target.save(update_fields=["is_active"])
-        log_action(request.user, AuditLog.Action.DISABLE, target, request=request)
+        offboard_users([target.id], actor=actor, request=request)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[IsAuthenticated],
+        parser_classes=[MultiPartParser],
+        url_path="import",
+    )
+    def import_csv(self, request):
+        self._ensure_can_manage_users()
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": "CSV file is required."})
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+        try:
+            result = import_users(stream, actor=request.user, request=request)
+        except UnicodeDecodeError:
+            raise ValidationError({"file": "CSV must be UTF-8 encoded."})
+        return Response({"created": result.created, "failed": result.failed, "errors": result.errors})
+
 
-class DepartmentViewSet(viewsets.ModelViewSet):
+class DepartmentViewSet(ReplicaReadMixin, AsyncViewSetMixin, viewsets.ModelViewSet):
     serializer_class = DepartmentSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        user = self.request.user
-        qs = Department.objects.all()
-        if _is_superuser(user):
-            return qs
-        if _is_department_head(user):
-            return qs.filter(id__in=_head_visible_department_ids(user))
-        if user.department_id:
-            return qs.filter(id=user.department_id)
-        return qs.none()
+        return _visible_departments(self.request.user)
+
+    async def list(self, request, *args, **kwargs):
+        queryset = await sync_to_async(self.get_queryset)()
+        return Response(self.get_serializer([department async for department in queryset], many=True).data)
 
     def _ensure_superuser_write(self):
         if not _is_superuser(self.request.user):
@@ -430,25 +814,26 @@ class DepartmentViewSet(viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         self._ensure_superuser_write()
         instance = self.get_object()
-        instance.is_active = False
-        instance.save(update_fields=["is_active"])
-        log_action(request.user, AuditLog.Action.DISABLE, instance, request=request)
+        offboard_department(instance, actor=request.user, request=request)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class ServiceViewSet(viewsets.ModelViewSet):
+class ServiceViewSet(ReplicaReadMixin, AsyncViewSetMixin, viewsets.ModelViewSet):
     serializer_class = ServiceSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        user = self.request.user
-        qs = Service.objects.select_related("department")
-        if _is_superuser(user):
-            return qs
-        if _is_department_head(user):
-            visible_department_ids = _head_visible_department_ids(user)
-            return qs.filter(Q(is_active=True) | Q(department_id__in=visible_department_ids)).distinct()
-        return qs.filter(is_active=True)
+        qs = self._scoped_queryset()
+        search = _query_param(self.request, "search") if self.action == "list" else ""
+        return search_services(qs, search) if search else qs
+
+    def _scoped_queryset(self):
+        return _visible_services(self.request.user)
+
+    async def list(self, request, *args, **kwargs):
+        # Visibility helpers read department shares synchronously; rows are fetched with the async ORM.
+        queryset = await sync_to_async(self.get_queryset)()
+        return Response(self.get_serializer([service async for service in queryset], many=True).data)
 
     def _ensure_service_write_allowed(self, service=None):
         user = self.request.user
@@ -487,7 +872,7 @@ class ServiceViewSet(viewsets.ModelViewSet):
         instance = self.get_object()
         self._ensure_service_write_allowed(service=instance)
         instance.is_active = False
-        instance.save(update_fields=["is_active"])
+        instance.save(update_fields=["is_active", "updated_at"])
         log_action(request.user, AuditLog.Action.DISABLE, instance, request=request)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -495,28 +880,51 @@ class ServiceViewSet(viewsets.ModelViewSet):
 class CredentialViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     parser_classes = [JSONParser, MultiPartParser, FormParser]
+    pagination_class = OptionalLimitOffsetPagination
+    ordering_fields = {
+        "service": "service__name",
+        "user": "user__portal_login",
+        "login": "login",
+        "secret_type": "secret_type",
+        "created_at": "created_at",
+        "updated_at": "updated_at",
+    }
 
     def get_queryset(self):
-        user = self.request.user
-        qs = Credential.objects.select_related("user", "service", "service__department", "user__department")
-        if _is_superuser(user):
+        qs = self._scoped_queryset()
+        if self.action != "list":
             return qs
-        if _is_department_head(user):
-            return qs.filter(user__department_id__in=_head_visible_department_ids(user))
-        return (
-            qs.filter(
-                user=user,
-                is_active=True,
-                service__is_active=True,
-                service__accesses__user=user,
-                service__accesses__is_active=True,
-            )
-            .distinct()
-        )
+        service = _query_int(self.request, "service")
+        department = _query_int(self.request, "department")
+        secret_type = _query_choice(self.request, "secret_type", Credential.SecretType.values)
+        is_active = _query_bool(self.request, "is_active")
+        updated_since = _query_datetime(self.request, "updated_since")
+        if service is not None:
+            qs = qs.filter(service_id=service)
+        if department is not None:
+            qs = qs.filter(user__department_id=department)
+        if secret_type:
+            qs = qs.filter(secret_type=secret_type)
+        if is_active is not None:
+            qs = qs.filter(is_active=is_active)
+        if updated_since:
+            qs = qs.filter(updated_at__gte=updated_since)
+        search = _query_param(self.request, "search")
+        if search:
+            qs = search_credentials(qs, search)
+        return _apply_ordering(qs, self.request, self.ordering_fields)
+
+    def _scoped_queryset(self):
+        qs = _visible_credentials(self.request.user)
+        if self.action in ("list", "retrieve", "download_secret"):
+            qs = qs.select_related("secret")
+        return qs
 
     def get_serializer_class(self):
         if self.action in ("list", "retrieve"):
             return CredentialReadSerializer
+        if self.action == "bulk":
+            return CredentialBulkCreateSerializer
         return CredentialWriteSerializer
 
     def _ensure_credential_write_allowed(self, credential=None):
@@ -530,6 +938,7 @@ class CredentialViewSet(viewsets.ModelViewSet):
         if credential and credential.user.department_id != user.department_id:
             raise PermissionDenied("You can modify only your department credentials.")
 
+    @transaction.atomic
     def perform_create(self, serializer):
         self._ensure_credential_write_allowed()
         user = self.request.user
@@ -547,6 +956,7 @@ class CredentialViewSet(viewsets.ModelViewSet):
             changed_by=self.request.user,
             change_type=CredentialVersion.ChangeType.CREATE,
         )
+        publish_event([credential.user_id], CREDENTIAL_ISSUED, _credential_event_data(credential))
         if credential.user.email:
             send_platform_email(
                 subject="Phoenix Vault: доступ выдан",
@@ -558,6 +968,7 @@ class CredentialViewSet(viewsets.ModelViewSet):
             )
         log_action(self.request.user, AuditLog.Action.CREATE, credential, request=self.request)
 
+    @transaction.atomic
     def perform_update(self, serializer):
         credential = self.get_object()
         self._ensure_credential_write_allowed(credential=credential)
@@ -576,6 +987,7 @@ class CredentialViewSet(viewsets.ModelViewSet):
             changed_by=self.request.user,
             change_type=CredentialVersion.ChangeType.UPDATE,
         )
+        publish_event([credential.user_id], CREDENTIAL_UPDATED, _credential_event_data(credential))
         if credential.user.email:
             send_platform_email(
                 subject="Phoenix Vault: учетные данные обновлены",
@@ -586,17 +998,21 @@ class CredentialViewSet(viewsets.ModelViewSet):
             )
         log_action(self.request.user, AuditLog.Action.UPDATE, credential, request=self.request)
 
+    @transaction.atomic
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         self._ensure_credential_write_allowed(credential=instance)
         instance.is_active = False
-        instance.save(update_fields=["is_active"])
-        ServiceAccess.objects.filter(user=instance.user, service=instance.service).update(is_active=False)
+        instance.save(update_fields=["is_active", "updated_at"])
+        ServiceAccess.objects.filter(user=instance.user, service=instance.service).update(
+            is_active=False, updated_at=timezone.now()
+        )
         _record_credential_version(
             instance,
             changed_by=request.user,
             change_type=CredentialVersion.ChangeType.DISABLE,
         )
+        publish_event([instance.user_id], CREDENTIAL_UPDATED, _credential_event_data(instance))
         if instance.user.email:
             send_platform_email(
                 subject="Phoenix Vault: доступ отключен",
@@ -606,6 +1022,126 @@ class CredentialViewSet(viewsets.ModelViewSet):
         log_action(request.user, AuditLog.Action.DISABLE, instance, request=request)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated], url_path="bulk")
+    @transaction.atomic
+    def bulk(self, request):
+        self._ensure_credential_write_allowed()
+        actor = request.user
+        items = request.data.get("items") if isinstance(request.data, dict) else None
+        if not isinstance(items, list):
+            raise ValidationError({"items": "Expected a list of credentials."})
+        max_items = getattr(settings, "CREDENTIAL_BULK_MAX_ITEMS", 5000)
+        if len(items) > max_items:
+            raise ValidationError({"items": f"At most {max_items} credentials per request."})
+
+        def _ids(field_name):
+            ids = set()
+            for item in items:
+                try:
+                    ids.add(int(item.get(field_name)))
+                except (AttributeError, TypeError, ValueError):
+                    continue
+            return ids
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.context["users_by_id"] = User.objects.in_bulk(_ids("user"))
+        serializer.context["services_by_id"] = Service.objects.in_bulk(_ids("service"))
+        serializer.is_valid(raise_exception=True)
+        validated_items = serializer.validated_data["items"]
+
+        pairs = {(attrs["user"].id, attrs["service"].id) for attrs in validated_items}
+        existing_pairs = set(
+            Credential.objects.filter(
+                user_id__in={user_id for user_id, _ in pairs},
+                service_id__in={service_id for _, service_id in pairs},
+            ).values_list("user_id", "service_id")
+        )
+        item_errors = []
+        seen_pairs = set()
+        for attrs in validated_items:
+            pair = (attrs["user"].id, attrs["service"].id)
+            errors = []
+            if not _is_superuser(actor) and attrs["user"].department_id != actor.department_id:
+                errors.append("You can assign credentials only to your department users.")
+            if pair in existing_pairs or pair in seen_pairs:
+                errors.append("The fields user, service must make a unique set.")
+            seen_pairs.add(pair)
+            item_errors.append({"non_field_errors": errors} if errors else {})
+        if any(item_errors):
+            raise ValidationError({"items": item_errors})
+
+        credentials = [Credential(**attrs) for attrs in validated_items]
+        SecretBlob.objects.attach(credentials)
+        Credential.objects.bulk_create(credentials, batch_size=1000)
+
+        ServiceAccess.objects.bulk_create(
+            [
+                ServiceAccess(user=credential.user, service=credential.service, is_active=credential.is_active)
+                for credential in credentials
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["user", "service"],
+            update_fields=["is_active", "updated_at"],
+        )
+        CredentialVersion.objects.bulk_create(
+            [
+                CredentialVersion(
+                    credential=credential,
+                    version=1,
+                    login=credential.login,
+                    secret_type=credential.secret_type,
+                    secret_filename=credential.secret_filename,
+                    ssh_host=credential.ssh_host,
+                    ssh_port=credential.ssh_port,
+                    ssh_algorithm=credential.ssh_algorithm,
+                    ssh_public_key=credential.ssh_public_key,
+                    ssh_fingerprint=credential.ssh_fingerprint,
+                    secret_id=credential.secret_id,
+                    notes=credential.notes,
+                    is_active=credential.is_active,
+                    change_type=CredentialVersion.ChangeType.CREATE,
+                    changed_by=actor,
+                )
+                for credential in credentials
+            ],
+            batch_size=1000,
+        )
+        write_audit_entries(
+            [
+                build_audit_entry(actor, AuditLog.Action.CREATE, credential, metadata={"bulk": True}, request=request)
+                for credential in credentials
+            ]
+        )
+        publish_events(
+            [
+                ([credential.user_id], CREDENTIAL_ISSUED, _credential_event_data(credential))
+                for credential in credentials
+            ]
+        )
+
+        services_by_user = {}
+        for credential in credentials:
+            if credential.user.email:
+                services_by_user.setdefault(credential.user, []).append(credential.service.name)
+        send_platform_emails(
+            [
+                (
+                    "Phoenix Vault: доступ выдан",
+                    (
+                        f"Вам выданы учетные данные для сервисов: {', '.join(sorted(names))}. "
+                        "Войдите в Phoenix Vault, чтобы посмотреть данные."
+                    ),
+                    [user.email],
+                )
+                for user, names in services_by_user.items()
+            ]
+        )
+        return Response(
+            {"created": len(credentials), "ids": [credential.id for credential in credentials]},
+            status=status.HTTP_201_CREATED,
+        )
+
     def list(self, request, *args, **kwargs):
         response = super().list(request, *args, **kwargs)
         if isinstance(response.data, list):
@@ -619,6 +1155,7 @@ class CredentialViewSet(viewsets.ModelViewSet):
             object_id="list",
             metadata={"count": count},
             request=request,
+            coalesce=True,
         )
         return response
 
@@ -653,17 +1190,41 @@ class CredentialViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["get"], permission_classes=[IsAuthenticated])
     def versions(self, request, pk=None):
         credential = self.get_object()
-        versions = credential.versions.select_related("changed_by").all()
-        serializer = CredentialVersionSerializer(versions, many=True)
+        paginator = CredentialVersionPagination()
+        page = paginator.paginate_queryset(credential.versions.select_related("changed_by"), request, view=self)
+        serializer = CredentialVersionSerializer(page, many=True)
         log_action(
             actor=request.user,
             action=AuditLog.Action.VIEW,
             object_type="CredentialVersion",
             object_id=f"credential:{credential.pk}",
-            metadata={"count": versions.count()},
+            metadata={"count": len(page)},
             request=request,
+            coalesce=True,
         )
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(
+        detail=True,
+        methods=["get"],
+        permission_classes=[IsAuthenticated],
+        url_path=r"versions/(?P<version>\d+)/reveal",
+    )
+    def reveal_version(self, request, pk=None, version=None):
+        credential = self.get_object()
+        credential_version = (
+            credential.versions.select_related("changed_by", "secret").filter(version=version).first()
+        )
+        if credential_version is None:
+            return Response({"detail": "Version not found."}, status=status.HTTP_404_NOT_FOUND)
+        log_action(
+            actor=request.user,
+            action=AuditLog.Action.VIEW,
+            obj=credential_version,
+            metadata={"reveal": True, "credential_id": credential.pk, "version": credential_version.version},
+            request=request,
+        )
+        return Response(CredentialVersionSecretSerializer(credential_version).data)
 
 
 class ServiceAccessViewSet(viewsets.ModelViewSet):
@@ -671,13 +1232,7 @@ class ServiceAccessViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        user = self.request.user
-        qs = ServiceAccess.objects.select_related("user", "service", "service__department", "user__department")
-        if _is_superuser(user):
-            return qs
-        if _is_department_head(user):
-            return qs.filter(user__department_id__in=_head_visible_department_ids(user))
-        return qs.filter(user=user, is_active=True, service__is_active=True)
+        return _visible_accesses(self.request.user)
 
     def _ensure_access_write_allowed(self, access=None):
         user = self.request.user
@@ -713,14 +1268,14 @@ class ServiceAccessViewSet(viewsets.ModelViewSet):
         instance = self.get_object()
         self._ensure_access_write_allowed(access=instance)
         instance.is_active = False
-        instance.save(update_fields=["is_active"])
+        instance.save(update_fields=["is_active", "updated_at"])
         log_action(request.user, AuditLog.Action.DISABLE, instance, request=request)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     def retrieve(self, request, *args, **kwargs):
         response = super().retrieve(request, *args, **kwargs)
         instance = self.get_object()
-        log_action(request.user, AuditLog.Action.VIEW, instance, request=request)
+        log_action(request.user, AuditLog.Action.VIEW, instance, request=request, coalesce=True)
         return response
 
 
@@ -790,15 +1345,44 @@ class DepartmentShareViewSet(viewsets.ModelViewSet):
         instance = self.get_object()
         self._ensure_share_write_allowed(instance=instance)
         instance.is_active = False
-        instance.save(update_fields=["is_active"])
+        instance.save(update_fields=["is_active", "updated_at"])
         log_action(request.user, AuditLog.Action.DISABLE, instance, request=request)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 class AccessRequestViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
+    pagination_class = OptionalLimitOffsetPagination
+    ordering_fields = {
+        "requested_at": "requested_at",
+        "reviewed_at": "reviewed_at",
+        "status": "status",
+        "service": "service__name",
+        "requester": "requester__portal_login",
+    }
 
     def get_queryset(self):
+        qs = self._scoped_queryset()
+        if self.action != "list":
+            return qs
+        status_value = _query_choice(self.request, "status", AccessRequest.Status.values)
+        service = _query_int(self.request, "service")
+        department = _query_int(self.request, "department")
+        date_from = _query_datetime(self.request, "date_from")
+        date_to = _query_datetime(self.request, "date_to", is_end=True)
+        if status_value:
+            qs = qs.filter(status=status_value)
+        if service is not None:
+            qs = qs.filter(service_id=service)
+        if department is not None:
+            qs = qs.filter(requester__department_id=department)
+        if date_from:
+            qs = qs.filter(requested_at__gte=date_from)
+        if date_to:
+            qs = qs.filter(requested_at__lte=date_to)
+        return _apply_ordering(qs, self.request, self.ordering_fields)
+
+    def _scoped_queryset(self):
         user = self.request.user
         qs = AccessRequest.objects.select_related(
             "requester",
@@ -819,6 +1403,8 @@ class AccessRequestViewSet(viewsets.ModelViewSet):
             return AccessRequestWriteSerializer
         if self.action in ("approve", "reject"):
             return AccessRequestReviewSerializer
+        if self.action in ("bulk_approve", "bulk_reject"):
+            return AccessRequestBulkReviewSerializer
         return AccessRequestReadSerializer
 
     def get_throttles(self):
@@ -826,6 +1412,7 @@ class AccessRequestViewSet(viewsets.ModelViewSet):
             return [AccessRequestCreateThrottle()]
         return super().get_throttles()
 
+    @transaction.atomic
     def perform_create(self, serializer):
         requester = self.request.user
         if not requester.is_active:
@@ -834,17 +1421,14 @@ class AccessRequestViewSet(viewsets.ModelViewSet):
             raise ValidationError("Department heads and superusers should assign access directly.")
         access_request = serializer.save(requester=requester)
         log_action(self.request.user, AuditLog.Action.CREATE, access_request, request=self.request)
-
-        reviewer_emails = _reviewer_emails_for_request(access_request)
-        send_platform_email(
-            subject="Phoenix Vault: новый запрос доступа",
-            body=(
-                f"Пользователь {requester.portal_login} запросил доступ к сервису "
-                f"{access_request.service.name}."
-            ),
-            recipients=reviewer_emails,
+        publish_event(
+            reviewer_ids_for_department(requester.department_id),
+            ACCESS_REQUEST_CREATED,
+            _access_request_event_data(access_request),
         )
 
+        notify_reviewers_of_request(access_request)
+
     def _ensure_can_review(self, access_request):
         actor = self.request.user
         if _is_superuser(actor):
@@ -855,6 +1439,7 @@ class AccessRequestViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("You can review only your own department requests.")
 
     @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
+    @transaction.atomic
     def approve(self, request, pk=None):
         access_request = self.get_object()
         self._ensure_can_review(access_request)
@@ -872,6 +1457,11 @@ class AccessRequestViewSet(viewsets.ModelViewSet):
             defaults={"is_active": True},
         )
         log_action(request.user, AuditLog.Action.UPDATE, access_request, request=request)
+        publish_event(
+            [access_request.requester_id],
+            ACCESS_REQUEST_APPROVED,
+            _access_request_event_data(access_request),
+        )
 
         if access_request.requester.email:
             send_platform_email(
@@ -886,6 +1476,7 @@ class AccessRequestViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
     @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
+    @transaction.atomic
     def reject(self, request, pk=None):
         access_request = self.get_object()
         self._ensure_can_review(access_request)
@@ -898,6 +1489,11 @@ class AccessRequestViewSet(viewsets.ModelViewSet):
         access_request.reviewed_at = timezone.now()
         access_request.save(update_fields=["status", "reviewer", "review_comment", "reviewed_at"])
         log_action(request.user, AuditLog.Action.UPDATE, access_request, request=request)
+        publish_event(
+            [access_request.requester_id],
+            ACCESS_REQUEST_REJECTED,
+            _access_request_event_data(access_request),
+        )
 
         if access_request.requester.email:
             send_platform_email(
@@ -912,6 +1508,124 @@ class AccessRequestViewSet(viewsets.ModelViewSet):
         serializer = AccessRequestReadSerializer(access_request)
         return Response(serializer.data)
 
+    def _bulk_review(self, request, new_status):
+        """Review many pending requests at once; each id gets its own result.
+
+        Rows are claimed with ``SKIP LOCKED`` so a request another reviewer is
+        handling right now is reported as ``locked`` instead of blocking.
+        """
+        actor = request.user
+        if not (_is_superuser(actor) or _is_department_head(actor)):
+            raise PermissionDenied("Only department head or superuser can review requests.")
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data["ids"]))
+        review_comment = serializer.validated_data["review_comment"].strip()
+
+        reviewable = AccessRequest.objects.all()
+        if not _is_superuser(actor):
+            reviewable = reviewable.filter(requester__department_id=actor.department_id)
+        claimed = list(
+            reviewable.select_for_update(skip_locked=True, of=("self",))
+            .select_related("requester", "service")
+            .filter(id__in=ids, status=AccessRequest.Status.PENDING)
+        )
+        claimed_ids = {access_request.id for access_request in claimed}
+        current_statuses = dict(
+            reviewable.filter(id__in=set(ids) - claimed_ids).values_list("id", "status")
+        )
+
+        now = timezone.now()
+        AccessRequest.objects.filter(id__in=claimed_ids).update(
+            status=new_status,
+            reviewer=actor,
+            review_comment=review_comment,
+            reviewed_at=now,
+        )
+        if new_status == AccessRequest.Status.APPROVED:
+            accesses = {
+                (access_request.requester_id, access_request.service_id): ServiceAccess(
+                    user_id=access_request.requester_id,
+                    service_id=access_request.service_id,
+                    is_active=True,
+                )
+                for access_request in claimed
+            }
+            ServiceAccess.objects.bulk_create(
+                list(accesses.values()),
+                update_conflicts=True,
+                unique_fields=["user", "service"],
+                update_fields=["is_active", "updated_at"],
+            )
+        write_audit_entries(
+            [
+                build_audit_entry(
+                    actor,
+                    AuditLog.Action.UPDATE,
+                    access_request,
+                    metadata={"bulk": True, "status": new_status},
+                    request=request,
+                )
+                for access_request in claimed
+            ]
+        )
+        event = ACCESS_REQUEST_APPROVED if new_status == AccessRequest.Status.APPROVED else ACCESS_REQUEST_REJECTED
+        publish_events(
+            [
+                (
+                    [access_request.requester_id],
+                    event,
+                    {**_access_request_event_data(access_request), "status": new_status},
+                )
+                for access_request in claimed
+            ]
+        )
+
+        services_by_requester = {}
+        for access_request in claimed:
+            if access_request.requester.email:
+                services_by_requester.setdefault(access_request.requester, []).append(access_request.service.name)
+        if new_status == AccessRequest.Status.APPROVED:
+            subject = "Phoenix Vault: запрос доступа одобрен"
+            verdict = "одобрен"
+        else:
+            subject = "Phoenix Vault: запрос доступа отклонен"
+            verdict = "отклонен"
+        send_platform_emails(
+            [
+                (
+                    subject,
+                    f"Ваш запрос на доступ к сервисам {', '.join(sorted(names))} {verdict}."
+                    f"\nКомментарий: {review_comment or '-'}",
+                    [requester.email],
+                )
+                for requester, names in services_by_requester.items()
+            ]
+        )
+
+        results = []
+        for request_id in ids:
+            if request_id in claimed_ids:
+                result = new_status
+            elif request_id not in current_statuses:
+                result = "not_found"
+            elif current_statuses[request_id] == AccessRequest.Status.PENDING:
+                result = "locked"
+            else:
+                result = "not_pending"
+            results.append({"id": request_id, "result": result})
+        return Response({"processed": len(claimed_ids), "results": results})
+
+    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated], url_path="bulk-approve")
+    @transaction.atomic
+    def bulk_approve(self, request):
+        return self._bulk_review(request, AccessRequest.Status.APPROVED)
+
+    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated], url_path="bulk-reject")
+    @transaction.atomic
+    def bulk_reject(self, request):
+        return self._bulk_review(request, AccessRequest.Status.REJECTED)
+
     @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
     def cancel(self, request, pk=None):
         access_request = self.get_object()
@@ -930,9 +1644,10 @@ class AccessRequestViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
+class AuditLogViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = AuditLogSerializer
     permission_classes = [IsAuthenticated]
+    stats_groups = {"action": "action", "object_type": "object_type", "actor": "actor_id", "department": "department_id"}
 
     def _apply_filters(self, qs):
         actor = str(self.request.query_params.get("actor", "")).strip()
@@ -942,7 +1657,7 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
         date_to = _parse_range_bound(self.request.query_params.get("date_to"), is_end=True)
 
         if actor:
-            qs = qs.filter(actor__portal_login__icontains=actor)
+            qs = qs.filter(actor_id__in=audit_actor_ids(User.objects.filter(portal_login__icontains=actor)))
         if action:
             qs = qs.filter(action=action)
         if object_type:
@@ -951,24 +1666,115 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
             qs = qs.filter(created_at__gte=date_from)
         if date_to:
             qs = qs.filter(created_at__lte=date_to)
+        for path, values in _query_metadata(self.request):
+            qs = qs.filter(_metadata_condition(path, values))
         return qs
 
     def get_queryset(self):
         user = self.request.user
-        qs = AuditLog.objects.select_related("actor", "actor__department")
+        qs = with_audit_actors(AuditLog.objects.all())
         if _is_superuser(user):
             return self._apply_filters(qs)
         if _is_department_head(user):
             visible_ids = _head_visible_department_ids(user)
-            scoped = qs.filter(Q(actor=user) | Q(actor__department_id__in=visible_ids)).distinct()
+            department_actors = audit_actor_ids(User.objects.filter(department_id__in=visible_ids))
+            scoped = qs.filter(Q(actor=user) | Q(actor_id__in=department_actors))
             return self._apply_filters(scoped)
         return self._apply_filters(qs.filter(actor=user))
 
+    def _archived_entries(self):
+        """Archived entries for the same scope and filters, read only when ``date_from`` is sent."""
+        params = self.request.query_params
+        date_from = _parse_range_bound(params.get("date_from"))
+        if date_from is None:
+            return []
+
+        user = self.request.user
+        actor_ids = None
+        if not _is_superuser(user):
+            actor_ids = {user.id}
+            if _is_department_head(user):
+                visible_ids = _head_visible_department_ids(user)
+                actor_ids.update(User.objects.filter(department_id__in=visible_ids).values_list("id", flat=True))
+        actor = str(params.get("actor", "")).strip()
+        if actor:
+            matching = set(User.objects.filter(portal_login__icontains=actor).values_list("id", flat=True))
+            actor_ids = matching if actor_ids is None else actor_ids & matching
+
+        entries = search_archive(
+            date_from,
+            date_to=_parse_range_bound(params.get("date_to"), is_end=True),
+            actor_ids=actor_ids,
+            action=str(params.get("action", "")).strip(),
+            object_type=str(params.get("object_type", "")).strip(),
+            metadata=_query_metadata(self.request),
+        )
+        prefetch_related_objects(entries, "actor", "actor__department")
+        return entries
+
+    def _entries(self):
+        entries = list(self.filter_queryset(self.get_queryset()))
+        archived = self._archived_entries()
+        if archived:
+            entries = sorted(entries + archived, key=lambda item: item.created_at, reverse=True)
+        return entries
+
+    def list(self, request, *args, **kwargs):
+        return Response(self.get_serializer(self._entries(), many=True).data)
+
+    @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
+    def stats(self, request):
+        """Entry counts per hour or day from ``AuditRollup``; never scans ``AuditLog``."""
+        period = _query_choice(request, "period", AuditRollup.Period.values) or AuditRollup.Period.DAY
+        group_by = [item.strip() for item in _query_param(request, "group_by").split(",") if item.strip()]
+        unknown = [item for item in group_by if item not in self.stats_groups]
+        if unknown:
+            raise ValidationError(
+                {"group_by": f'Cannot group by "{unknown[0]}". Allowed: {", ".join(sorted(self.stats_groups))}.'}
+            )
+        date_to = _query_datetime(request, "date_to", is_end=True) or timezone.now()
+        date_from = _query_datetime(request, "date_from") or date_to - timedelta(days=30)
+        if date_to - date_from > timedelta(days=settings.AUDIT_STATS_MAX_DAYS):
+            raise ValidationError({"date_from": f"The range is limited to {settings.AUDIT_STATS_MAX_DAYS} days."})
+        # Start at the bucket that contains date_from.
+        date_from = timezone.localtime(date_from).replace(minute=0, second=0, microsecond=0)
+        if period == AuditRollup.Period.DAY:
+            date_from = date_from.replace(hour=0)
+
+        rows = AuditRollup.objects.filter(period=period, bucket__gte=date_from, bucket__lte=date_to)
+        user = request.user
+        if _is_department_head(user) and not _is_superuser(user):
+            rows = rows.filter(Q(actor_id=user.id) | Q(department_id__in=_head_visible_department_ids(user)))
+        elif not _is_superuser(user):
+            rows = rows.filter(actor_id=user.id)
+        action_name = _query_param(request, "action")
+        object_type = _query_param(request, "object_type")
+        if action_name:
+            rows = rows.filter(action=action_name)
+        if object_type:
+            rows = rows.filter(object_type__iexact=object_type)
+
+        fields = [self.stats_groups[item] for item in group_by]
+        results = rows.values("bucket", *fields).annotate(count=Sum("count")).order_by("bucket", *fields)
+        return Response(
+            {"period": period, "date_from": date_from, "date_to": date_to, "group_by": group_by, "results": list(results)}
+        )
+
     @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
     def export(self, request):
-        logs = self.get_queryset()
+        logs = self._entries()
         rows = [
-            ["created_at", "actor", "action", "object_type", "object_id", "ip_address", "user_agent"]
+            [
+                "created_at",
+                "actor",
+                "action",
+                "object_type",
+                "object_id",
+                "ip_address",
+                "user_agent",
+                "repeat_count",
+                "last_seen_at",
+            ]
         ]
         for item in logs:
             rows.append(
@@ -980,6 +1786,8 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
                     item.object_id,
                     item.ip_address or "",
                     item.user_agent or "",
+                    item.repeat_count,
+                    item.last_seen_at.isoformat() if item.last_seen_at else "",
                 ]
             )
 
@@ -989,3 +1797,53 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
         response = HttpResponse(f"\ufeff{csv_body}", content_type="text/csv; charset=utf-8")
         response["Content-Disposition"] = 'attachment; filename="audit_log_export.csv"'
         return response
+
+
+def _audit_feed_page(after, limit):
+    entries = feed_batch(after, limit)
+    lines = [
+        json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n"
+        for row in AuditFeedSerializer(entries, many=True).data
+    ]
+    return "".join(lines), entries[-1].id if entries else after
+
+
+class AuditFeedView(AsyncAPIView):
+    """Audit entries after ``?after=<id>`` as JSON lines in id order, for log collectors.
+
+    ``X-Audit-Feed-Cursor`` carries the id to pass as ``after`` next time.
+    When there is nothing new the request waits up to ``?wait=`` seconds
+    (at most ``AUDIT_FEED_MAX_WAIT_SECONDS``), checking every
+    ``AUDIT_FEED_POLL_SECONDS`` on the event loop. Open to superusers and
+    ``AuditFeedToken`` keys; reading the feed is not itself audited, so an
+    idle collector does not feed itself.
+    """
+
+    authentication_classes = [TokenAuthentication, AuditFeedTokenAuthentication]
+    permission_classes = [IsAuditFeedReader]
+
+    async def get(self, request):
+        after = _query_int(request, "after") or 0
+        limit = _query_int(request, "limit")
+        limit = settings.AUDIT_FEED_BATCH_SIZE if limit is None else limit
+        wait = _query_int(request, "wait") or 0
+        if after < 0:
+            raise ValidationError({"after": "Must be zero or greater."})
+        if not 1 <= limit <= settings.AUDIT_FEED_MAX_BATCH_SIZE:
+            raise ValidationError({"limit": f"Must be between 1 and {settings.AUDIT_FEED_MAX_BATCH_SIZE}."})
+        if not 0 <= wait <= settings.AUDIT_FEED_MAX_WAIT_SECONDS:
+            raise ValidationError({"wait": f"Must be between 0 and {settings.AUDIT_FEED_MAX_WAIT_SECONDS}."})
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait
+        while True:
+            body, cursor = await sync_to_async(_audit_feed_page)(after, limit)
+            remaining = deadline - loop.time()
+            if body or remaining <= 0:
+                break
+            await asyncio.sleep(min(max(1, settings.AUDIT_FEED_POLL_SECONDS), remaining))
+
+        response = HttpResponse(body, content_type="application/x-ndjson; charset=utf-8")
+        response["X-Audit-Feed-Cursor"] = str(cursor)
+        response["Cache-Control"] = "no-store"
+        return response
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Load a running Phoenix API and report throughput and latency percentiles.
+
+Run it once per server profile on the same host and with the same settings
+(WEB_CONCURRENCY, database) to compare them, e.g.:
+
+    WEB_PROFILE=sync  scripts/start_web.sh   # then:
+    python scripts/bench_web.py --url http://127.0.0.1:8000 --token <key> --concurrency 64
+    WEB_PROFILE=async scripts/start_web.sh   # then the same command again
+
+Only the standard library is used, so it runs from any machine with Python 3.
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_PATHS = (
+    "/api/health/ready/",
+    "/api/config/public/",
+    "/api/me/",
+    "/api/services/",
+    "/api/departments/",
+)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _worker(base, paths, headers, deadline, offset, latencies, errors, lock):
+    connection_class = http.client.HTTPSConnection if base.scheme == "https" else http.client.HTTPConnection
+    connection = connection_class(base.hostname, base.port, timeout=30)
+    local_latencies, local_errors, index = [], 0, offset
+    while time.monotonic() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        started = time.perf_counter()
+        try:
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                local_errors += 1
+        except (OSError, http.client.HTTPException):
+            local_errors += 1
+            connection.close()
+            connection = connection_class(base.hostname, base.port, timeout=30)
+            continue
+        local_latencies.append(time.perf_counter() - started)
+    connection.close()
+    with lock:
+        latencies.extend(local_latencies)
+        errors[0] += local_errors
+
+
+def run(url, token, paths, concurrency, duration):
+    base = urlsplit(url)
+    headers = {"Authorization": f"Token {token}"} if token else {}
+    latencies, errors, lock = [], [0], threading.Lock()
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(target=_worker, args=(base, paths, headers, deadline, offset, latencies, errors, lock))
+        for offset in range(concurrency)
+    ]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--token", default="", help="DRF token sent as 'Authorization: Token <key>'.")
+    parser.add_argument("--path", action="append", dest="paths", help="Path to request; repeat for several.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        action="append",
+        help="Concurrent clients; repeat to sweep several levels (default: 8, 32, 128).",
+    )
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds per concurrency level.")
+    args = parser.parse_args()
+
+    for concurrency in args.concurrency or (8, 32, 128):
+        result = run(args.url, args.token, tuple(args.paths or DEFAULT_PATHS), concurrency, args.duration)
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
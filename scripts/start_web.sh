@@ -0,0 +1,30 @@
+#!/bin/sh
+set -eu
+
+# WEB_PROFILE=sync  - gunicorn sync workers on the WSGI app (one request per worker at a time).
+# WEB_PROFILE=async - gunicorn managing uvicorn workers on the ASGI app; async views and
+#                     /api/events/ run on the event loop, sync views in a thread pool
+#                     sized by ASGI_THREADS.
+case "${WEB_PROFILE:-sync}" in
+  async)
+    exec gunicorn phoenix.asgi:application \
+      --worker-class uvicorn.workers.UvicornWorker \
+      --bind "0.0.0.0:${PORT:-8000}" \
+      --workers "${WEB_CONCURRENCY:-2}" \
+      --timeout "${GUNICORN_TIMEOUT:-60}" \
+      --access-logfile - \
+      --error-logfile -
+    ;;
+  sync)
+    exec gunicorn phoenix.wsgi:application \
+      --bind "0.0.0.0:${PORT:-8000}" \
+      --workers "${WEB_CONCURRENCY:-2}" \
+      --timeout "${GUNICORN_TIMEOUT:-60}" \
+      --access-logfile - \
+      --error-logfile -
+    ;;
+  *)
+    echo "Unknown WEB_PROFILE '${WEB_PROFILE}', expected 'sync' or 'async'." >&2
+    exit 1
+    ;;
+esac